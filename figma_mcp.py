@@ -12,20 +12,31 @@ This server provides tools to interact with Figma REST API, including:
 Author: Yusuf Demirkoparan
 """
 
+import io
 import os
+import hashlib
+import sys
 import json
 import re
-import base64
 import asyncio
 import tempfile
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
 from pathlib import Path
 from datetime import datetime, timezone
-from typing import Optional, List, Dict, Any, Literal, Annotated, Tuple, Callable
+from typing import Optional, List, Dict, Any, Literal, Annotated, Tuple, Callable, Iterator, AsyncIterator
 from enum import Enum
-from dataclasses import dataclass
+from functools import lru_cache, partial
+from itertools import islice
+from dataclasses import dataclass, field
 
 import httpx
-from pydantic import BaseModel, Field, field_validator, ConfigDict, BeforeValidator
+try:
+    import orjson
+except ImportError:  # Optional speedup, falls back to stdlib json
+    orjson = None
+from pydantic import BaseModel, Field, ConfigDict, BeforeValidator, StringConstraints
 from mcp.server.fastmcp import FastMCP
 
 # Generator modules
@@ -37,6 +48,8 @@ from generators.base import (
     sanitize_component_name as _sanitize_component_name,
     MAX_CHILDREN_LIMIT,
     MAX_NATIVE_CHILDREN_LIMIT,
+    _HEX,
+    _rgba_components_to_hex,
 )
 
 
@@ -44,37 +57,73 @@ from generators.base import (
 # Reusable Validators (Annotated Types)
 # ============================================================================
 
+_FIGMA_HOST = 'figma.com/'
+_FIGMA_PATH_PREFIXES = ('design/', 'file/')
+
+
+@lru_cache(maxsize=128)
+def _file_key_from_url(url: str) -> str:
+    """Parse the file key out of a Figma URL (memoized, clients reuse URLs).
+
+    Hand-rolled scan for ``figma.com/{design,file}/<key>``: locate the host,
+    check the path prefix in place, then take the ASCII alphanumeric run
+    that follows (first match wins, as with a regex search).
+    """
+    n = len(url)
+    i = url.find(_FIGMA_HOST)
+    while i != -1:
+        i += len(_FIGMA_HOST)
+        for prefix in _FIGMA_PATH_PREFIXES:
+            if url.startswith(prefix, i):
+                start = end = i + len(prefix)
+                while end < n and url[end].isascii() and url[end].isalnum():
+                    end += 1
+                if end > start:
+                    return url[start:end]
+        i = url.find(_FIGMA_HOST, i)
+    raise ValueError("Could not extract file key from Figma URL")
+
+
 def _extract_file_key(v: str) -> str:
     """Extract Figma file key from URL or return as-is."""
-    if 'figma.com' in v:
-        match = re.search(r'figma\.com/(?:design|file)/([a-zA-Z0-9]+)', v)
-        if match:
-            return match.group(1)
-        raise ValueError("Could not extract file key from Figma URL")
+    # Bare keys (the common case) never contain a slash
+    if isinstance(v, str) and '/' in v and 'figma.com' in v:
+        return _file_key_from_url(v)
     return v
 
 
-def _normalize_node_id(v: str) -> str:
-    """Convert node ID from 1-2 format to 1:2 format."""
-    return v.replace('-', ':') if v else v
+def _normalize_node_id(v: Optional[str]) -> Optional[str]:
+    """Convert node ID from 1-2 format to 1:2 format.
 
-
-def _normalize_optional_node_id(v: Optional[str]) -> Optional[str]:
-    """Convert optional node ID from 1-2 format to 1:2 format."""
-    return v.replace('-', ':') if v else v
+    Non-string input (None for optional fields) is returned untouched and left
+    to the field's own type validation.
+    """
+    # str.replace beats a str.translate table here (~50ns vs ~500ns) and
+    # already returns the same object when the ID has no dash
+    return v.replace('-', ':') if isinstance(v, str) else v
 
 
 def _normalize_node_ids(v: List[str]) -> List[str]:
     """Convert list of node IDs from 1-2 format to 1:2 format."""
-    return [nid.replace('-', ':') for nid in v]
+    if not isinstance(v, list) or not any('-' in nid for nid in v if isinstance(nid, str)):
+        return v
+    return [nid.replace('-', ':') if isinstance(nid, str) else nid for nid in v]
 
 
 # Annotated types for reuse across all models
-FigmaFileKey = Annotated[str, BeforeValidator(_extract_file_key), Field(min_length=10, max_length=50)]
+FigmaFileKey = Annotated[
+    str,
+    StringConstraints(strip_whitespace=True),
+    BeforeValidator(_extract_file_key),
+    Field(min_length=10, max_length=50)
+]
 FigmaNodeId = Annotated[str, BeforeValidator(_normalize_node_id), Field(min_length=1)]
-FigmaOptionalNodeId = Annotated[Optional[str], BeforeValidator(_normalize_optional_node_id)]
+FigmaOptionalNodeId = Annotated[Optional[str], BeforeValidator(_normalize_node_id)]
 FigmaNodeIdList = Annotated[List[str], BeforeValidator(_normalize_node_ids)]
 
+# Shared field descriptor for the common required file_key field
+_FILE_KEY_FIELD = Field(..., description="Figma file key")
+
 # ============================================================================
 # Constants
 # ============================================================================
@@ -83,10 +132,36 @@ FIGMA_API_BASE = "https://api.figma.com/v1"
 CHARACTER_LIMIT = 80000
 DEFAULT_TIMEOUT = 30.0
 
+# Shared HTTP client connection pool (reused across Figma API calls)
+HTTP_MAX_KEEPALIVE_CONNECTIONS = int(os.environ.get("FIGMA_HTTP_MAX_KEEPALIVE", "20"))
+HTTP_KEEPALIVE_EXPIRY = 30.0  # Seconds
+
 # Retry configuration for network errors
 MAX_RETRIES = 3
 RETRY_BASE_DELAY = 1.0  # Base delay in seconds (exponential backoff)
 
+# Image render batching (Figma renders large id lists serially)
+IMAGE_BATCH_SIZE = 20
+IMAGE_REQUEST_CONCURRENCY = 5
+
+# Response cache for GET requests (repeated tool calls on the same file)
+REQUEST_CACHE_TTL = 300.0  # Seconds
+REQUEST_CACHE_MAXSIZE = 32
+
+# Optional on-disk cache for file/node payloads, keyed by file version.
+# Enabled by pointing FIGMA_CACHE_DIR at a directory.
+DISK_CACHE_DIR_ENV = "FIGMA_CACHE_DIR"
+
+# Shared read-only defaults for optional dict/list lookups (never mutate)
+_EMPTY_DICT: Dict[str, Any] = {}
+_EMPTY_TUPLE: Tuple = ()
+
+# Markdown file-structure icons by node type ("•" for anything else)
+_ICON_BY_TYPE = {
+    'DOCUMENT': "📄", 'CANVAS': "📑", 'FRAME': "🖼️",
+    'COMPONENT': "📦", 'INSTANCE': "🔗", 'TEXT': "📝",
+}
+
 # Tailwind CSS font weight mapping
 TAILWIND_WEIGHT_MAP = {
     100: 'font-thin',
@@ -141,7 +216,17 @@ TAILWIND_ALIGN_MAP = {
 
 SERVER_VERSION = "3.2.15"
 
-mcp = FastMCP("figma_mcp")
+
+@asynccontextmanager
+async def _server_lifespan(server: FastMCP) -> AsyncIterator[None]:
+    """Close the shared Figma HTTP client when the server shuts down."""
+    try:
+        yield
+    finally:
+        await _close_http_client()
+
+
+mcp = FastMCP("figma_mcp", lifespan=_server_lifespan)
 
 # ============================================================================
 # Enums and Types
@@ -181,7 +266,7 @@ class CodeFramework(str, Enum):
 
 class FigmaFileInput(BaseModel):
     """Input model for file operations."""
-    model_config = ConfigDict(str_strip_whitespace=True, validate_assignment=True)
+    model_config = ConfigDict(extra='forbid')
 
     file_key: FigmaFileKey = Field(
         ...,
@@ -215,9 +300,9 @@ class FigmaFileInput(BaseModel):
 
 class FigmaNodeInput(BaseModel):
     """Input model for node operations."""
-    model_config = ConfigDict(str_strip_whitespace=True, validate_assignment=True)
+    model_config = ConfigDict(str_strip_whitespace=True, extra='forbid')
 
-    file_key: FigmaFileKey = Field(..., description="Figma file key")
+    file_key: FigmaFileKey = _FILE_KEY_FIELD
     node_id: FigmaNodeId = Field(..., description="Node ID (e.g., '1:2' or '1-2')")
     framework: Optional[str] = Field(
         default=None,
@@ -231,9 +316,9 @@ class FigmaNodeInput(BaseModel):
 
 class FigmaScreenshotInput(BaseModel):
     """Input model for screenshot operations."""
-    model_config = ConfigDict(str_strip_whitespace=True, validate_assignment=True)
+    model_config = ConfigDict(extra='forbid')
 
-    file_key: FigmaFileKey = Field(..., description="Figma file key")
+    file_key: FigmaFileKey = _FILE_KEY_FIELD
     node_ids: FigmaNodeIdList = Field(
         ...,
         description="List of node IDs to capture (e.g., ['1:2', '3:4'])",
@@ -254,9 +339,9 @@ class FigmaScreenshotInput(BaseModel):
 
 class FigmaDesignTokensInput(BaseModel):
     """Input model for design token extraction."""
-    model_config = ConfigDict(str_strip_whitespace=True, validate_assignment=True)
+    model_config = ConfigDict(extra='forbid')
 
-    file_key: FigmaFileKey = Field(..., description="Figma file key")
+    file_key: FigmaFileKey = _FILE_KEY_FIELD
     node_id: FigmaOptionalNodeId = Field(
         default=None,
         description="Optional node ID to extract tokens from specific component"
@@ -273,9 +358,9 @@ class FigmaDesignTokensInput(BaseModel):
 
 class FigmaCodeGenInput(BaseModel):
     """Input model for code generation."""
-    model_config = ConfigDict(str_strip_whitespace=True, validate_assignment=True)
+    model_config = ConfigDict(str_strip_whitespace=True, extra='forbid')
 
-    file_key: FigmaFileKey = Field(..., description="Figma file key")
+    file_key: FigmaFileKey = _FILE_KEY_FIELD
     node_id: FigmaNodeId = Field(..., description="Node ID to generate code for")
     framework: CodeFramework = Field(
         default=CodeFramework.REACT_TAILWIND,
@@ -285,13 +370,41 @@ class FigmaCodeGenInput(BaseModel):
         default=None,
         description="Component name (auto-generated from node name if not provided)"
     )
+    flatten_empty: bool = Field(
+        default=False,
+        description="React only: drop nested wrappers that have no styles and emit their children in place"
+    )
+
+
+class FigmaDesignBundleInput(BaseModel):
+    """Input model for fetching generated code and design tokens in one call."""
+    model_config = ConfigDict(str_strip_whitespace=True, extra='forbid')
+
+    file_key: FigmaFileKey = _FILE_KEY_FIELD
+    node_id: FigmaNodeId = Field(..., description="Node ID to generate code and extract tokens for")
+    framework: CodeFramework = Field(
+        default=CodeFramework.REACT_TAILWIND,
+        description="Target framework"
+    )
+    component_name: Optional[str] = Field(
+        default=None,
+        description="Component name (auto-generated from node name if not provided)"
+    )
+    flatten_empty: bool = Field(
+        default=False,
+        description="React only: drop nested wrappers that have no styles and emit their children in place"
+    )
+    include_colors: bool = Field(default=True, description="Include color tokens")
+    include_typography: bool = Field(default=True, description="Include typography tokens")
+    include_spacing: bool = Field(default=True, description="Include spacing/padding tokens")
+    include_effects: bool = Field(default=True, description="Include shadow/blur effects")
 
 
 class FigmaStylesInput(BaseModel):
     """Input model for published styles retrieval."""
-    model_config = ConfigDict(str_strip_whitespace=True, validate_assignment=True)
+    model_config = ConfigDict(extra='forbid')
 
-    file_key: FigmaFileKey = Field(..., description="Figma file key")
+    file_key: FigmaFileKey = _FILE_KEY_FIELD
     include_fill_styles: bool = Field(default=True, description="Include fill/color styles")
     include_text_styles: bool = Field(default=True, description="Include text/typography styles")
     include_effect_styles: bool = Field(default=True, description="Include effect styles (shadows, blurs)")
@@ -308,7 +421,7 @@ class FigmaStylesInput(BaseModel):
 
 class CodeConnectMapping(BaseModel):
     """Code Connect mapping data model."""
-    model_config = ConfigDict(str_strip_whitespace=True, validate_assignment=True)
+    model_config = ConfigDict(str_strip_whitespace=True, extra='forbid')
 
     component_path: str = Field(..., description="Path to the code component file")
     component_name: str = Field(..., description="Name of the code component")
@@ -330,9 +443,9 @@ class CodeConnectMapping(BaseModel):
 
 class FigmaCodeConnectGetInput(BaseModel):
     """Input model for getting Code Connect mappings."""
-    model_config = ConfigDict(str_strip_whitespace=True, validate_assignment=True)
+    model_config = ConfigDict(extra='forbid')
 
-    file_key: FigmaFileKey = Field(..., description="Figma file key")
+    file_key: FigmaFileKey = _FILE_KEY_FIELD
     node_id: FigmaOptionalNodeId = Field(
         default=None,
         description="Optional node ID to get specific mapping (returns all if not provided)"
@@ -341,9 +454,9 @@ class FigmaCodeConnectGetInput(BaseModel):
 
 class FigmaCodeConnectAddInput(BaseModel):
     """Input model for adding Code Connect mapping."""
-    model_config = ConfigDict(str_strip_whitespace=True, validate_assignment=True)
+    model_config = ConfigDict(str_strip_whitespace=True, extra='forbid')
 
-    file_key: FigmaFileKey = Field(..., description="Figma file key")
+    file_key: FigmaFileKey = _FILE_KEY_FIELD
     node_id: FigmaNodeId = Field(..., description="Figma node ID to map")
     component_path: str = Field(
         ...,
@@ -369,19 +482,41 @@ class FigmaCodeConnectAddInput(BaseModel):
     )
 
 
+class FigmaCodeConnectAddBatchInput(BaseModel):
+    """Input model for adding several Code Connect mappings at once."""
+    model_config = ConfigDict(extra='forbid')
+
+    mappings: List[FigmaCodeConnectAddInput] = Field(
+        ...,
+        description="Mappings to add or update",
+        min_length=1,
+        max_length=100
+    )
+
+
 class FigmaCodeConnectRemoveInput(BaseModel):
     """Input model for removing Code Connect mapping."""
-    model_config = ConfigDict(str_strip_whitespace=True, validate_assignment=True)
+    model_config = ConfigDict(extra='forbid')
 
-    file_key: FigmaFileKey = Field(..., description="Figma file key")
+    file_key: FigmaFileKey = _FILE_KEY_FIELD
     node_id: FigmaNodeId = Field(..., description="Figma node ID to remove mapping for")
 
 
+class FigmaInvalidateCacheInput(BaseModel):
+    """Input model for invalidating cached Figma API responses."""
+    model_config = ConfigDict(extra='forbid')
+
+    file_key: Optional[FigmaFileKey] = Field(
+        default=None,
+        description="Figma file key to invalidate (clears the whole cache if not provided)"
+    )
+
+
 class FigmaListAssetsInput(BaseModel):
     """Input model for listing assets in a Figma file/node."""
-    model_config = ConfigDict(str_strip_whitespace=True, validate_assignment=True)
+    model_config = ConfigDict(extra='forbid')
 
-    file_key: FigmaFileKey = Field(..., description="Figma file key")
+    file_key: FigmaFileKey = _FILE_KEY_FIELD
     node_id: FigmaOptionalNodeId = Field(
         default=None,
         description="Optional node ID to search within (searches entire file if not provided)"
@@ -410,9 +545,9 @@ class FigmaListAssetsInput(BaseModel):
 
 class FigmaGetImagesInput(BaseModel):
     """Input model for getting image fill URLs."""
-    model_config = ConfigDict(str_strip_whitespace=True, validate_assignment=True)
+    model_config = ConfigDict(extra='forbid')
 
-    file_key: FigmaFileKey = Field(..., description="Figma file key")
+    file_key: FigmaFileKey = _FILE_KEY_FIELD
     node_id: FigmaOptionalNodeId = Field(
         default=None,
         description="Optional node ID to get images from"
@@ -421,9 +556,9 @@ class FigmaGetImagesInput(BaseModel):
 
 class FigmaExportAssetsInput(BaseModel):
     """Input model for batch asset export."""
-    model_config = ConfigDict(str_strip_whitespace=True, validate_assignment=True)
+    model_config = ConfigDict(extra='forbid')
 
-    file_key: FigmaFileKey = Field(..., description="Figma file key")
+    file_key: FigmaFileKey = _FILE_KEY_FIELD
     node_ids: FigmaNodeIdList = Field(
         ...,
         description="List of node IDs to export",
@@ -450,6 +585,17 @@ class FigmaExportAssetsInput(BaseModel):
 # Helper Functions
 # ============================================================================
 
+def _dumps(obj: Any) -> str:
+    """Serialize a tool response as indented JSON (orjson when available)."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(obj, indent=2, ensure_ascii=False)
+
+
+# Decoder for raw API payloads (accepts bytes, skips httpx's text decoding step)
+_loads: Callable[[Any], Any] = orjson.loads if orjson is not None else json.loads
+
+
 # Code Connect storage configuration
 CODE_CONNECT_DEFAULT_PATH = os.path.expanduser(
     "~/.config/pixelbyte-figma-mcp/code_connect.json"
@@ -461,24 +607,101 @@ def _get_code_connect_path() -> str:
     return os.environ.get("FIGMA_CODE_CONNECT_PATH", CODE_CONNECT_DEFAULT_PATH)
 
 
-def _load_code_connect_data() -> Dict[str, Any]:
-    """Load Code Connect mappings from storage file."""
+# Parsed Code Connect store, reused while the file's path and mtime are unchanged
+_code_connect_cache: Dict[str, Any] = {"path": None, "mtime": None, "data": None}
+
+
+def _load_code_connect_data(for_update: bool = False) -> Dict[str, Any]:
+    """Load Code Connect mappings from storage file.
+
+    Readers share the cached dict and must not modify it. Pass ``for_update``
+    to get a freshly parsed copy to change and hand to _save_code_connect_data;
+    the cache only takes it once the write has succeeded.
+    """
     path = _get_code_connect_path()
-    if os.path.exists(path):
-        try:
-            with open(path, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (json.JSONDecodeError, IOError):
-            return {"version": "1.0", "mappings": {}}
-    return {"version": "1.0", "mappings": {}}
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        return {"version": "1.0", "mappings": {}}
+
+    if not for_update and _code_connect_cache["path"] == path and _code_connect_cache["mtime"] == mtime:
+        return _code_connect_cache["data"]
+
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (json.JSONDecodeError, IOError):
+        return {"version": "1.0", "mappings": {}}
+
+    if not for_update:
+        _code_connect_cache.update(path=path, mtime=mtime, data=data)
+    return data
 
 
 def _save_code_connect_data(data: Dict[str, Any]) -> None:
-    """Save Code Connect mappings to storage file."""
+    """Save Code Connect mappings to storage file.
+
+    Writes to a temporary file in the same directory and swaps it in with
+    os.replace, so a crash mid-write never leaves a truncated store behind.
+    A symlinked store is written through to its target, and the file keeps
+    its permissions (new files get the usual umask-based mode).
+    """
     path = _get_code_connect_path()
-    os.makedirs(os.path.dirname(path), exist_ok=True)
-    with open(path, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    target = os.path.realpath(path)
+    directory = os.path.dirname(target)
+    os.makedirs(directory, exist_ok=True)
+    try:
+        mode = os.stat(target).st_mode & 0o7777
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        mode = 0o666 & ~umask
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.code_connect.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, target)
+    except BaseException:
+        _code_connect_cache.update(path=None, mtime=None, data=None)
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+    _code_connect_cache.update(path=path, mtime=os.stat(path).st_mtime_ns, data=data)
+
+
+def _apply_code_connect_mapping(
+    data: Dict[str, Any],
+    params: FigmaCodeConnectAddInput,
+    timestamp: str
+) -> Tuple[str, Dict[str, Any]]:
+    """Add or update a mapping in loaded Code Connect data. Returns (action, mapping)."""
+    mappings = data.setdefault("mappings", {})
+    file_mappings = mappings.setdefault(params.file_key, {})
+
+    # Check if updating existing
+    is_update = params.node_id in file_mappings
+
+    # Create mapping
+    mapping = {
+        "component_path": params.component_path,
+        "component_name": params.component_name,
+        "props_mapping": params.props_mapping,
+        "variants": params.variants,
+        "example": params.example,
+        "updated_at": timestamp
+    }
+
+    if is_update:
+        # Preserve created_at
+        mapping["created_at"] = file_mappings[params.node_id].get("created_at", timestamp)
+    else:
+        mapping["created_at"] = timestamp
+
+    file_mappings[params.node_id] = mapping
+    return ("updated" if is_update else "added"), mapping
 
 
 def _get_current_timestamp() -> str:
@@ -486,38 +709,241 @@ def _get_current_timestamp() -> str:
     return datetime.now(timezone.utc).isoformat()
 
 
+# Token resolved from the environment on first use
+_figma_token: Optional[str] = None
+
+
 def _get_figma_token() -> str:
-    """Get Figma API token from environment."""
-    token = os.environ.get("FIGMA_ACCESS_TOKEN") or os.environ.get("FIGMA_TOKEN")
-    if not token:
-        raise ValueError(
-            "Figma API token not found. Set FIGMA_ACCESS_TOKEN or FIGMA_TOKEN environment variable. "
-            "Get your token from: https://www.figma.com/developers/api#access-tokens"
+    """Get Figma API token from environment (read once, then cached)."""
+    global _figma_token
+    if _figma_token is None:
+        token = os.environ.get("FIGMA_ACCESS_TOKEN") or os.environ.get("FIGMA_TOKEN")
+        if not token:
+            raise ValueError(
+                "Figma API token not found. Set FIGMA_ACCESS_TOKEN or FIGMA_TOKEN environment variable. "
+                "Get your token from: https://www.figma.com/developers/api#access-tokens"
+            )
+        _figma_token = token
+    return _figma_token
+
+
+def _reset_figma_token() -> None:
+    """Forget the cached token so the next request re-reads the environment."""
+    global _figma_token
+    _figma_token = None
+
+
+# Shared client, rebuilt when the token or the running event loop changes
+_http_client: Optional[httpx.AsyncClient] = None
+_http_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _get_http_client() -> httpx.AsyncClient:
+    """Return the pooled Figma API client, creating it on first use."""
+    global _http_client, _http_client_loop
+    token = _get_figma_token()
+    loop = asyncio.get_running_loop()
+    client = _http_client
+    if (
+        client is None
+        or client.is_closed
+        or _http_client_loop is not loop
+        or client.headers.get("X-Figma-Token") != token
+    ):
+        # The previous client is left for garbage collection: its loop may be gone
+        client = httpx.AsyncClient(
+            base_url=FIGMA_API_BASE,
+            headers={"X-Figma-Token": token},
+            timeout=DEFAULT_TIMEOUT,
+            limits=httpx.Limits(
+                max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=HTTP_KEEPALIVE_EXPIRY
+            )
         )
-    return token
+        _http_client, _http_client_loop = client, loop
+    return client
+
+
+async def _close_http_client() -> None:
+    """Close the pooled Figma API client, if one was created."""
+    global _http_client, _http_client_loop
+    client, _http_client, _http_client_loop = _http_client, None, None
+    if client is not None and not client.is_closed:
+        await client.aclose()
+
+
+# Decoded GET responses keyed by (endpoint, params), least recently used first
+_request_cache: "OrderedDict[Tuple[str, Tuple[Tuple[str, Any], ...]], Tuple[float, Dict[str, Any]]]" = OrderedDict()
+# In-flight fetch lock per key, with the number of callers holding or waiting on it
+_request_cache_locks: Dict[Tuple[str, Tuple[Tuple[str, Any], ...]], asyncio.Lock] = {}
+_request_cache_lock_users: Dict[Tuple[str, Tuple[Tuple[str, Any], ...]], int] = {}
+
+
+def _get_cached_response(key: Tuple[str, Tuple[Tuple[str, Any], ...]]) -> Optional[Dict[str, Any]]:
+    """Return a cached response if present and not expired.
+
+    Expired entries are kept until evicted so file payloads can be revalidated
+    against the current file version instead of downloaded again.
+    """
+    entry = _request_cache.get(key)
+    if entry is None:
+        return None
+    expires_at, data = entry
+    if expires_at < time.monotonic():
+        return None
+    _request_cache.move_to_end(key)
+    return data
+
+
+def _invalidate_request_cache(file_key: Optional[str] = None) -> int:
+    """Drop cached responses for a file (or all files). Returns the number of entries removed."""
+    if file_key is None:
+        removed = len(_request_cache)
+        _request_cache.clear()
+        return removed
+    stale = [key for key in _request_cache if key[0].split('/')[1:2] == [file_key]]
+    for key in stale:
+        del _request_cache[key]
+    return len(stale)
 
 
 async def _make_figma_request(
     endpoint: str,
     method: str = "GET",
     params: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """Make authenticated request to Figma API, serving repeated GETs from a TTL cache."""
+    if method != "GET":
+        return await _request_figma_api(endpoint, method, params)
+
+    key = (endpoint, tuple(sorted((params or {}).items())))
+    cached = _get_cached_response(key)
+    if cached is not None:
+        return cached
+
+    # One in-flight request per key; concurrent callers wait and reuse its result
+    lock = _request_cache_locks.get(key)
+    if lock is None:
+        lock = _request_cache_locks[key] = asyncio.Lock()
+    _request_cache_lock_users[key] = _request_cache_lock_users.get(key, 0) + 1
+    try:
+        async with lock:
+            cached = _get_cached_response(key)
+            if cached is not None:
+                return cached
+            cache_dir = _get_disk_cache_dir()
+            stale = _request_cache.get(key)
+            version = None
+            if _is_disk_cacheable(endpoint) and (stale is not None or cache_dir is not None):
+                version = await _fetch_file_version(endpoint)
+            if version and stale is not None and stale[1].get('version') == version:
+                data = stale[1]  # File unchanged since it was cached; only the TTL is renewed
+            elif version and cache_dir is not None:
+                data = await _request_with_disk_cache(endpoint, params, key, cache_dir, version)
+            else:
+                data = await _request_figma_api(endpoint, method, params)
+            _request_cache[key] = (time.monotonic() + REQUEST_CACHE_TTL, data)
+            while len(_request_cache) > REQUEST_CACHE_MAXSIZE:
+                _request_cache.popitem(last=False)
+            return data
+    finally:
+        # The lock stays while anyone still waits on it, even if this fetch
+        # failed; asyncio.Lock.locked() is already False before a woken waiter runs
+        users = _request_cache_lock_users[key] - 1
+        if users:
+            _request_cache_lock_users[key] = users
+        else:
+            del _request_cache_lock_users[key]
+            del _request_cache_locks[key]
+
+
+def _get_disk_cache_dir() -> Optional[Path]:
+    """Get the on-disk response cache directory, or None when disabled."""
+    path = os.environ.get(DISK_CACHE_DIR_ENV)
+    return Path(path).expanduser() if path else None
+
+
+def _is_disk_cacheable(endpoint: str) -> bool:
+    """Only file and node payloads carry a file version; image URLs expire."""
+    parts = endpoint.split('/')
+    return parts[0] == 'files' and (len(parts) == 2 or (len(parts) == 3 and parts[2] == 'nodes'))
+
+
+def _write_disk_cache(cache_dir: Path, file_key: str, version: str, path: Path, data: Dict[str, Any]) -> None:
+    """Atomically store a payload and drop entries for older versions of the file."""
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    payload = orjson.dumps(data) if orjson is not None else json.dumps(data).encode('utf-8')
+    fd, tmp_path = tempfile.mkstemp(dir=cache_dir, prefix='.figma.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(payload)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+    current = f"{file_key}_{version}_"
+    for stale in cache_dir.glob(f"{file_key}_*.json"):
+        if not stale.name.startswith(current):
+            try:
+                stale.unlink()
+            except OSError:
+                pass
+
+
+async def _fetch_file_version(endpoint: str) -> Optional[str]:
+    """Read the current version of the file behind a file/node endpoint.
+
+    Uses a depth=1 request (a few KB) instead of the full payload.
+    """
+    file_key = endpoint.split('/')[1]
+    probe = await _request_figma_api(f"files/{file_key}", params={"depth": 1})
+    return probe.get('version')
+
+
+async def _request_with_disk_cache(
+    endpoint: str,
+    params: Optional[Dict[str, Any]],
+    key: Tuple[str, Tuple[Tuple[str, Any], ...]],
+    cache_dir: Path,
+    version: str
+) -> Dict[str, Any]:
+    """Serve a file/node payload from disk while the file version is unchanged.
+
+    The full payload is only downloaded when no entry exists for that version.
+    """
+    file_key = endpoint.split('/')[1]
+    digest = hashlib.sha1(repr(key).encode('utf-8')).hexdigest()[:16]
+    path = cache_dir / f"{file_key}_{version}_{digest}.json"
+    try:
+        return _loads(await asyncio.to_thread(path.read_bytes))
+    except (OSError, ValueError):
+        pass
+
+    data = await _request_figma_api(endpoint, "GET", params)
+    try:
+        await asyncio.to_thread(_write_disk_cache, cache_dir, file_key, version, path, data)
+    except OSError:
+        pass  # Best effort: a failed write only costs a future download
+    return data
+
+
+async def _request_figma_api(
+    endpoint: str,
+    method: str = "GET",
+    params: Optional[Dict[str, Any]] = None
 ) -> Dict[str, Any]:
     """Make authenticated request to Figma API with retry logic."""
-    token = _get_figma_token()
+    client = _get_http_client()
     last_exception = None
 
     for attempt in range(MAX_RETRIES):
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.request(
-                    method=method,
-                    url=f"{FIGMA_API_BASE}/{endpoint}",
-                    headers={"X-Figma-Token": token},
-                    params=params,
-                    timeout=DEFAULT_TIMEOUT
-                )
-                response.raise_for_status()
-                return response.json()
+            response = await client.request(method, endpoint, params=params)
+            response.raise_for_status()
+            return _loads(response.content)
         except (httpx.ConnectError, httpx.ConnectTimeout, OSError) as e:
             last_exception = e
             if attempt < MAX_RETRIES - 1:
@@ -531,6 +957,29 @@ async def _make_figma_request(
     raise last_exception
 
 
+async def _render_images(
+    file_key: str,
+    node_ids: List[str],
+    params: Dict[str, Any]
+) -> Dict[str, Optional[str]]:
+    """Render node images in concurrent batches and merge the returned URL maps."""
+    semaphore = asyncio.Semaphore(IMAGE_REQUEST_CONCURRENCY)
+
+    async def render_batch(batch: List[str]) -> Dict[str, Optional[str]]:
+        async with semaphore:
+            data = await _make_figma_request(
+                f"images/{file_key}",
+                params={"ids": ",".join(batch), **params}
+            )
+        return data.get('images') or {}
+
+    batches = [node_ids[i:i + IMAGE_BATCH_SIZE] for i in range(0, len(node_ids), IMAGE_BATCH_SIZE)]
+    images: Dict[str, Optional[str]] = {}
+    for batch_images in await asyncio.gather(*(render_batch(batch) for batch in batches)):
+        images.update(batch_images)
+    return images
+
+
 def _with_version(response: str) -> str:
     """Append server version footer to tool responses."""
     return f"{response}\n\n---\n_MCP Server v{SERVER_VERSION}_"
@@ -576,36 +1025,45 @@ def _handle_api_error(e: Exception) -> str:
     return f"Error: {type(e).__name__}: {str(e)}"
 
 
+def _rgb_to_hex(r: int, g: int, b: int) -> str:
+    """Format 0-255 channel values as #rrggbb."""
+    if (r | g | b) >> 8:  # Out of range (or negative); keep the plain formatter's output
+        return f"#{r:02x}{g:02x}{b:02x}"
+    return "#" + _HEX[r] + _HEX[g] + _HEX[b]
+
+
 def _rgba_to_hex(color: Dict[str, float]) -> str:
     """Convert Figma RGBA color to hex."""
-    r = int(color.get('r', 0) * 255)
-    g = int(color.get('g', 0) * 255)
-    b = int(color.get('b', 0) * 255)
-    a = color.get('a', 1)
+    return _rgba_components_to_hex(color.get('r', 0), color.get('g', 0), color.get('b', 0), color.get('a', 1))
 
-    if a < 1:
-        return f"rgba({r}, {g}, {b}, {a:.2f})"
-    return f"#{r:02x}{g:02x}{b:02x}"
 
+_rgba_match = re.compile(r'rgba\((\d+),\s*(\d+),\s*(\d+)').match
 
+
+@lru_cache(maxsize=4096)
 def _hex_to_rgb(hex_color: str) -> tuple:
     """Convert hex color to RGB tuple (0-255 values)."""
-    # Handle rgba format
-    if hex_color.startswith('rgba'):
-        import re
-        match = re.match(r'rgba\((\d+),\s*(\d+),\s*(\d+)', hex_color)
-        if match:
-            return (int(match.group(1)), int(match.group(2)), int(match.group(3)))
-        return (0, 0, 0)
+    match hex_color[:1]:
+        case '#':
+            hex_color = hex_color[1:]
+        case 'r':
+            # rgba(...) format
+            rgba = _rgba_match(hex_color)
+            if rgba:
+                return (int(rgba.group(1)), int(rgba.group(2)), int(rgba.group(3)))
+            return (0, 0, 0)
 
-    hex_color = hex_color.lstrip('#')
     if len(hex_color) == 3:
-        hex_color = ''.join([c*2 for c in hex_color])
+        hex_color = ''.join(c*2 for c in hex_color)
     if len(hex_color) != 6:
         return (0, 0, 0)
-    return tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
+    try:
+        return tuple(bytes.fromhex(hex_color))
+    except ValueError:
+        return (0, 0, 0)
 
 
+@lru_cache(maxsize=4096)
 def _rgb_to_hsl(r: int, g: int, b: int) -> tuple:
     """Convert RGB (0-255) to HSL (h: 0-360, s: 0-100, l: 0-100)."""
     r, g, b = r / 255, g / 255, b / 255
@@ -636,6 +1094,7 @@ def _calculate_luminance(r: int, g: int, b: int) -> float:
     return 0.2126 * adjust(r) + 0.7152 * adjust(g) + 0.0722 * adjust(b)
 
 
+@lru_cache(maxsize=4096)
 def _contrast_ratio(color1_rgb: tuple, color2_rgb: tuple) -> float:
     """Calculate WCAG contrast ratio between two colors (RGB tuples 0-255)."""
     l1 = _calculate_luminance(*color1_rgb)
@@ -666,7 +1125,7 @@ def _extract_gradient_stops(gradient_stops: List[Dict[str, Any]]) -> List[Dict[s
     """Extract gradient color stops."""
     stops = []
     for stop in gradient_stops:
-        color = stop.get('color', {})
+        color = stop.get('color') or _EMPTY_DICT
         stops.append({
             'position': round(stop.get('position', 0), 4),
             'color': _rgba_to_hex(color),
@@ -691,7 +1150,7 @@ def _extract_fill_data(fill: Dict[str, Any], node_name: str) -> Optional[Dict[st
     }
 
     if fill_type == 'SOLID':
-        color = fill.get('color', {})
+        color = fill.get('color') or _EMPTY_DICT
         hex_color = _rgba_to_hex(color)
         base_data['hex'] = hex_color
 
@@ -750,7 +1209,7 @@ def _extract_stroke_data(node: Dict[str, Any]) -> Optional[Dict[str, Any]]:
             }
 
             if stroke_type == 'SOLID':
-                hex_color = _rgba_to_hex(stroke.get('color', {}))
+                hex_color = _rgba_to_hex(stroke.get('color') or _EMPTY_DICT)
                 stroke_data['hex'] = hex_color
                 stroke_data['color'] = hex_color
                 # Add rich color information
@@ -831,7 +1290,7 @@ def _extract_children_summary(children: List[Dict[str, Any]], depth: int = 0, ma
     MAX_CHILDREN_PER_LEVEL = 30
     summaries = []
 
-    for child in children[:MAX_CHILDREN_PER_LEVEL]:
+    for child in islice(children, MAX_CHILDREN_PER_LEVEL):
         if not child.get('visible', True):
             continue
 
@@ -857,12 +1316,8 @@ def _extract_children_summary(children: List[Dict[str, Any]], depth: int = 0, ma
                 for f in visible_fills[:3]:
                     f_type = f.get('type', '')
                     if f_type == 'SOLID':
-                        color = f.get('color', {})
-                        hex_color = '#{:02x}{:02x}{:02x}'.format(
-                            int(color.get('r', 0) * 255),
-                            int(color.get('g', 0) * 255),
-                            int(color.get('b', 0) * 255)
-                        )
+                        color = f.get('color') or _EMPTY_DICT
+                        hex_color = _rgba_components_to_hex(color.get('r', 0), color.get('g', 0), color.get('b', 0), 1)
                         fill_summary.append(hex_color)
                     elif 'GRADIENT' in f_type:
                         fill_summary.append(f_type.replace('GRADIENT_', '').lower() + ' gradient')
@@ -886,7 +1341,7 @@ def _extract_children_summary(children: List[Dict[str, Any]], depth: int = 0, ma
                     summary['gap'] = gap
 
         # Recurse into grandchildren
-        grandchildren = child.get('children', [])
+        grandchildren = child.get('children') or _EMPTY_TUPLE
         if grandchildren:
             summary['childrenCount'] = len(grandchildren)
             if depth < max_depth - 1:
@@ -951,7 +1406,7 @@ def _render_children_markdown(lines: List[str], children: List[Dict[str, Any]],
 
 def _extract_constraints(node: Dict[str, Any]) -> Optional[Dict[str, Any]]:
     """Extract layout constraints for responsive behavior."""
-    constraints = node.get('constraints', {})
+    constraints = node.get('constraints') or _EMPTY_DICT
     if not constraints:
         return None
 
@@ -1045,7 +1500,7 @@ def _extract_component_info(node: Dict[str, Any]) -> Optional[Dict[str, Any]]:
 
 def _extract_bound_variables(node: Dict[str, Any]) -> Optional[Dict[str, Any]]:
     """Extract Figma variables bound to this node."""
-    bound_variables = node.get('boundVariables', {})
+    bound_variables = node.get('boundVariables') or _EMPTY_DICT
     if not bound_variables:
         return None
 
@@ -1115,7 +1570,7 @@ def _extract_image_references(node: Dict[str, Any], file_key: str = '') -> Optio
                     image_info['rotation'] = fill.get('rotation')
 
                 # Filters (exposure, contrast, saturation, etc.)
-                filters = fill.get('filters', {})
+                filters = fill.get('filters') or _EMPTY_DICT
                 if filters:
                     image_info['filters'] = filters
 
@@ -1151,7 +1606,7 @@ async def _resolve_image_urls(file_key: str, image_refs: List[str]) -> Dict[str,
         )
 
         # The response contains a mapping of imageRef -> URL
-        images = data.get('meta', {}).get('images', {})
+        images = (data.get('meta') or _EMPTY_DICT).get('images') or _EMPTY_DICT
         return images
     except Exception:
         return {}
@@ -1176,7 +1631,7 @@ def _generate_svg_from_paths(vector_paths: Dict[str, Any], node: Dict[str, Any])
         return None
 
     # Get bounding box for viewBox
-    bbox = node.get('absoluteBoundingBox', {})
+    bbox = node.get('absoluteBoundingBox') or _EMPTY_DICT
     width = bbox.get('width', 24)
     height = bbox.get('height', 24)
 
@@ -1185,11 +1640,8 @@ def _generate_svg_from_paths(vector_paths: Dict[str, Any], node: Dict[str, Any])
     fills = node.get('fills', [])
     for fill in fills:
         if fill.get('type') == 'SOLID' and fill.get('visible', True):
-            color = fill.get('color', {})
-            r = int(color.get('r', 0) * 255)
-            g = int(color.get('g', 0) * 255)
-            b = int(color.get('b', 0) * 255)
-            fill_color = f'#{r:02x}{g:02x}{b:02x}'
+            color = fill.get('color') or _EMPTY_DICT
+            fill_color = _rgba_components_to_hex(color.get('r', 0), color.get('g', 0), color.get('b', 0), 1)
             break
 
     # Get stroke color
@@ -1198,11 +1650,8 @@ def _generate_svg_from_paths(vector_paths: Dict[str, Any], node: Dict[str, Any])
     strokes = node.get('strokes', [])
     for stroke in strokes:
         if stroke.get('type') == 'SOLID' and stroke.get('visible', True):
-            color = stroke.get('color', {})
-            r = int(color.get('r', 0) * 255)
-            g = int(color.get('g', 0) * 255)
-            b = int(color.get('b', 0) * 255)
-            stroke_color = f'#{r:02x}{g:02x}{b:02x}'
+            color = stroke.get('color') or _EMPTY_DICT
+            stroke_color = _rgba_components_to_hex(color.get('r', 0), color.get('g', 0), color.get('b', 0), 1)
             stroke_width = node.get('strokeWeight', 1)
             break
 
@@ -1252,7 +1701,7 @@ def _is_icon_frame(node: Dict[str, Any]) -> bool:
     has_icon_pattern = ':' in node_name
 
     # Check size - icons are typically 8-128px and roughly square
-    abs_box = node.get('absoluteBoundingBox', {})
+    abs_box = node.get('absoluteBoundingBox') or _EMPTY_DICT
     width = abs_box.get('width', 0)
     height = abs_box.get('height', 0)
 
@@ -1266,12 +1715,12 @@ def _is_icon_frame(node: Dict[str, Any]) -> bool:
     # Check if has vector children (actual icon content)
     vector_types = {'VECTOR', 'BOOLEAN_OPERATION', 'STAR', 'POLYGON', 'ELLIPSE', 'LINE', 'REGULAR_POLYGON'}
     has_vector_children = False
-    for child in node.get('children', []):
+    for child in node.get('children') or _EMPTY_TUPLE:
         if child.get('type') in vector_types:
             has_vector_children = True
             break
         # Also check nested children (for grouped icons)
-        for grandchild in child.get('children', []):
+        for grandchild in child.get('children') or _EMPTY_TUPLE:
             if grandchild.get('type') in vector_types:
                 has_vector_children = True
                 break
@@ -1296,7 +1745,7 @@ def _is_chart_or_illustration(node: Dict[str, Any]) -> bool:
         True if the node appears to be a chart or illustration
     """
     # Check size - charts are typically larger than icons
-    abs_box = node.get('absoluteBoundingBox', {})
+    abs_box = node.get('absoluteBoundingBox') or _EMPTY_DICT
     width = abs_box.get('width', 0)
     height = abs_box.get('height', 0)
 
@@ -1310,7 +1759,7 @@ def _is_chart_or_illustration(node: Dict[str, Any]) -> bool:
         return True
 
     # Count children - charts typically have multiple elements
-    children = node.get('children', [])
+    children = node.get('children') or _EMPTY_TUPLE
     child_count = len(children)
 
     # Count vector children
@@ -1379,7 +1828,7 @@ def _collect_all_assets(
     is_chart = _is_chart_or_illustration(node)
 
     if include_icons and not is_chart and _is_icon_frame(node):
-        abs_box = node.get('absoluteBoundingBox', {})
+        abs_box = node.get('absoluteBoundingBox') or _EMPTY_DICT
         assets['icons'].append({
             'nodeId': node_id,
             'nodeName': node_name,
@@ -1402,7 +1851,7 @@ def _collect_all_assets(
             })
 
     # Recurse into children
-    for child in node.get('children', []):
+    for child in node.get('children') or _EMPTY_TUPLE:
         _collect_all_assets(child, file_key, assets, include_icons, include_vectors, include_exports)
 
 
@@ -1469,8 +1918,8 @@ def _extract_interactions(node: Dict[str, Any]) -> Optional[List[Dict[str, Any]]
 
     extracted = []
     for i in interactions:
-        trigger = i.get('trigger', {})
-        action = i.get('action', {})
+        trigger = i.get('trigger') or _EMPTY_DICT
+        action = i.get('action') or _EMPTY_DICT
 
         interaction = {
             'trigger': {
@@ -1504,12 +1953,12 @@ def _extract_interactions(node: Dict[str, Any]) -> Optional[List[Dict[str, Any]]
             interaction['action']['url'] = action.get('url')
 
         # Transition configuration
-        transition = action.get('transition', {})
+        transition = action.get('transition') or _EMPTY_DICT
         if transition:
             interaction['action']['transition'] = {
                 'type': transition.get('type'),  # INSTANT, DISSOLVE, SMART_ANIMATE, MOVE_IN, MOVE_OUT, PUSH, SLIDE_IN, SLIDE_OUT
                 'duration': transition.get('duration'),  # milliseconds
-                'easing': transition.get('easing', {}).get('type') if isinstance(transition.get('easing'), dict) else transition.get('easing')
+                'easing': (transition.get('easing') or _EMPTY_DICT).get('type') if isinstance(transition.get('easing'), dict) else transition.get('easing')
             }
 
         # Overlay positioning for overlay actions
@@ -1538,7 +1987,7 @@ def _extract_export_settings(node: Dict[str, Any]) -> Optional[List[Dict[str, An
         }
 
         # Constraint (scale, width, height)
-        constraint = s.get('constraint', {})
+        constraint = s.get('constraint') or _EMPTY_DICT
         if constraint:
             export_config['constraint'] = {
                 'type': constraint.get('type'),  # SCALE, WIDTH, HEIGHT
@@ -1579,7 +2028,7 @@ def _extract_effects_data(node: Dict[str, Any]) -> Dict[str, Any]:
         effect_type = effect.get('type', '')
 
         if effect_type in ['DROP_SHADOW', 'INNER_SHADOW']:
-            color = effect.get('color', {})
+            color = effect.get('color') or _EMPTY_DICT
             offset = effect.get('offset', {'x': 0, 'y': 0})
             hex_color = _rgba_to_hex(color)
             rgb = _hex_to_rgb(hex_color)
@@ -1736,10 +2185,13 @@ def _generate_implementation_hints(node: Dict[str, Any], interactions: Optional[
                 layout_hints.append("Center items along cross axis")
 
     # Check for grid-like layouts (multiple children with same size)
-    children = node.get('children', [])
+    children = node.get('children') or _EMPTY_TUPLE
     if len(children) >= 3:
-        child_widths = [c.get('absoluteBoundingBox', {}).get('width', 0) for c in children if c.get('absoluteBoundingBox')]
-        if child_widths and len(set(round(w) for w in child_widths)) == 1:
+        # Distinct rounded widths, collected in one pass
+        child_widths = {
+            round(bbox.get('width', 0)) for c in children if (bbox := c.get('absoluteBoundingBox'))
+        }
+        if len(child_widths) == 1:
             if framework in ('swiftui',):
                 layout_hints.append(f"Consider LazyVGrid with {len(children)}-column GridItem layout")
             elif framework in ('kotlin',):
@@ -1748,7 +2200,7 @@ def _generate_implementation_hints(node: Dict[str, Any], interactions: Optional[
                 layout_hints.append(f"Consider CSS Grid with {len(children)}-column layout")
 
     # Responsive hints based on size
-    bbox = node.get('absoluteBoundingBox', {})
+    bbox = node.get('absoluteBoundingBox') or _EMPTY_DICT
     width = bbox.get('width', 0)
     if width > 1200:
         responsive_hints.append("Large container - consider max-width constraint for readability")
@@ -1756,7 +2208,7 @@ def _generate_implementation_hints(node: Dict[str, Any], interactions: Optional[
         responsive_hints.append("Below 768px: Consider stacking layout vertically")
 
     # Check for percentage-based constraints
-    constraints = node.get('constraints', {})
+    constraints = node.get('constraints') or _EMPTY_DICT
     if constraints.get('horizontal') == 'SCALE':
         responsive_hints.append("Width scales with parent - use percentage or flex-grow")
     if constraints.get('vertical') == 'SCALE':
@@ -1765,15 +2217,15 @@ def _generate_implementation_hints(node: Dict[str, Any], interactions: Optional[
     # Interaction hints
     if interactions:
         for interaction in interactions:
-            trigger = interaction.get('trigger', {}).get('type', '')
-            action = interaction.get('action', {})
+            trigger = (interaction.get('trigger') or _EMPTY_DICT).get('type', '')
+            action = interaction.get('action') or _EMPTY_DICT
             action_type = action.get('type', '')
-            transition = action.get('transition', {})
+            transition = action.get('transition') or _EMPTY_DICT
 
             if trigger == 'ON_HOVER':
                 if action_type == 'NODE' and transition:
                     duration = transition.get('duration', 300)
-                    easing = transition.get('easing', {}).get('type', 'ease-out').lower().replace('_', '-')
+                    easing = (transition.get('easing') or _EMPTY_DICT).get('type', 'ease-out').lower().replace('_', '-')
                     interaction_hints.append(f"Add hover transition: {duration}ms {easing}")
             elif trigger == 'ON_CLICK':
                 if action_type == 'URL':
@@ -1794,7 +2246,7 @@ def _generate_implementation_hints(node: Dict[str, Any], interactions: Optional[
     fills = node.get('fills', [])
     for fill in fills:
         if fill.get('type') == 'SOLID' and fill.get('visible', True):
-            color = fill.get('color', {})
+            color = fill.get('color') or _EMPTY_DICT
             # Check if it's light text on light background
             r, g, b = color.get('r', 0), color.get('g', 0), color.get('b', 0)
             luminance = 0.2126 * r + 0.7152 * g + 0.0722 * b
@@ -1810,11 +2262,11 @@ def _generate_implementation_hints(node: Dict[str, Any], interactions: Optional[
 
     # Component hints
     if node_type == 'INSTANCE':
-        component_props = node.get('componentProperties', {})
-        variant_props = node.get('variantProperties', {})
+        component_props = node.get('componentProperties') or _EMPTY_DICT
+        variant_props = node.get('variantProperties') or _EMPTY_DICT
 
         if variant_props:
-            variants_str = ', '.join([f"{k}={v}" for k, v in variant_props.items()])
+            variants_str = ', '.join(f"{k}={v}" for k, v in variant_props.items())
             component_hints.append(f"Component variant: {variants_str}")
 
         if component_props:
@@ -1822,7 +2274,7 @@ def _generate_implementation_hints(node: Dict[str, Any], interactions: Optional[
             component_hints.append(f"Exposed props: {props_str}")
 
     elif node_type == 'COMPONENT':
-        prop_defs = node.get('componentPropertyDefinitions', {})
+        prop_defs = node.get('componentPropertyDefinitions') or _EMPTY_DICT
         if prop_defs:
             component_hints.append(f"Component has {len(prop_defs)} customizable properties")
 
@@ -1857,7 +2309,7 @@ def _check_accessibility(node: Dict[str, Any], parent_fills: Optional[List] = No
 
     node_name = node.get('name', '')
     node_type = node.get('type', '')
-    bbox = node.get('absoluteBoundingBox', {})
+    bbox = node.get('absoluteBoundingBox') or _EMPTY_DICT
 
     # Touch target size check for interactive elements
     interactive_keywords = ['button', 'btn', 'icon', 'link', 'tap', 'click', 'toggle', 'checkbox', 'radio', 'switch']
@@ -1886,7 +2338,7 @@ def _check_accessibility(node: Dict[str, Any], parent_fills: Optional[List] = No
     # Label warnings for icon-only buttons
     if is_interactive and ('icon' in node_name.lower() or node_type == 'VECTOR'):
         # Check if there's no text child
-        children = node.get('children', [])
+        children = node.get('children') or _EMPTY_TUPLE
         has_text = any(c.get('type') == 'TEXT' for c in children)
         if not has_text:
             issues['label_warnings'].append({
@@ -1902,7 +2354,7 @@ def _check_accessibility(node: Dict[str, Any], parent_fills: Optional[List] = No
 
         for fill in fills:
             if fill.get('type') == 'SOLID' and fill.get('visible', True):
-                color = fill.get('color', {})
+                color = fill.get('color') or _EMPTY_DICT
                 r = int(color.get('r', 0) * 255)
                 g = int(color.get('g', 0) * 255)
                 b = int(color.get('b', 0) * 255)
@@ -1913,7 +2365,7 @@ def _check_accessibility(node: Dict[str, Any], parent_fills: Optional[List] = No
                 black_contrast = _contrast_ratio(text_rgb, (0, 0, 0))
 
                 # Get font size for threshold determination
-                style = node.get('style', {})
+                style = node.get('style') or _EMPTY_DICT
                 font_size = style.get('fontSize', 16)
                 font_weight = style.get('fontWeight', 400)
 
@@ -1922,7 +2374,7 @@ def _check_accessibility(node: Dict[str, Any], parent_fills: Optional[List] = No
                 min_contrast = 3.0 if is_large_text else 4.5
 
                 # Check if contrast might be insufficient
-                hex_color = f"#{r:02x}{g:02x}{b:02x}"
+                hex_color = _rgb_to_hex(r, g, b)
 
                 if white_contrast < min_contrast and black_contrast < min_contrast:
                     issues['contrast_issues'].append({
@@ -1972,18 +2424,10 @@ def _gradient_to_css(fill: Dict[str, Any]) -> Optional[str]:
     # Build color stops string
     stops_css = []
     for stop in gradient_stops:
-        color = stop.get('color', {})
+        color = stop.get('color') or _EMPTY_DICT
         position = stop.get('position', 0)
-        hex_color = _rgba_to_hex(color)
-        alpha = color.get('a', 1)
-        if alpha < 1:
-            # Use rgba for transparency
-            r = int(color.get('r', 0) * 255)
-            g = int(color.get('g', 0) * 255)
-            b = int(color.get('b', 0) * 255)
-            stops_css.append(f"rgba({r}, {g}, {b}, {alpha:.2f}) {int(position * 100)}%")
-        else:
-            stops_css.append(f"{hex_color} {int(position * 100)}%")
+        # Already rgba(...) for translucent stops
+        stops_css.append(f"{_rgba_to_hex(color)} {int(position * 100)}%")
 
     stops_str = ', '.join(stops_css)
 
@@ -2130,7 +2574,7 @@ def _build_css_ready_background(fills: List[Dict[str, Any]], node_opacity: float
             else:
                 css_parts.append(hex_color)
         elif fill_type.startswith('GRADIENT_'):
-            gradient = fill.get('gradient', {})
+            gradient = fill.get('gradient') or _EMPTY_DICT
             stops = gradient.get('stops', [])
             gradient_type = gradient.get('type', 'LINEAR')
             stops_css = []
@@ -2249,7 +2693,7 @@ def _build_css_ready_layout(auto_layout: Optional[Dict[str, Any]], bounds: Optio
         gap = auto_layout.get('gap', 0)
         if gap:
             result['gap'] = f"{int(gap)}px"
-        padding = auto_layout.get('padding', {})
+        padding = auto_layout.get('padding') or _EMPTY_DICT
         t = int(padding.get('top', 0))
         r = int(padding.get('right', 0))
         b = int(padding.get('bottom', 0))
@@ -2408,7 +2852,7 @@ def _build_css_ready_section(node_details: Dict[str, Any]) -> Optional[Dict[str,
     if typography_css:
         css.update(typography_css)
     # Transform
-    transform = node_details.get('transform', {})
+    transform = node_details.get('transform') or _EMPTY_DICT
     transform_css = _transform_to_css_from_details(transform)
     if transform_css:
         css['transform'] = transform_css
@@ -2456,7 +2900,7 @@ def _get_single_fill_css(fill: Dict[str, Any]) -> Optional[str]:
     fill_type = fill.get('type', '')
 
     if fill_type == 'SOLID':
-        color = fill.get('color', {})
+        color = fill.get('color') or _EMPTY_DICT
         opacity = fill.get('opacity', 1)
         hex_color = _rgba_to_hex(color)
 
@@ -2538,15 +2982,50 @@ def _get_background_css(node: Dict[str, Any]) -> tuple[Optional[str], Optional[s
     return layered_css, 'layered'
 
 
+# Skeleton for the plain HTML/CSS fallback in figma_generate_code
+_HTML_CSS_TEMPLATE = """<!-- {name} -->
+<div class="{css_class}">
+  <!-- Content -->
+</div>
+
+<style>
+.{css_class} {{
+  width: {width}px;
+  height: {height}px;
+  {background}
+}}
+</style>
+"""
+
+
+def _generate_html_css_code(node: Dict[str, Any], component_name: str) -> str:
+    """Generate a minimal HTML/CSS skeleton sized and filled like the node."""
+    bbox = node.get('absoluteBoundingBox') or _EMPTY_DICT
+    fills = node.get('fills', [])
+    bg = ''
+    if fills and fills[0].get('type') == 'SOLID':
+        bg = f"background-color: {_rgba_to_hex(fills[0].get('color') or _EMPTY_DICT)};"
+
+    return _HTML_CSS_TEMPLATE.format(
+        name=component_name,
+        css_class=component_name.lower(),
+        width=int(bbox.get('width', 0)),
+        height=int(bbox.get('height', 0)),
+        background=bg
+    )
+
+
 # ============================================================================
 # Design Token Code Generation Helpers
 # ============================================================================
 
+_token_name_sub = re.compile(r'[^a-zA-Z0-9]+').sub
+
+
 def _sanitize_token_name(name: str) -> str:
     """Sanitize token name for use in CSS/SCSS variables and Tailwind config."""
     # Convert to lowercase, replace spaces and special chars with hyphens
-    import re
-    sanitized = re.sub(r'[^a-zA-Z0-9]+', '-', name.lower())
+    sanitized = _token_name_sub('-', name.lower())
     # Remove leading/trailing hyphens
     sanitized = sanitized.strip('-')
     return sanitized or 'unnamed'
@@ -2616,7 +3095,7 @@ def _generate_style_variables(
         for sp in spacing:
             if sp.get('type') == 'auto-layout':
                 name = _sanitize_token_name(sp.get('name', 'spacing'))
-                padding = sp.get('padding', {})
+                padding = sp.get('padding') or _EMPTY_DICT
                 gap = sp.get('gap', 0)
                 key = f"{padding.get('top', 0)}-{padding.get('right', 0)}-{gap}"
                 if key not in seen_spacing:
@@ -2633,7 +3112,7 @@ def _generate_style_variables(
         for effect in effects:
             if effect.get('type') in ['DROP_SHADOW', 'INNER_SHADOW']:
                 hex_val = effect.get('hex') or effect.get('color', '#000')
-                offset = effect.get('offset', {})
+                offset = effect.get('offset') or _EMPTY_DICT
                 x = offset.get('x', 0)
                 y = offset.get('y', 0)
                 blur = effect.get('radius', 0)
@@ -2668,7 +3147,7 @@ def _generate_tailwind_config(colors: List[Dict], typography: List[Dict], spacin
     color_entries = {}
     for color in colors:
         hex_val = color.get('hex') or color.get('color', '')
-        if hex_val and not hex_val.startswith('/*') and not hex_val.startswith('rgba'):
+        if hex_val and not hex_val.startswith(('/*', 'rgba')):
             name = _sanitize_token_name(color.get('name', 'color'))
             if name not in color_entries:
                 color_entries[name] = hex_val
@@ -2728,13 +3207,55 @@ def _generate_tailwind_config(colors: List[Dict], typography: List[Dict], spacin
     return "\n".join(lines)
 
 
-def _extract_colors_from_node(node: Dict[str, Any], colors: List[Dict[str, Any]]) -> None:
-    """Recursively extract colors from node tree with full gradient and image support."""
-    node_name = node.get('name', 'Unknown')
+# Approximate serialized size (chars, indent=2) of a single token per category.
+# Used to detect oversized responses before building and serializing them.
+TOKEN_SIZE_ESTIMATES = {
+    'colors': 300,
+    'typography': 700,
+    'spacing': 450,
+    'shadows': 260,
+    'blurs': 90,
+}
+
+
+def _estimate_tokens_size(tokens: Dict[str, List[Dict[str, Any]]]) -> int:
+    """Estimate the serialized JSON size of extracted tokens without serializing them."""
+    return sum(len(items) * TOKEN_SIZE_ESTIMATES.get(key, 300) for key, items in tokens.items())
+
+
+def _token_sort_key(item: Dict[str, Any]) -> Tuple[str, str]:
+    """Stable ordering for token records (by name, then value)."""
+    return (str(item.get('name', '')), str(item.get('hex') or item.get('color') or item.get('type') or ''))
+
+
+def _truncate_token_categories(tokens: Dict[str, Any], max_per_category: int) -> None:
+    """Limit each token category to max_per_category items, appending a truncation marker.
+
+    Oversized categories are sorted before slicing so the kept subset is the same
+    across requests regardless of extraction order.
+    """
+    for key, items in tokens.items():
+        if isinstance(items, list) and len(items) > max_per_category:
+            kept = [item for item in items if not item.get('_truncated')]
+            # Carry over the count dropped by an earlier truncation pass
+            omitted = sum(item.get('_omitted', 0) for item in items if item.get('_truncated'))
+            omitted += max(len(kept) - max_per_category, 0)
+            kept.sort(key=_token_sort_key)
+            tokens[key] = kept[:max_per_category]
+            tokens[key].append({
+                '_truncated': True,
+                '_omitted': omitted,
+                '_message': f'{omitted} more items. Use node_id to narrow scope.'
+            })
+
+
+def _collect_node_colors(node: Dict[str, Any], colors: List[Dict[str, Any]]) -> None:
+    """Extract colors from a single node with full gradient and image support."""
+    get = node.get
+    node_name = get('name', 'Unknown')
 
     # Fill colors (with gradient and image support)
-    fills = node.get('fills', [])
-    for fill in fills:
+    for fill in get('fills', ()):
         fill_data = _extract_fill_data(fill, node_name)
         if fill_data:
             colors.append(fill_data)
@@ -2756,6 +3277,8 @@ def _extract_colors_from_node(node: Dict[str, Any], colors: List[Dict[str, Any]]
             })
 
     # Shadow colors
+    if not get('effects'):
+        return
     effects_data = _extract_effects_data(node)
     if effects_data['shadows']:
         for shadow in effects_data['shadows']:
@@ -2770,24 +3293,40 @@ def _extract_colors_from_node(node: Dict[str, Any], colors: List[Dict[str, Any]]
                 'spread': shadow['spread']
             })
 
-    # Recurse into children
-    for child in node.get('children', []):
-        _extract_colors_from_node(child, colors)
+
+def _iter_nodes(root: Dict[str, Any], skip_hidden: bool = False) -> Iterator[Dict[str, Any]]:
+    """Yield every node of a tree in depth-first pre-order, without recursion.
+
+    With ``skip_hidden``, descendants marked ``visible: false`` are pruned along
+    with their subtrees. The root is always yielded.
+    """
+    yield root
+    stack = list(reversed(root.get('children') or _EMPTY_TUPLE))
+    pop = stack.pop
+    push = stack.extend
+    while stack:
+        node = pop()
+        if skip_hidden and node.get('visible') is False:
+            continue
+        yield node
+        children = node.get('children')
+        if children:
+            push(reversed(children))
 
 
-def _extract_typography_from_node(node: Dict[str, Any], typography: List[Dict[str, Any]]) -> None:
-    """Recursively extract typography from node tree with advanced text properties."""
+def _collect_node_typography(node: Dict[str, Any], typography: List[Dict[str, Any]]) -> None:
+    """Extract typography from a single TEXT node with advanced text properties."""
     if node.get('type') == 'TEXT':
-        style = node.get('style', {})
+        style = node.get('style') or _EMPTY_DICT
 
         # Extract text fills for color
-        fills = node.get('fills', [])
+        fills = node.get('fills', ())
         text_color = None
         text_gradient = None
         for fill in fills:
             if fill.get('visible', True):
                 if fill.get('type') == 'SOLID':
-                    text_color = _rgba_to_hex(fill.get('color', {}))
+                    text_color = _rgba_to_hex(fill.get('color') or _EMPTY_DICT)
                 elif fill.get('type', '').startswith('GRADIENT_'):
                     text_gradient = {
                         'type': fill.get('type').replace('GRADIENT_', ''),
@@ -2839,13 +3378,11 @@ def _extract_typography_from_node(node: Dict[str, Any], typography: List[Dict[st
             'hyperlink': node.get('hyperlink')
         })
 
-    for child in node.get('children', []):
-        _extract_typography_from_node(child, typography)
 
-
-def _extract_spacing_from_node(node: Dict[str, Any], spacing: List[Dict[str, Any]]) -> None:
-    """Recursively extract spacing/padding from node tree with advanced layout properties."""
-    node_name = node.get('name', 'Unknown')
+def _collect_node_spacing(node: Dict[str, Any], spacing: List[Dict[str, Any]]) -> None:
+    """Extract spacing/padding from a single node with advanced layout properties."""
+    get = node.get
+    node_name = get('name', 'Unknown')
 
     # Auto-layout properties (comprehensive)
     auto_layout = _extract_auto_layout(node)
@@ -2857,7 +3394,7 @@ def _extract_spacing_from_node(node: Dict[str, Any], spacing: List[Dict[str, Any
         })
 
     # Absolute bounds
-    bbox = node.get('absoluteBoundingBox', {})
+    bbox = get('absoluteBoundingBox')
     if bbox:
         bounds_data = {
             'name': node_name,
@@ -2892,40 +3429,163 @@ def _extract_spacing_from_node(node: Dict[str, Any], spacing: List[Dict[str, Any
             **constraints
         })
 
-    for child in node.get('children', []):
-        _extract_spacing_from_node(child, spacing)
+
+@dataclass(slots=True, frozen=True)
+class ShadowToken:
+    """Shadow effect token. Equality and hash ignore the source node name so duplicates collapse."""
+    name: str = field(compare=False)
+    type: str
+    color: str
+    offset_x: float
+    offset_y: float
+    radius: float
+    spread: float
+    blend_mode: str
+    show_behind_node: bool
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'name': self.name,
+            'type': self.type,
+            'color': self.color,
+            'offset': {'x': self.offset_x, 'y': self.offset_y},
+            'radius': self.radius,
+            'spread': self.spread,
+            'blendMode': self.blend_mode,
+            'showShadowBehindNode': self.show_behind_node
+        }
+
+
+@dataclass(slots=True, frozen=True)
+class BlurToken:
+    """Blur effect token. Equality and hash ignore the source node name so duplicates collapse."""
+    name: str = field(compare=False)
+    type: str
+    radius: float
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'name': self.name, 'type': self.type, 'radius': self.radius}
 
 
-def _extract_shadows_from_node(node: Dict[str, Any], shadows: List[Dict[str, Any]]) -> None:
-    """Recursively extract all effects (shadows and blurs) from node tree."""
+def _collect_node_effects(
+    node: Dict[str, Any],
+    shadows: Dict[ShadowToken, None],
+    blurs: Dict[BlurToken, None]
+) -> None:
+    """Extract effects (shadows and blurs) from a single node.
+
+    Records are collected as dict keys, which deduplicates them by value
+    while keeping the first occurrence in document order.
+    """
     effects_data = _extract_effects_data(node)
     node_name = node.get('name', 'Unknown')
 
     # Add shadows
     if effects_data['shadows']:
         for shadow in effects_data['shadows']:
-            shadows.append({
-                'name': node_name,
-                'type': shadow['type'],
-                'color': shadow['color'],
-                'offset': shadow['offset'],
-                'radius': shadow['radius'],
-                'spread': shadow['spread'],
-                'blendMode': shadow['blendMode'],
-                'showShadowBehindNode': shadow['showShadowBehindNode']
-            })
+            # Interned strings make repeated design-system values hash and compare by identity
+            token = ShadowToken(
+                node_name, sys.intern(shadow['type']), sys.intern(shadow['color']),
+                shadow['offset']['x'], shadow['offset']['y'],
+                shadow['radius'], shadow['spread'],
+                shadow['blendMode'], shadow['showShadowBehindNode']
+            )
+            shadows.setdefault(token)
 
     # Add blurs
     if effects_data['blurs']:
         for blur in effects_data['blurs']:
-            shadows.append({
-                'name': node_name,
-                'type': blur['type'],
-                'radius': blur['radius']
-            })
+            blurs.setdefault(BlurToken(node_name, sys.intern(blur['type']), blur['radius']))
+
+
+def _extract_all(node: Dict[str, Any], out: Dict[str, Any]) -> None:
+    """Extract every requested token kind from the node tree in a single walk.
+
+    Only the buckets present in ``out`` are filled: 'colors', 'typography' and
+    'spacing' are lists, 'shadows' and 'blurs' are dicts of effect tokens (both
+    must be given together).
+    """
+    # Bind the requested collectors once so the walk does no per-node bucket checks
+    collectors: List[Callable[[Dict[str, Any]], None]] = []
+    if 'colors' in out:
+        collectors.append(partial(_collect_node_colors, colors=out['colors']))
+    if 'typography' in out:
+        collectors.append(partial(_collect_node_typography, typography=out['typography']))
+    if 'spacing' in out:
+        collectors.append(partial(_collect_node_spacing, spacing=out['spacing']))
+    if 'shadows' in out:
+        collectors.append(partial(_collect_node_effects, shadows=out['shadows'], blurs=out['blurs']))
+
+    # Hidden subtrees never render, so they contribute no tokens
+    if len(collectors) == 1:
+        collect = collectors[0]
+        for current in _iter_nodes(node, skip_hidden=True):
+            collect(current)
+        return
+    for current in _iter_nodes(node, skip_hidden=True):
+        for collect in collectors:
+            collect(current)
+
+
+def _color_dedup_key(color: Dict[str, Any]) -> str:
+    """Dedup key for a color token based on its fill type."""
+    if color.get('hex'):
+        return sys.intern(color['hex'])
+    if color.get('color'):
+        return sys.intern(color['color'])
+    if color.get('gradient'):
+        return str(color['gradient'])
+    if color.get('image'):
+        return color['image'].get('imageRef', str(color['image']))
+    return str(color)
+
+
+def _build_design_tokens(
+    node: Dict[str, Any],
+    include_colors: bool = True,
+    include_typography: bool = True,
+    include_spacing: bool = True,
+    include_effects: bool = True
+) -> Dict[str, List[Dict[str, Any]]]:
+    """Extract and deduplicate design tokens from a node tree, keyed by category."""
+    tokens: Dict[str, List[Dict[str, Any]]] = {}
+
+    # Extract every requested token kind in one tree walk
+    extracted: Dict[str, Any] = {}
+    if include_colors:
+        extracted['colors'] = []
+    if include_typography:
+        extracted['typography'] = []
+    if include_spacing:
+        extracted['spacing'] = []
+    if include_effects:
+        extracted['shadows'] = {}
+        extracted['blurs'] = {}
+    _extract_all(node, extracted)
 
-    for child in node.get('children', []):
-        _extract_shadows_from_node(child, shadows)
+    # Colors
+    if include_colors:
+        # Deduplicate by color value, keeping the first occurrence
+        unique_colors: Dict[str, Dict[str, Any]] = {}
+        for c in extracted['colors']:
+            unique_colors.setdefault(_color_dedup_key(c), c)
+        tokens['colors'] = list(unique_colors.values())
+
+    # Typography
+    if include_typography:
+        tokens['typography'] = extracted['typography']
+
+    # Spacing
+    if include_spacing:
+        # Filter to only auto-layout items
+        tokens['spacing'] = [s for s in extracted['spacing'] if s.get('type') == 'auto-layout']
+
+    # Effects (shadows, blurs)
+    if include_effects:
+        tokens['shadows'] = [s.to_dict() for s in extracted['shadows']]
+        tokens['blurs'] = [b.to_dict() for b in extracted['blurs']]
+
+    return tokens
 
 
 def _get_node_with_children(file_key: str, node_id: Optional[str], data: Dict[str, Any]) -> Dict[str, Any]:
@@ -2944,6 +3604,46 @@ def _get_node_with_children(file_key: str, node_id: Optional[str], data: Dict[st
     return data.get('document', {})
 
 
+async def _fetch_node_tree(
+    file_key: str,
+    node_id: Optional[str],
+    params: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """Fetch a node subtree, or the whole document when no node is given.
+
+    With a node ID only that subtree is requested from the nodes endpoint,
+    instead of downloading and searching the full file.
+    """
+    if node_id:
+        data = await _make_figma_request(
+            f"files/{file_key}/nodes",
+            params={"ids": node_id, **(params or {})}
+        )
+        nodes = data.get('nodes') or _EMPTY_DICT
+        return (nodes.get(node_id) or _EMPTY_DICT).get('document') or _EMPTY_DICT
+    data = await _make_figma_request(f"files/{file_key}", params=params)
+    return data.get('document') or _EMPTY_DICT
+
+
+async def _fetch_nodes(
+    file_key: str,
+    node_ids: List[str],
+    params: Optional[Dict[str, Any]] = None
+) -> Dict[str, Dict[str, Any]]:
+    """Fetch several node subtrees in one request, keyed by node ID (missing nodes omitted)."""
+    data = await _make_figma_request(
+        f"files/{file_key}/nodes",
+        params={"ids": ",".join(node_ids), **(params or {})}
+    )
+    nodes = data.get('nodes') or _EMPTY_DICT
+    documents = {}
+    for node_id in node_ids:
+        document = (nodes.get(node_id) or _EMPTY_DICT).get('document')
+        if document:
+            documents[node_id] = document
+    return documents
+
+
 def _node_has_downloadable_assets(node: Dict[str, Any]) -> bool:
     """Check if a node contains downloadable assets (images, vectors, icons)."""
     # Check for image fills
@@ -2979,8 +3679,9 @@ def _node_to_simplified_tree(
     mark_downloadable_assets: bool = True
 ) -> Optional[Dict[str, Any]]:
     """Convert Figma node to simplified tree structure with smart filtering."""
-    node_type = node.get('type', '')
-    children = node.get('children', [])
+    get = node.get
+    node_type = get('type', '')
+    children = get('children', ())
 
     # Filter logic for frames/groups
     container_types = ['FRAME', 'GROUP', 'SECTION', 'COMPONENT', 'COMPONENT_SET', 'INSTANCE']
@@ -2996,13 +3697,13 @@ def _node_to_simplified_tree(
             return None
 
     simplified = {
-        'id': node.get('id'),
-        'name': node.get('name'),
+        'id': get('id'),
+        'name': get('name'),
         'type': node_type
     }
 
     # Add bounds if available
-    bbox = node.get('absoluteBoundingBox')
+    bbox = get('absoluteBoundingBox')
     if bbox:
         simplified['bounds'] = {
             'width': round(bbox.get('width', 0)),
@@ -3034,13 +3735,709 @@ def _node_to_simplified_tree(
     return simplified
 
 
-# ============================================================================
-# MCP Tools
-# ============================================================================
+def _build_node_details(
+    node: Dict[str, Any],
+    node_id: str,
+    file_key: str,
+    framework: str = 'css',
+    markdown: bool = False
+) -> Dict[str, Any]:
+    """Build the normalized node details dict used by figma_get_node_details.
 
-@_versioned_tool(
-    name="figma_get_file_structure",
-    annotations={
+    When markdown is True, sections that are only emitted in JSON responses
+    (render bounds, transform matrix, mask, export settings, vector paths and
+    image references) are skipped.
+    """
+    node_details = {
+        'id': node_id,
+        'name': node.get('name', 'Unknown'),
+        'type': node.get('type'),
+        'visible': node.get('visible', True),
+        'locked': node.get('locked', False)
+    }
+
+    # Bounds (comprehensive: bounding box, render bounds, transform, size)
+    bbox = node.get('absoluteBoundingBox') or _EMPTY_DICT
+    render_bounds = node.get('absoluteRenderBounds')  # Actual visual bounds including effects
+    relative_transform = node.get('relativeTransform')
+    node_size = node.get('size')
+
+    if bbox:
+        node_details['bounds'] = {
+            'width': round(bbox.get('width', 0), 2),
+            'height': round(bbox.get('height', 0), 2),
+            'x': round(bbox.get('x', 0), 2),
+            'y': round(bbox.get('y', 0), 2)
+        }
+
+    if bbox and not markdown:
+        # Render bounds (includes effects like shadows - actual visual footprint)
+        if render_bounds:
+            node_details['bounds']['renderBounds'] = {
+                'width': round(render_bounds.get('width', 0), 2),
+                'height': round(render_bounds.get('height', 0), 2),
+                'x': round(render_bounds.get('x', 0), 2),
+                'y': round(render_bounds.get('y', 0), 2)
+            }
+
+        # Relative transform (2x3 transformation matrix)
+        if relative_transform:
+            node_details['bounds']['relativeTransform'] = relative_transform
+
+        # Node size (width, height before transforms)
+        if node_size:
+            node_details['bounds']['size'] = {
+                'width': round(node_size.get('x', 0), 2),
+                'height': round(node_size.get('y', 0), 2)
+            }
+
+    # Blend mode
+    if 'blendMode' in node:
+        node_details['blendMode'] = node['blendMode']
+
+    # Opacity
+    if 'opacity' in node:
+        node_details['opacity'] = node['opacity']
+
+    # Fills (with gradient and image support)
+    fills = node.get('fills', [])
+    if fills:
+        node_details['fills'] = []
+        for fill in fills:
+            fill_data = _extract_fill_data(fill, node.get('name', ''))
+            if fill_data:
+                # Remove 'name' and 'category' for cleaner output
+                fill_data.pop('name', None)
+                fill_data.pop('category', None)
+                node_details['fills'].append(fill_data)
+
+    # Strokes (comprehensive)
+    stroke_data = _extract_stroke_data(node)
+    if stroke_data:
+        node_details['strokes'] = stroke_data
+
+    # Corner radii (individual corners)
+    corner_radii = _extract_corner_radii(node)
+    if corner_radii:
+        node_details['cornerRadius'] = corner_radii
+
+    # Effects (shadows and blurs)
+    effects_data = _extract_effects_data(node)
+    if effects_data['shadows'] or effects_data['blurs']:
+        node_details['effects'] = {
+            k: v for k, v in effects_data.items() if v
+        }
+
+    # Auto-layout (comprehensive)
+    auto_layout = _extract_auto_layout(node)
+    if auto_layout:
+        node_details['autoLayout'] = auto_layout
+
+    # Size constraints
+    size_constraints = _extract_size_constraints(node)
+    if size_constraints:
+        node_details['sizeConstraints'] = size_constraints
+
+    # Layout constraints (responsive)
+    constraints = _extract_constraints(node)
+    if constraints:
+        node_details['constraints'] = constraints
+
+    # Transform (includes rotation, scale, flip detection)
+    transform = _extract_transform(node)
+    if transform.get('rotation') or transform.get('preserveRatio') or transform.get('flippedHorizontally') or transform.get('flippedVertically'):
+        node_details['transform'] = transform
+
+    # Clip content
+    if 'clipsContent' in node:
+        node_details['clipsContent'] = node['clipsContent']
+
+    # Mask info
+    if not markdown:
+        mask_data = _extract_mask_data(node)
+        if mask_data:
+            node_details['mask'] = mask_data
+
+    # Component/Instance info
+    component_info = _extract_component_info(node)
+    if component_info:
+        node_details['component'] = component_info
+
+    # Bound variables
+    bound_variables = _extract_bound_variables(node)
+    if bound_variables:
+        node_details['boundVariables'] = bound_variables
+
+    # Export settings
+    if not markdown:
+        export_settings = _extract_export_settings(node)
+        if export_settings:
+            node_details['exportSettings'] = export_settings
+
+    # Interactions (prototype triggers and actions)
+    interactions = _extract_interactions(node)
+    if interactions and not markdown:
+        node_details['interactions'] = interactions
+
+    if not markdown:
+        # Vector paths (for SVG export)
+        vector_paths = _extract_vector_paths(node)
+        if vector_paths:
+            node_details['vectorPaths'] = vector_paths
+
+        # Image references (for image fill resolution)
+        image_refs = _extract_image_references(node, file_key)
+        if image_refs:
+            node_details['imageReferences'] = image_refs
+
+    # Text-specific properties
+    if node.get('type') == 'TEXT':
+        style = node.get('style') or _EMPTY_DICT
+        node_details['text'] = {
+            'characters': node.get('characters', ''),
+            'fontFamily': style.get('fontFamily'),
+            'fontSize': style.get('fontSize'),
+            'fontWeight': style.get('fontWeight'),
+            'fontStyle': 'italic' if style.get('italic') else 'normal',
+            'lineHeight': style.get('lineHeightPx'),
+            'lineHeightUnit': style.get('lineHeightUnit'),
+            'letterSpacing': style.get('letterSpacing'),
+            'textAlign': style.get('textAlignHorizontal'),
+            'textAlignVertical': style.get('textAlignVertical'),
+            'textCase': style.get('textCase'),
+            'textDecoration': style.get('textDecoration'),
+            'paragraphSpacing': style.get('paragraphSpacing'),
+            'paragraphIndent': style.get('paragraphIndent'),
+            'textAutoResize': node.get('textAutoResize'),
+            'textTruncation': node.get('textTruncation'),
+            'maxLines': node.get('maxLines'),
+            'hyperlink': node.get('hyperlink')
+        }
+        # Clean up None values
+        node_details['text'] = {k: v for k, v in node_details['text'].items() if v is not None}
+
+    # Implementation hints (AI-friendly guidance)
+    impl_hints = _generate_implementation_hints(node, interactions, framework=framework)
+    if impl_hints:
+        node_details['implementationHints'] = impl_hints
+
+    # Accessibility checks
+    a11y_issues = _check_accessibility(node)
+    if a11y_issues:
+        node_details['accessibility'] = a11y_issues
+
+    # Children with depth-2 traversal
+    children = node.get('children') or _EMPTY_TUPLE
+    if children:
+        node_details['childrenCount'] = len(children)
+        node_details['children'] = _extract_children_summary(children, depth=0, max_depth=2)
+
+    return node_details
+
+
+def _render_solid_fill_markdown(fill: Dict[str, Any], node_opacity: float, lines: List[str]) -> None:
+    fill_op = fill.get('opacity', 1)
+    opacity_info = f"opacity: {fill_op:.2f}"
+    if node_opacity < 1:
+        opacity_info += f" × node:{node_opacity:.2f} = effective:{fill_op * node_opacity:.2f}"
+    lines.append(f"- **Solid:** {fill.get('color')} ({opacity_info})")
+
+
+def _render_gradient_fill_markdown(fill: Dict[str, Any], node_opacity: float, lines: List[str]) -> None:
+    gradient = fill.get('gradient') or _EMPTY_DICT
+    stops = gradient.get('stops', [])
+    gradient_type = gradient.get('type', 'LINEAR')
+    colors = ' → '.join(s['color'] for s in stops[:3])
+    if len(stops) > 3:
+        colors += f" (+{len(stops)-3} more)"
+    lines.append(f"- **{gradient_type} Gradient:** {colors}")
+    if gradient_type == 'LINEAR':
+        lines.append(f"  - Angle: {gradient.get('angle', 0)}°")
+
+
+def _render_image_fill_markdown(fill: Dict[str, Any], node_opacity: float, lines: List[str]) -> None:
+    image = fill.get('image') or _EMPTY_DICT
+    lines.append(f"- **Image:** ref={image.get('imageRef')}, scale={image.get('scaleMode')}")
+
+
+# Markdown renderers for the node details "Fills" section, keyed by Figma fill type
+_FILL_MARKDOWN_RENDERERS: Dict[str, Callable[[Dict[str, Any], float, List[str]], None]] = {
+    'SOLID': _render_solid_fill_markdown,
+    'GRADIENT_LINEAR': _render_gradient_fill_markdown,
+    'GRADIENT_RADIAL': _render_gradient_fill_markdown,
+    'GRADIENT_ANGULAR': _render_gradient_fill_markdown,
+    'GRADIENT_DIAMOND': _render_gradient_fill_markdown,
+    'IMAGE': _render_image_fill_markdown,
+}
+
+
+def _render_node_details_markdown(node_details: Dict[str, Any], framework: str = 'css') -> str:
+    """Render node details built by _build_node_details as markdown."""
+    lines = [
+        f"# Node: {node_details['name']}",
+        f"**ID:** `{node_details['id']}`",
+        f"**Type:** {node_details['type']}",
+        ""
+    ]
+
+    # Visibility/Lock status
+    if not node_details.get('visible', True):
+        lines.append("⚠️ **This node is hidden**\n")
+    if node_details.get('locked', False):
+        lines.append("🔒 **This node is locked**\n")
+
+    # Bounds
+    if 'bounds' in node_details:
+        b = node_details['bounds']
+        lines.extend([
+            "## Dimensions",
+            f"- **Width:** {b['width']}px",
+            f"- **Height:** {b['height']}px",
+            f"- **Position:** ({b['x']}, {b['y']})",
+            ""
+        ])
+
+    # Blend mode & Opacity
+    if 'blendMode' in node_details or 'opacity' in node_details:
+        lines.append("## Appearance")
+        if 'blendMode' in node_details:
+            lines.append(f"- **Blend Mode:** {node_details['blendMode']}")
+        if 'opacity' in node_details:
+            lines.append(f"- **Opacity:** {node_details['opacity']}")
+        lines.append("")
+
+    # Fills
+    if 'fills' in node_details:
+        lines.append("## Fills")
+        node_opacity = node_details.get('opacity', 1)
+        for fill in node_details['fills']:
+            renderer = _FILL_MARKDOWN_RENDERERS.get(fill.get('fillType', 'SOLID'))
+            if renderer:
+                renderer(fill, node_opacity, lines)
+        bg_css = _build_css_ready_background(node_details['fills'], 1.0)
+        if bg_css:
+            prop_name = 'color' if node_details.get('type') == 'TEXT' else 'background'
+            lines.append(f"- **CSS:** `{prop_name}: {bg_css};`")
+        lines.append("")
+
+    # Strokes
+    if 'strokes' in node_details:
+        s = node_details['strokes']
+        weight = s['weight']
+        dashes = s.get('dashes', [])
+        style = 'dashed' if dashes else 'solid'
+        lines.append("## Strokes")
+        lines.append(f"- **Weight:** {weight}px")
+        lines.append(f"- **Align:** {s['align']}")
+        lines.append(f"- **Cap:** {s['cap']}, **Join:** {s['join']}")
+        if dashes:
+            lines.append(f"- **Dashes:** {dashes}")
+        if s.get('individualWeights'):
+            iw = s['individualWeights']
+            lines.append(f"- **Individual Weights:** T:{iw.get('top', weight)} R:{iw.get('right', weight)} B:{iw.get('bottom', weight)} L:{iw.get('left', weight)}")
+        for color in s.get('colors', []):
+            if color.get('type') == 'SOLID':
+                hex_c = color.get('hex', color.get('color'))
+                lines.append(f"- **Color:** {hex_c}")
+                lines.append(f"  - `border: {weight}px {style} {hex_c};`")
+            elif color.get('type', '').startswith('GRADIENT_'):
+                lines.append(f"- **Gradient stroke**")
+        lines.append("")
+
+    # Corner radius
+    if 'cornerRadius' in node_details:
+        cr = node_details['cornerRadius']
+        tl = int(cr.get('topLeft', 0))
+        tr = int(cr.get('topRight', 0))
+        br = int(cr.get('bottomRight', 0))
+        bl = int(cr.get('bottomLeft', 0))
+        if cr.get('isUniform'):
+            css_val = f"{tl}px"
+        else:
+            css_val = f"{tl}px {tr}px {br}px {bl}px"
+        if cr.get('isUniform'):
+            lines.append(f"## Border Radius: {tl}px → `border-radius: {css_val}`\n")
+        else:
+            lines.extend([
+                "## Border Radius",
+                f"- **Top Left:** {tl}px, **Top Right:** {tr}px, **Bottom Right:** {br}px, **Bottom Left:** {bl}px",
+                f"- `border-radius: {css_val}`",
+                ""
+            ])
+
+    # Effects
+    if 'effects' in node_details:
+        lines.append("## Effects")
+        if node_details['effects'].get('shadows'):
+            for shadow in node_details['effects']['shadows']:
+                offset = shadow['offset']
+                lines.append(
+                    f"- **{shadow['type']}:** {shadow['color']}, "
+                    f"offset ({offset['x']}, {offset['y']}), "
+                    f"blur {shadow['radius']}px, spread {shadow['spread']}px"
+                )
+                inset = 'inset ' if shadow['type'] == 'INNER_SHADOW' else ''
+                ox = int(offset.get('x', 0))
+                oy = int(offset.get('y', 0))
+                r = int(shadow['radius'])
+                sp = int(shadow['spread'])
+                lines.append(
+                    f"  - `box-shadow: {inset}{ox}px {oy}px {r}px {sp}px {shadow.get('hex', shadow['color'])};`"
+                )
+        if node_details['effects'].get('blurs'):
+            for blur in node_details['effects']['blurs']:
+                lines.append(f"- **{blur['type']}:** {blur['radius']}px")
+                if blur['type'] == 'LAYER_BLUR':
+                    lines.append(f"  - `filter: blur({int(blur['radius'])}px);`")
+                elif blur['type'] == 'BACKGROUND_BLUR':
+                    lines.append(f"  - `backdrop-filter: blur({int(blur['radius'])}px);`")
+        lines.append("")
+
+    # Auto-layout
+    if 'autoLayout' in node_details:
+        al = node_details['autoLayout']
+        mode = al['mode']
+        direction = 'row' if mode == 'HORIZONTAL' else 'column'
+        p = al['padding']
+        t, r, b, l = int(p['top']), int(p['right']), int(p['bottom']), int(p['left'])
+        if t == r == b == l:
+            padding_css = f"{t}px" if t > 0 else "0"
+        elif t == b and r == l:
+            padding_css = f"{t}px {r}px"
+        else:
+            padding_css = f"{t}px {r}px {b}px {l}px"
+        align_map = {'MIN': 'flex-start', 'CENTER': 'center', 'MAX': 'flex-end', 'SPACE_BETWEEN': 'space-between'}
+        lines.extend([
+            "## Auto Layout",
+            f"- **Direction:** {mode} → `flex-direction: {direction}`",
+            f"- **Gap:** {al['gap']}px → `gap: {int(al['gap'])}px`",
+            f"- **Padding:** T:{t} R:{r} B:{b} L:{l} → `padding: {padding_css}`",
+            f"- **Primary Align:** {al['primaryAxisAlign']} → `justify-content: {align_map.get(al['primaryAxisAlign'], 'flex-start')}`",
+            f"- **Counter Align:** {al['counterAxisAlign']} → `align-items: {align_map.get(al['counterAxisAlign'], 'flex-start')}`",
+            f"- **Primary Sizing:** {al['primaryAxisSizing']}",
+            f"- **Counter Sizing:** {al['counterAxisSizing']}",
+        ])
+        if al.get('layoutWrap') != 'NO_WRAP':
+            lines.append(f"- **Wrap:** {al['layoutWrap']} → `flex-wrap: wrap`")
+        lines.append("")
+
+    # Constraints
+    if 'constraints' in node_details:
+        c = node_details['constraints']
+        lines.extend([
+            "## Constraints (Responsive)",
+            f"- **Horizontal:** {c['horizontal']}",
+            f"- **Vertical:** {c['vertical']}",
+            ""
+        ])
+
+    # Size constraints
+    if 'sizeConstraints' in node_details:
+        sc = node_details['sizeConstraints']
+        lines.append("## Size Constraints")
+        if 'minWidth' in sc:
+            lines.append(f"- **Min Width:** {sc['minWidth']}px")
+        if 'maxWidth' in sc:
+            lines.append(f"- **Max Width:** {sc['maxWidth']}px")
+        if 'minHeight' in sc:
+            lines.append(f"- **Min Height:** {sc['minHeight']}px")
+        if 'maxHeight' in sc:
+            lines.append(f"- **Max Height:** {sc['maxHeight']}px")
+        lines.append("")
+
+    # Transform
+    if 'transform' in node_details:
+        t = node_details['transform']
+        lines.append("## Transform")
+        if t.get('rotation'):
+            lines.append(f"- **Rotation:** {t['rotation']}°")
+        if t.get('preserveRatio'):
+            lines.append(f"- **Preserve Ratio:** Yes")
+        if t.get('flippedHorizontally'):
+            lines.append(f"- **Flipped Horizontally:** Yes (scaleX: -1)")
+        if t.get('flippedVertically'):
+            lines.append(f"- **Flipped Vertically:** Yes (scaleY: -1)")
+        lines.append("")
+
+    # Clip content
+    if 'clipsContent' in node_details:
+        lines.append(f"## Clip Content: {'Yes' if node_details['clipsContent'] else 'No'}\n")
+
+    # Component info
+    if 'component' in node_details:
+        comp = node_details['component']
+        lines.append("## Component Info")
+        if comp.get('isInstance'):
+            lines.append(f"- **Type:** Instance")
+            lines.append(f"- **Component ID:** {comp.get('componentId')}")
+            if comp.get('componentProperties'):
+                lines.append(f"- **Properties:** {_dumps(comp['componentProperties'])}")
+        elif comp.get('isComponent'):
+            lines.append(f"- **Type:** Component")
+            if comp.get('componentSetId'):
+                lines.append(f"- **Component Set ID:** {comp['componentSetId']}")
+        elif comp.get('isComponentSet'):
+            lines.append(f"- **Type:** Component Set")
+        lines.append("")
+
+    # Bound variables
+    if 'boundVariables' in node_details:
+        lines.append("## Bound Variables")
+        for prop, var in node_details['boundVariables'].items():
+            if isinstance(var, list):
+                lines.append(f"- **{prop}:** {len(var)} variable(s) bound")
+            else:
+                lines.append(f"- **{prop}:** {var.get('variableId')}")
+        lines.append("")
+
+    # Text properties
+    if 'text' in node_details:
+        txt = node_details['text']
+        lines.append("## Text Properties")
+        if txt.get('characters'):
+            preview = txt['characters'][:50] + '...' if len(txt.get('characters', '')) > 50 else txt['characters']
+            lines.append(f"- **Content:** \"{preview}\"")
+        if txt.get('fontFamily'):
+            lines.append(f"- **Font:** {txt['fontFamily']} {txt.get('fontWeight', 400)}")
+        if txt.get('fontSize'):
+            lines.append(f"- **Size:** {txt['fontSize']}px")
+        if txt.get('lineHeight'):
+            lines.append(f"- **Line Height:** {txt['lineHeight']}px")
+        if txt.get('letterSpacing'):
+            lines.append(f"- **Letter Spacing:** {txt['letterSpacing']}px")
+        if txt.get('textAlign'):
+            lines.append(f"- **Alignment:** {txt['textAlign']} / {txt.get('textAlignVertical', 'TOP')}")
+        if txt.get('textCase') and txt['textCase'] != 'ORIGINAL':
+            lines.append(f"- **Text Case:** {txt['textCase']}")
+        if txt.get('textDecoration') and txt['textDecoration'] != 'NONE':
+            lines.append(f"- **Decoration:** {txt['textDecoration']}")
+        if txt.get('textAutoResize'):
+            lines.append(f"- **Auto Resize:** {txt['textAutoResize']}")
+        if txt.get('fontFamily') and txt.get('fontSize'):
+            w = int(txt.get('fontWeight', 400))
+            sz = int(txt['fontSize'])
+            lh = f"/{int(txt['lineHeight'])}px" if txt.get('lineHeight') else ''
+            fam = txt['fontFamily']
+            lines.append(f"- **CSS:** `font: {w} {sz}px{lh} '{fam}', sans-serif;`")
+        lines.append("")
+
+    # CSS Ready Section (only for CSS-based frameworks)
+    if framework not in ('swiftui', 'kotlin'):
+        css_ready = _build_css_ready_section(node_details)
+        if css_ready:
+            lines.append("## CSS Ready")
+            lines.append("```css")
+            css_props = {k: v for k, v in css_ready.items() if not k.endswith('-note')}
+            for prop, value in css_props.items():
+                lines.append(f"  {prop}: {value};")
+            lines.append("```")
+            notes = {k: v for k, v in css_ready.items() if k.endswith('-note')}
+            for note_key, note_value in notes.items():
+                lines.append(f"> Note: {note_value}")
+            lines.append("")
+
+    # Implementation Hints
+    if 'implementationHints' in node_details:
+        hints = node_details['implementationHints']
+        lines.append("## 🚀 Implementation Hints")
+        if hints.get('layout'):
+            lines.append("### Layout")
+            for hint in hints['layout']:
+                lines.append(f"- {hint}")
+        if hints.get('responsive'):
+            lines.append("### Responsive")
+            for hint in hints['responsive']:
+                lines.append(f"- {hint}")
+        if hints.get('interactions'):
+            lines.append("### Interactions")
+            for hint in hints['interactions']:
+                lines.append(f"- {hint}")
+        if hints.get('accessibility'):
+            lines.append("### Accessibility")
+            for hint in hints['accessibility']:
+                lines.append(f"- {hint}")
+        if hints.get('components'):
+            lines.append("### Components")
+            for hint in hints['components']:
+                lines.append(f"- {hint}")
+        lines.append("")
+
+    # Accessibility Warnings
+    if 'accessibility' in node_details:
+        a11y = node_details['accessibility']
+        lines.append("## ♿ Accessibility")
+        if a11y.get('contrast_issues'):
+            lines.append("### Contrast Issues")
+            for issue in a11y['contrast_issues']:
+                severity_icon = "❌" if issue.get('severity') == 'error' else "⚠️" if issue.get('severity') == 'warning' else "ℹ️"
+                lines.append(f"- {severity_icon} {issue.get('message')}")
+                if issue.get('wcag'):
+                    lines.append(f"  - WCAG: {issue['wcag']}")
+        if a11y.get('touch_target_warnings'):
+            lines.append("### Touch Target Issues")
+            for issue in a11y['touch_target_warnings']:
+                severity_icon = "❌" if issue.get('severity') == 'error' else "⚠️"
+                lines.append(f"- {severity_icon} {issue.get('message')}")
+                if issue.get('wcag'):
+                    lines.append(f"  - WCAG: {issue['wcag']}")
+        if a11y.get('label_warnings'):
+            lines.append("### Label Warnings")
+            for issue in a11y['label_warnings']:
+                lines.append(f"- ⚠️ {issue.get('message')}")
+                if issue.get('wcag'):
+                    lines.append(f"  - WCAG: {issue['wcag']}")
+        lines.append("")
+
+    # Children
+    if 'children' in node_details:
+        lines.append(f"## Children ({node_details.get('childrenCount', 0)} nodes)")
+        lines.append("")
+        _render_children_markdown(lines, node_details['children'], indent=0)
+    elif 'childrenCount' in node_details:
+        lines.append(f"**Children:** {node_details['childrenCount']} child node(s)")
+
+    return "\n".join(lines)
+
+
+def _iter_styles_markdown(
+    file_key: str,
+    total_styles: int,
+    fill_styles: List[Dict[str, Any]],
+    text_styles: List[Dict[str, Any]],
+    effect_styles: List[Dict[str, Any]],
+    grid_styles: List[Dict[str, Any]]
+) -> Iterator[str]:
+    """Yield the published styles markdown in chunks so callers can stop at a size limit."""
+    yield f"# Published Styles\n**File:** `{file_key}`\n**Total Styles:** {total_styles}\n\n"
+
+    if fill_styles:
+        yield "## 🎨 Fill/Color Styles\n\n"
+        for style in fill_styles:
+            yield f"### {style['name']}\n"
+            if style.get('description'):
+                yield f"*{style['description']}*\n"
+            if style.get('fills'):
+                for fill in style['fills']:
+                    if fill.get('fillType') == 'SOLID':
+                        yield f"- **Color:** `{fill.get('color', 'N/A')}`\n"
+                        if fill.get('opacity') is not None and fill['opacity'] < 1:
+                            yield f"- **Opacity:** {fill['opacity']}\n"
+                    elif 'GRADIENT' in fill.get('fillType', ''):
+                        yield f"- **Type:** {fill['fillType']}\n"
+                        if fill.get('gradient'):
+                            grad = fill['gradient']
+                            yield f"- **Angle:** {grad.get('angle', 0)}°\n"
+                            stops = grad.get('stops', [])
+                            if stops:
+                                stop_str = ', '.join(f"{s['color']} at {int(s['position']*100)}%" for s in stops)
+                                yield f"- **Stops:** {stop_str}\n"
+            yield f"- **Key:** `{style['key']}`\n\n"
+
+    if text_styles:
+        yield "## 📝 Text Styles\n\n"
+        for style in text_styles:
+            yield f"### {style['name']}\n"
+            if style.get('description'):
+                yield f"*{style['description']}*\n"
+            if style.get('textStyle'):
+                ts = style['textStyle']
+                if ts.get('fontFamily'):
+                    yield f"- **Font:** {ts['fontFamily']}\n"
+                if ts.get('fontWeight'):
+                    yield f"- **Weight:** {ts['fontWeight']}\n"
+                if ts.get('fontSize'):
+                    yield f"- **Size:** {ts['fontSize']}px\n"
+                if ts.get('lineHeightPx'):
+                    yield f"- **Line Height:** {ts['lineHeightPx']}px\n"
+                if ts.get('letterSpacing'):
+                    yield f"- **Letter Spacing:** {ts['letterSpacing']}\n"
+                if ts.get('textCase') and ts['textCase'] != 'ORIGINAL':
+                    yield f"- **Case:** {ts['textCase']}\n"
+                if ts.get('textDecoration') and ts['textDecoration'] != 'NONE':
+                    yield f"- **Decoration:** {ts['textDecoration']}\n"
+            yield f"- **Key:** `{style['key']}`\n\n"
+
+    if effect_styles:
+        yield "## ✨ Effect Styles\n\n"
+        for style in effect_styles:
+            yield f"### {style['name']}\n"
+            if style.get('description'):
+                yield f"*{style['description']}*\n"
+            if style.get('effects'):
+                effects = style['effects']
+                if effects.get('shadows'):
+                    for shadow in effects['shadows']:
+                        shadow_type = shadow.get('type', 'DROP_SHADOW')
+                        yield f"- **{shadow_type}:** {shadow.get('color', 'N/A')} offset({shadow.get('offsetX', 0)}, {shadow.get('offsetY', 0)}) blur({shadow.get('blur', 0)})\n"
+                if effects.get('blurs'):
+                    for blur in effects['blurs']:
+                        yield f"- **{blur.get('type', 'BLUR')}:** radius {blur.get('radius', 0)}px\n"
+            yield f"- **Key:** `{style['key']}`\n\n"
+
+    if grid_styles:
+        yield "## 📐 Grid Styles\n\n"
+        for style in grid_styles:
+            yield f"### {style['name']}\n"
+            if style.get('description'):
+                yield f"*{style['description']}*\n"
+            yield f"- **Key:** `{style['key']}`\n\n"
+
+
+def _generate_tailwind_only_code(node: Dict[str, Any], component_name: str) -> str:
+    """Generate the bare Tailwind class string for a node's size and solid background."""
+    bbox = node.get('absoluteBoundingBox') or _EMPTY_DICT
+    fills = node.get('fills', [])
+    bg = ''
+    if fills and fills[0].get('type') == 'SOLID':
+        bg = f"bg-[{_rgba_to_hex(fills[0].get('color') or _EMPTY_DICT)}]"
+    return f"w-[{int(bbox.get('width', 0))}px] h-[{int(bbox.get('height', 0))}px] {bg}"
+
+
+def _generate_swiftui_code(node: Dict[str, Any], component_name: str) -> str:
+    """Generate SwiftUI code (generator imported on first use)."""
+    from generators.swiftui_generator import generate_swiftui_code
+    return generate_swiftui_code(node, component_name)
+
+
+# Code generator for each framework, called as generator(node, component_name)
+_CODE_GENERATORS: Dict[CodeFramework, Callable[[Dict[str, Any], str], str]] = {
+    CodeFramework.REACT: partial(_generate_react_code, use_tailwind=False),
+    CodeFramework.REACT_TAILWIND: partial(_generate_react_code, use_tailwind=True),
+    CodeFramework.VUE: partial(_generate_vue_code, use_tailwind=False),
+    CodeFramework.VUE_TAILWIND: partial(_generate_vue_code, use_tailwind=True),
+    CodeFramework.HTML_CSS: _generate_html_css_code,
+    CodeFramework.TAILWIND_ONLY: _generate_tailwind_only_code,
+    CodeFramework.CSS: _generate_css_code,
+    CodeFramework.SCSS: _generate_scss_code,
+    CodeFramework.SWIFTUI: _generate_swiftui_code,
+    CodeFramework.KOTLIN: _generate_kotlin_code,
+}
+
+
+# Frameworks whose generator accepts the flatten_empty option
+_FLATTEN_EMPTY_FRAMEWORKS = frozenset({CodeFramework.REACT, CodeFramework.REACT_TAILWIND})
+
+
+def _generate_code_for_framework(
+    node: Dict[str, Any],
+    framework: CodeFramework,
+    component_name: str,
+    flatten_empty: bool = False
+) -> str:
+    """Generate code for a node in the requested framework."""
+    generator = _CODE_GENERATORS.get(framework, _generate_html_css_code)
+    if flatten_empty and framework in _FLATTEN_EMPTY_FRAMEWORKS:
+        return generator(node, component_name, flatten_empty=True)
+    return generator(node, component_name)
+
+
+# ============================================================================
+# MCP Tools
+# ============================================================================
+
+@_versioned_tool(
+    name="figma_get_file_structure",
+    annotations={
         "title": "Get Figma File Structure",
         "readOnlyHint": True,
         "destructiveHint": False,
@@ -3076,7 +4473,7 @@ async def figma_get_file_structure(params: FigmaFileInput) -> str:
     try:
         data = await _make_figma_request(f"files/{params.file_key}")
 
-        document = data.get('document', {})
+        document = data.get('document') or _EMPTY_DICT
         name = data.get('name', 'Unknown')
         last_modified = data.get('lastModified', 'Unknown')
 
@@ -3096,7 +4493,7 @@ async def figma_get_file_structure(params: FigmaFileInput) -> str:
                 'lastModified': last_modified,
                 'document': tree
             }
-            return json.dumps(response, indent=2)
+            return _dumps(response)
 
         # Markdown format
         lines = [
@@ -3108,29 +4505,27 @@ async def figma_get_file_structure(params: FigmaFileInput) -> str:
             ""
         ]
 
-        def format_tree(node: Dict, indent: int = 0) -> None:
+        # Walk with an explicit stack; children are pushed in reverse to keep order
+        append = lines.append
+        stack = [(tree, 0)]
+        while stack:
+            node, indent = stack.pop()
             if node is None:
-                return
-            prefix = "  " * indent
-            icon = "📄" if node.get('type') == 'DOCUMENT' else \
-                   "📑" if node.get('type') == 'CANVAS' else \
-                   "🖼️" if node.get('type') == 'FRAME' else \
-                   "📦" if node.get('type') == 'COMPONENT' else \
-                   "🔗" if node.get('type') == 'INSTANCE' else \
-                   "📝" if node.get('type') == 'TEXT' else "•"
-
-            bounds = node.get('bounds', {})
+                continue
+            get = node.get
+            icon = _ICON_BY_TYPE.get(get('type'), "•")
+
+            bounds = get('bounds')
             size_str = f" ({bounds.get('width')}×{bounds.get('height')})" if bounds else ""
 
             # Add asset marker if node has downloadable assets
-            asset_marker = " 🎨" if node.get('hasAsset') else ""
-
-            lines.append(f"{prefix}{icon} **{node.get('name')}** `{node.get('id')}`{size_str}{asset_marker}")
+            asset_marker = " 🎨" if get('hasAsset') else ""
 
-            for child in node.get('children', []):
-                format_tree(child, indent + 1)
+            append(f"{'  ' * indent}{icon} **{get('name')}** `{get('id')}`{size_str}{asset_marker}")
 
-        format_tree(tree)
+            children = get('children')
+            if children:
+                stack.extend((child, indent + 1) for child in reversed(children))
 
         return "\n".join(lines)
 
@@ -3175,548 +4570,19 @@ async def figma_get_node_details(params: FigmaNodeInput) -> str:
         str: Comprehensive node details in requested format
     """
     try:
-        data = await _make_figma_request(
-            f"files/{params.file_key}/nodes",
-            params={"ids": params.node_id}
-        )
-
-        nodes = data.get('nodes', {})
-        node_data = nodes.get(params.node_id, {})
-        node = node_data.get('document', {})
+        node = await _fetch_node_tree(params.file_key, params.node_id)
 
         if not node:
             return f"Error: Node '{params.node_id}' not found in file."
 
-        # Build comprehensive node details
-        node_details = {
-            'id': params.node_id,
-            'name': node.get('name', 'Unknown'),
-            'type': node.get('type'),
-            'visible': node.get('visible', True),
-            'locked': node.get('locked', False)
-        }
-
-        # Bounds (comprehensive: bounding box, render bounds, transform, size)
-        bbox = node.get('absoluteBoundingBox', {})
-        render_bounds = node.get('absoluteRenderBounds')  # Actual visual bounds including effects
-        relative_transform = node.get('relativeTransform')
-        node_size = node.get('size')
-
-        if bbox:
-            node_details['bounds'] = {
-                'width': round(bbox.get('width', 0), 2),
-                'height': round(bbox.get('height', 0), 2),
-                'x': round(bbox.get('x', 0), 2),
-                'y': round(bbox.get('y', 0), 2)
-            }
-
-            # Render bounds (includes effects like shadows - actual visual footprint)
-            if render_bounds:
-                node_details['bounds']['renderBounds'] = {
-                    'width': round(render_bounds.get('width', 0), 2),
-                    'height': round(render_bounds.get('height', 0), 2),
-                    'x': round(render_bounds.get('x', 0), 2),
-                    'y': round(render_bounds.get('y', 0), 2)
-                }
-
-            # Relative transform (2x3 transformation matrix)
-            if relative_transform:
-                node_details['bounds']['relativeTransform'] = relative_transform
-
-            # Node size (width, height before transforms)
-            if node_size:
-                node_details['bounds']['size'] = {
-                    'width': round(node_size.get('x', 0), 2),
-                    'height': round(node_size.get('y', 0), 2)
-                }
-
-        # Blend mode
-        if 'blendMode' in node:
-            node_details['blendMode'] = node['blendMode']
-
-        # Opacity
-        if 'opacity' in node:
-            node_details['opacity'] = node['opacity']
-
-        # Fills (with gradient and image support)
-        fills = node.get('fills', [])
-        if fills:
-            node_details['fills'] = []
-            for fill in fills:
-                fill_data = _extract_fill_data(fill, node.get('name', ''))
-                if fill_data:
-                    # Remove 'name' and 'category' for cleaner output
-                    fill_data.pop('name', None)
-                    fill_data.pop('category', None)
-                    node_details['fills'].append(fill_data)
-
-        # Strokes (comprehensive)
-        stroke_data = _extract_stroke_data(node)
-        if stroke_data:
-            node_details['strokes'] = stroke_data
-
-        # Corner radii (individual corners)
-        corner_radii = _extract_corner_radii(node)
-        if corner_radii:
-            node_details['cornerRadius'] = corner_radii
-
-        # Effects (shadows and blurs)
-        effects_data = _extract_effects_data(node)
-        if effects_data['shadows'] or effects_data['blurs']:
-            node_details['effects'] = {
-                k: v for k, v in effects_data.items() if v
-            }
-
-        # Auto-layout (comprehensive)
-        auto_layout = _extract_auto_layout(node)
-        if auto_layout:
-            node_details['autoLayout'] = auto_layout
-
-        # Size constraints
-        size_constraints = _extract_size_constraints(node)
-        if size_constraints:
-            node_details['sizeConstraints'] = size_constraints
-
-        # Layout constraints (responsive)
-        constraints = _extract_constraints(node)
-        if constraints:
-            node_details['constraints'] = constraints
-
-        # Transform (includes rotation, scale, flip detection)
-        transform = _extract_transform(node)
-        if transform.get('rotation') or transform.get('preserveRatio') or transform.get('flippedHorizontally') or transform.get('flippedVertically'):
-            node_details['transform'] = transform
-
-        # Clip content
-        if 'clipsContent' in node:
-            node_details['clipsContent'] = node['clipsContent']
-
-        # Mask info
-        mask_data = _extract_mask_data(node)
-        if mask_data:
-            node_details['mask'] = mask_data
-
-        # Component/Instance info
-        component_info = _extract_component_info(node)
-        if component_info:
-            node_details['component'] = component_info
-
-        # Bound variables
-        bound_variables = _extract_bound_variables(node)
-        if bound_variables:
-            node_details['boundVariables'] = bound_variables
-
-        # Export settings
-        export_settings = _extract_export_settings(node)
-        if export_settings:
-            node_details['exportSettings'] = export_settings
-
-        # Interactions (prototype triggers and actions)
-        interactions = _extract_interactions(node)
-        if interactions:
-            node_details['interactions'] = interactions
-
-        # Vector paths (for SVG export)
-        vector_paths = _extract_vector_paths(node)
-        if vector_paths:
-            node_details['vectorPaths'] = vector_paths
-
-        # Image references (for image fill resolution)
-        image_refs = _extract_image_references(node, params.file_key)
-        if image_refs:
-            node_details['imageReferences'] = image_refs
-
-        # Text-specific properties
-        if node.get('type') == 'TEXT':
-            style = node.get('style', {})
-            node_details['text'] = {
-                'characters': node.get('characters', ''),
-                'fontFamily': style.get('fontFamily'),
-                'fontSize': style.get('fontSize'),
-                'fontWeight': style.get('fontWeight'),
-                'fontStyle': 'italic' if style.get('italic') else 'normal',
-                'lineHeight': style.get('lineHeightPx'),
-                'lineHeightUnit': style.get('lineHeightUnit'),
-                'letterSpacing': style.get('letterSpacing'),
-                'textAlign': style.get('textAlignHorizontal'),
-                'textAlignVertical': style.get('textAlignVertical'),
-                'textCase': style.get('textCase'),
-                'textDecoration': style.get('textDecoration'),
-                'paragraphSpacing': style.get('paragraphSpacing'),
-                'paragraphIndent': style.get('paragraphIndent'),
-                'textAutoResize': node.get('textAutoResize'),
-                'textTruncation': node.get('textTruncation'),
-                'maxLines': node.get('maxLines'),
-                'hyperlink': node.get('hyperlink')
-            }
-            # Clean up None values
-            node_details['text'] = {k: v for k, v in node_details['text'].items() if v is not None}
-
-        # Implementation hints (AI-friendly guidance)
         hint_framework = params.framework or 'css'
-        impl_hints = _generate_implementation_hints(node, interactions, framework=hint_framework)
-        if impl_hints:
-            node_details['implementationHints'] = impl_hints
-
-        # Accessibility checks
-        a11y_issues = _check_accessibility(node)
-        if a11y_issues:
-            node_details['accessibility'] = a11y_issues
-
-        # Children with depth-2 traversal
-        children = node.get('children', [])
-        if children:
-            node_details['childrenCount'] = len(children)
-            node_details['children'] = _extract_children_summary(children, depth=0, max_depth=2)
 
         if params.response_format == ResponseFormat.JSON:
-            return json.dumps(node_details, indent=2)
+            node_details = _build_node_details(node, params.node_id, params.file_key, hint_framework)
+            return _dumps(node_details)
 
-        # Markdown format
-        lines = [
-            f"# Node: {node_details['name']}",
-            f"**ID:** `{node_details['id']}`",
-            f"**Type:** {node_details['type']}",
-            ""
-        ]
-
-        # Visibility/Lock status
-        if not node_details.get('visible', True):
-            lines.append("⚠️ **This node is hidden**\n")
-        if node_details.get('locked', False):
-            lines.append("🔒 **This node is locked**\n")
-
-        # Bounds
-        if 'bounds' in node_details:
-            b = node_details['bounds']
-            lines.extend([
-                "## Dimensions",
-                f"- **Width:** {b['width']}px",
-                f"- **Height:** {b['height']}px",
-                f"- **Position:** ({b['x']}, {b['y']})",
-                ""
-            ])
-
-        # Blend mode & Opacity
-        if 'blendMode' in node_details or 'opacity' in node_details:
-            lines.append("## Appearance")
-            if 'blendMode' in node_details:
-                lines.append(f"- **Blend Mode:** {node_details['blendMode']}")
-            if 'opacity' in node_details:
-                lines.append(f"- **Opacity:** {node_details['opacity']}")
-            lines.append("")
-
-        # Fills
-        if 'fills' in node_details:
-            lines.append("## Fills")
-            for fill in node_details['fills']:
-                fill_type = fill.get('fillType', 'SOLID')
-                if fill_type == 'SOLID':
-                    fill_op = fill.get('opacity', 1)
-                    node_op = node_details.get('opacity', 1)
-                    effective_op = fill_op * node_op
-                    opacity_info = f"opacity: {fill_op:.2f}"
-                    if node_op < 1:
-                        opacity_info += f" × node:{node_op:.2f} = effective:{effective_op:.2f}"
-                    lines.append(f"- **Solid:** {fill.get('color')} ({opacity_info})")
-                elif fill_type.startswith('GRADIENT_'):
-                    gradient = fill.get('gradient', {})
-                    stops = gradient.get('stops', [])
-                    gradient_type = gradient.get('type', 'LINEAR')
-                    angle = gradient.get('angle', 0)
-                    colors = ' → '.join([s['color'] for s in stops[:3]])
-                    if len(stops) > 3:
-                        colors += f" (+{len(stops)-3} more)"
-                    lines.append(f"- **{gradient_type} Gradient:** {colors}")
-                    if gradient_type == 'LINEAR':
-                        lines.append(f"  - Angle: {angle}°")
-                elif fill_type == 'IMAGE':
-                    image = fill.get('image', {})
-                    lines.append(f"- **Image:** ref={image.get('imageRef')}, scale={image.get('scaleMode')}")
-            bg_css = _build_css_ready_background(node_details['fills'], 1.0)
-            if bg_css:
-                prop_name = 'color' if node_details.get('type') == 'TEXT' else 'background'
-                lines.append(f"- **CSS:** `{prop_name}: {bg_css};`")
-            lines.append("")
-
-        # Strokes
-        if 'strokes' in node_details:
-            s = node_details['strokes']
-            weight = s['weight']
-            dashes = s.get('dashes', [])
-            style = 'dashed' if dashes else 'solid'
-            lines.append("## Strokes")
-            lines.append(f"- **Weight:** {weight}px")
-            lines.append(f"- **Align:** {s['align']}")
-            lines.append(f"- **Cap:** {s['cap']}, **Join:** {s['join']}")
-            if dashes:
-                lines.append(f"- **Dashes:** {dashes}")
-            if s.get('individualWeights'):
-                iw = s['individualWeights']
-                lines.append(f"- **Individual Weights:** T:{iw.get('top', weight)} R:{iw.get('right', weight)} B:{iw.get('bottom', weight)} L:{iw.get('left', weight)}")
-            for color in s.get('colors', []):
-                if color.get('type') == 'SOLID':
-                    hex_c = color.get('hex', color.get('color'))
-                    lines.append(f"- **Color:** {hex_c}")
-                    lines.append(f"  - `border: {weight}px {style} {hex_c};`")
-                elif color.get('type', '').startswith('GRADIENT_'):
-                    lines.append(f"- **Gradient stroke**")
-            lines.append("")
-
-        # Corner radius
-        if 'cornerRadius' in node_details:
-            cr = node_details['cornerRadius']
-            tl = int(cr.get('topLeft', 0))
-            tr = int(cr.get('topRight', 0))
-            br = int(cr.get('bottomRight', 0))
-            bl = int(cr.get('bottomLeft', 0))
-            if cr.get('isUniform'):
-                css_val = f"{tl}px"
-            else:
-                css_val = f"{tl}px {tr}px {br}px {bl}px"
-            if cr.get('isUniform'):
-                lines.append(f"## Border Radius: {tl}px → `border-radius: {css_val}`\n")
-            else:
-                lines.extend([
-                    "## Border Radius",
-                    f"- **Top Left:** {tl}px, **Top Right:** {tr}px, **Bottom Right:** {br}px, **Bottom Left:** {bl}px",
-                    f"- `border-radius: {css_val}`",
-                    ""
-                ])
-
-        # Effects
-        if 'effects' in node_details:
-            lines.append("## Effects")
-            if node_details['effects'].get('shadows'):
-                for shadow in node_details['effects']['shadows']:
-                    offset = shadow['offset']
-                    lines.append(
-                        f"- **{shadow['type']}:** {shadow['color']}, "
-                        f"offset ({offset['x']}, {offset['y']}), "
-                        f"blur {shadow['radius']}px, spread {shadow['spread']}px"
-                    )
-                    inset = 'inset ' if shadow['type'] == 'INNER_SHADOW' else ''
-                    ox = int(offset.get('x', 0))
-                    oy = int(offset.get('y', 0))
-                    r = int(shadow['radius'])
-                    sp = int(shadow['spread'])
-                    lines.append(
-                        f"  - `box-shadow: {inset}{ox}px {oy}px {r}px {sp}px {shadow.get('hex', shadow['color'])};`"
-                    )
-            if node_details['effects'].get('blurs'):
-                for blur in node_details['effects']['blurs']:
-                    lines.append(f"- **{blur['type']}:** {blur['radius']}px")
-                    if blur['type'] == 'LAYER_BLUR':
-                        lines.append(f"  - `filter: blur({int(blur['radius'])}px);`")
-                    elif blur['type'] == 'BACKGROUND_BLUR':
-                        lines.append(f"  - `backdrop-filter: blur({int(blur['radius'])}px);`")
-            lines.append("")
-
-        # Auto-layout
-        if 'autoLayout' in node_details:
-            al = node_details['autoLayout']
-            mode = al['mode']
-            direction = 'row' if mode == 'HORIZONTAL' else 'column'
-            p = al['padding']
-            t, r, b, l = int(p['top']), int(p['right']), int(p['bottom']), int(p['left'])
-            if t == r == b == l:
-                padding_css = f"{t}px" if t > 0 else "0"
-            elif t == b and r == l:
-                padding_css = f"{t}px {r}px"
-            else:
-                padding_css = f"{t}px {r}px {b}px {l}px"
-            align_map = {'MIN': 'flex-start', 'CENTER': 'center', 'MAX': 'flex-end', 'SPACE_BETWEEN': 'space-between'}
-            lines.extend([
-                "## Auto Layout",
-                f"- **Direction:** {mode} → `flex-direction: {direction}`",
-                f"- **Gap:** {al['gap']}px → `gap: {int(al['gap'])}px`",
-                f"- **Padding:** T:{t} R:{r} B:{b} L:{l} → `padding: {padding_css}`",
-                f"- **Primary Align:** {al['primaryAxisAlign']} → `justify-content: {align_map.get(al['primaryAxisAlign'], 'flex-start')}`",
-                f"- **Counter Align:** {al['counterAxisAlign']} → `align-items: {align_map.get(al['counterAxisAlign'], 'flex-start')}`",
-                f"- **Primary Sizing:** {al['primaryAxisSizing']}",
-                f"- **Counter Sizing:** {al['counterAxisSizing']}",
-            ])
-            if al.get('layoutWrap') != 'NO_WRAP':
-                lines.append(f"- **Wrap:** {al['layoutWrap']} → `flex-wrap: wrap`")
-            lines.append("")
-
-        # Constraints
-        if 'constraints' in node_details:
-            c = node_details['constraints']
-            lines.extend([
-                "## Constraints (Responsive)",
-                f"- **Horizontal:** {c['horizontal']}",
-                f"- **Vertical:** {c['vertical']}",
-                ""
-            ])
-
-        # Size constraints
-        if 'sizeConstraints' in node_details:
-            sc = node_details['sizeConstraints']
-            lines.append("## Size Constraints")
-            if 'minWidth' in sc:
-                lines.append(f"- **Min Width:** {sc['minWidth']}px")
-            if 'maxWidth' in sc:
-                lines.append(f"- **Max Width:** {sc['maxWidth']}px")
-            if 'minHeight' in sc:
-                lines.append(f"- **Min Height:** {sc['minHeight']}px")
-            if 'maxHeight' in sc:
-                lines.append(f"- **Max Height:** {sc['maxHeight']}px")
-            lines.append("")
-
-        # Transform
-        if 'transform' in node_details:
-            t = node_details['transform']
-            lines.append("## Transform")
-            if t.get('rotation'):
-                lines.append(f"- **Rotation:** {t['rotation']}°")
-            if t.get('preserveRatio'):
-                lines.append(f"- **Preserve Ratio:** Yes")
-            if t.get('flippedHorizontally'):
-                lines.append(f"- **Flipped Horizontally:** Yes (scaleX: -1)")
-            if t.get('flippedVertically'):
-                lines.append(f"- **Flipped Vertically:** Yes (scaleY: -1)")
-            lines.append("")
-
-        # Clip content
-        if 'clipsContent' in node_details:
-            lines.append(f"## Clip Content: {'Yes' if node_details['clipsContent'] else 'No'}\n")
-
-        # Component info
-        if 'component' in node_details:
-            comp = node_details['component']
-            lines.append("## Component Info")
-            if comp.get('isInstance'):
-                lines.append(f"- **Type:** Instance")
-                lines.append(f"- **Component ID:** {comp.get('componentId')}")
-                if comp.get('componentProperties'):
-                    lines.append(f"- **Properties:** {json.dumps(comp['componentProperties'], indent=2)}")
-            elif comp.get('isComponent'):
-                lines.append(f"- **Type:** Component")
-                if comp.get('componentSetId'):
-                    lines.append(f"- **Component Set ID:** {comp['componentSetId']}")
-            elif comp.get('isComponentSet'):
-                lines.append(f"- **Type:** Component Set")
-            lines.append("")
-
-        # Bound variables
-        if 'boundVariables' in node_details:
-            lines.append("## Bound Variables")
-            for prop, var in node_details['boundVariables'].items():
-                if isinstance(var, list):
-                    lines.append(f"- **{prop}:** {len(var)} variable(s) bound")
-                else:
-                    lines.append(f"- **{prop}:** {var.get('variableId')}")
-            lines.append("")
-
-        # Text properties
-        if 'text' in node_details:
-            txt = node_details['text']
-            lines.append("## Text Properties")
-            if txt.get('characters'):
-                preview = txt['characters'][:50] + '...' if len(txt.get('characters', '')) > 50 else txt['characters']
-                lines.append(f"- **Content:** \"{preview}\"")
-            if txt.get('fontFamily'):
-                lines.append(f"- **Font:** {txt['fontFamily']} {txt.get('fontWeight', 400)}")
-            if txt.get('fontSize'):
-                lines.append(f"- **Size:** {txt['fontSize']}px")
-            if txt.get('lineHeight'):
-                lines.append(f"- **Line Height:** {txt['lineHeight']}px")
-            if txt.get('letterSpacing'):
-                lines.append(f"- **Letter Spacing:** {txt['letterSpacing']}px")
-            if txt.get('textAlign'):
-                lines.append(f"- **Alignment:** {txt['textAlign']} / {txt.get('textAlignVertical', 'TOP')}")
-            if txt.get('textCase') and txt['textCase'] != 'ORIGINAL':
-                lines.append(f"- **Text Case:** {txt['textCase']}")
-            if txt.get('textDecoration') and txt['textDecoration'] != 'NONE':
-                lines.append(f"- **Decoration:** {txt['textDecoration']}")
-            if txt.get('textAutoResize'):
-                lines.append(f"- **Auto Resize:** {txt['textAutoResize']}")
-            if txt.get('fontFamily') and txt.get('fontSize'):
-                w = int(txt.get('fontWeight', 400))
-                sz = int(txt['fontSize'])
-                lh = f"/{int(txt['lineHeight'])}px" if txt.get('lineHeight') else ''
-                fam = txt['fontFamily']
-                lines.append(f"- **CSS:** `font: {w} {sz}px{lh} '{fam}', sans-serif;`")
-            lines.append("")
-
-        # CSS Ready Section (only for CSS-based frameworks)
-        hint_framework = params.framework or 'css'
-        if hint_framework not in ('swiftui', 'kotlin'):
-            css_ready = _build_css_ready_section(node_details)
-            if css_ready:
-                lines.append("## CSS Ready")
-                lines.append("```css")
-                css_props = {k: v for k, v in css_ready.items() if not k.endswith('-note')}
-                for prop, value in css_props.items():
-                    lines.append(f"  {prop}: {value};")
-                lines.append("```")
-                notes = {k: v for k, v in css_ready.items() if k.endswith('-note')}
-                for note_key, note_value in notes.items():
-                    lines.append(f"> Note: {note_value}")
-                lines.append("")
-
-        # Implementation Hints
-        if 'implementationHints' in node_details:
-            hints = node_details['implementationHints']
-            lines.append("## 🚀 Implementation Hints")
-            if hints.get('layout'):
-                lines.append("### Layout")
-                for hint in hints['layout']:
-                    lines.append(f"- {hint}")
-            if hints.get('responsive'):
-                lines.append("### Responsive")
-                for hint in hints['responsive']:
-                    lines.append(f"- {hint}")
-            if hints.get('interactions'):
-                lines.append("### Interactions")
-                for hint in hints['interactions']:
-                    lines.append(f"- {hint}")
-            if hints.get('accessibility'):
-                lines.append("### Accessibility")
-                for hint in hints['accessibility']:
-                    lines.append(f"- {hint}")
-            if hints.get('components'):
-                lines.append("### Components")
-                for hint in hints['components']:
-                    lines.append(f"- {hint}")
-            lines.append("")
-
-        # Accessibility Warnings
-        if 'accessibility' in node_details:
-            a11y = node_details['accessibility']
-            lines.append("## ♿ Accessibility")
-            if a11y.get('contrast_issues'):
-                lines.append("### Contrast Issues")
-                for issue in a11y['contrast_issues']:
-                    severity_icon = "❌" if issue.get('severity') == 'error' else "⚠️" if issue.get('severity') == 'warning' else "ℹ️"
-                    lines.append(f"- {severity_icon} {issue.get('message')}")
-                    if issue.get('wcag'):
-                        lines.append(f"  - WCAG: {issue['wcag']}")
-            if a11y.get('touch_target_warnings'):
-                lines.append("### Touch Target Issues")
-                for issue in a11y['touch_target_warnings']:
-                    severity_icon = "❌" if issue.get('severity') == 'error' else "⚠️"
-                    lines.append(f"- {severity_icon} {issue.get('message')}")
-                    if issue.get('wcag'):
-                        lines.append(f"  - WCAG: {issue['wcag']}")
-            if a11y.get('label_warnings'):
-                lines.append("### Label Warnings")
-                for issue in a11y['label_warnings']:
-                    lines.append(f"- ⚠️ {issue.get('message')}")
-                    if issue.get('wcag'):
-                        lines.append(f"  - WCAG: {issue['wcag']}")
-            lines.append("")
-
-        # Children
-        if 'children' in node_details:
-            lines.append(f"## Children ({node_details.get('childrenCount', 0)} nodes)")
-            lines.append("")
-            _render_children_markdown(lines, node_details['children'], indent=0)
-        elif 'childrenCount' in node_details:
-            lines.append(f"**Children:** {node_details['childrenCount']} child node(s)")
-
-        return "\n".join(lines)
+        node_details = _build_node_details(node, params.node_id, params.file_key, hint_framework, markdown=True)
+        return _render_node_details_markdown(node_details, hint_framework)
 
     except Exception as e:
         return _handle_api_error(e)
@@ -3750,19 +4616,12 @@ async def figma_get_screenshot(params: FigmaScreenshotInput) -> str:
         str: Local file paths for each screenshot
     """
     try:
-        ids = ",".join(params.node_ids)
-
-        data = await _make_figma_request(
-            f"images/{params.file_key}",
-            params={
-                "ids": ids,
-                "format": params.format.value,
-                "scale": params.scale
-            }
+        images = await _render_images(
+            params.file_key,
+            params.node_ids,
+            {"format": params.format.value, "scale": params.scale}
         )
 
-        images = data.get('images', {})
-
         if not images:
             return "Error: No images were generated. Check the node IDs."
 
@@ -3846,77 +4705,17 @@ async def figma_get_design_tokens(params: FigmaDesignTokensInput) -> str:
         str: JSON formatted design tokens
     """
     try:
-        if params.node_id:
-            data = await _make_figma_request(
-                f"files/{params.file_key}/nodes",
-                params={"ids": params.node_id}
-            )
-            nodes = data.get('nodes', {})
-            node = nodes.get(params.node_id, {}).get('document', {})
-        else:
-            data = await _make_figma_request(f"files/{params.file_key}")
-            node = data.get('document', {})
-
-        tokens = {}
-
-        # Extract colors
-        if params.include_colors:
-            colors: List[Dict[str, Any]] = []
-            _extract_colors_from_node(node, colors)
-            # Deduplicate by color value
-            unique_colors = {}
-            for c in colors:
-                # Generate dedup key based on color type
-                if c.get('hex'):
-                    key = c['hex']
-                elif c.get('color'):
-                    key = c['color']
-                elif c.get('gradient'):
-                    key = str(c['gradient'])
-                elif c.get('image'):
-                    key = c['image'].get('imageRef', str(c['image']))
-                else:
-                    key = str(c)
-                if key not in unique_colors:
-                    unique_colors[key] = c
-            tokens['colors'] = list(unique_colors.values())
-
-        # Extract typography
-        if params.include_typography:
-            typography: List[Dict[str, Any]] = []
-            _extract_typography_from_node(node, typography)
-            tokens['typography'] = typography
-
-        # Extract spacing
-        if params.include_spacing:
-            spacing: List[Dict[str, Any]] = []
-            _extract_spacing_from_node(node, spacing)
-            # Filter to only auto-layout items
-            tokens['spacing'] = [s for s in spacing if s.get('type') == 'auto-layout']
-
-        # Extract effects (shadows, blurs)
-        if params.include_effects:
-            shadows: List[Dict[str, Any]] = []
-            _extract_shadows_from_node(node, shadows)
-            # Separate shadows and blurs
-            shadow_tokens = [s for s in shadows if 'SHADOW' in s.get('type', '')]
-            blur_tokens = [s for s in shadows if 'BLUR' in s.get('type', '')]
-
-            # Deduplicate shadows by value
-            unique_shadows = {}
-            for s in shadow_tokens:
-                key = f"{s.get('color', '')}-{s.get('offsetX', 0)}-{s.get('offsetY', 0)}-{s.get('blur', 0)}"
-                if key not in unique_shadows:
-                    unique_shadows[key] = s
-            tokens['shadows'] = list(unique_shadows.values())
-
-            # Deduplicate blurs by value
-            unique_blurs = {}
-            for b in blur_tokens:
-                key = f"{b.get('type', '')}-{b.get('radius', 0)}"
-                if key not in unique_blurs:
-                    unique_blurs[key] = b
-            tokens['blurs'] = list(unique_blurs.values())
+        node = await _fetch_node_tree(params.file_key, params.node_id)
+
+        # Token extraction is pure CPU work; keep it off the event loop
+        tokens = await asyncio.to_thread(
+            _build_design_tokens,
+            node,
+            include_colors=params.include_colors,
+            include_typography=params.include_typography,
+            include_spacing=params.include_spacing,
+            include_effects=params.include_effects
+        )
 
         # Format as design token standard
         formatted_tokens = {
@@ -3925,8 +4724,12 @@ async def figma_get_design_tokens(params: FigmaDesignTokensInput) -> str:
             'tokens': tokens
         }
 
+        # Estimate output size up front so oversized results skip the
+        # generated code and the serialize-then-discard round trip
+        over_limit = _estimate_tokens_size(tokens) > CHARACTER_LIMIT * 0.9
+
         # Generate ready-to-use code if requested
-        if params.include_generated_code:
+        if params.include_generated_code and not over_limit:
             colors_list = tokens.get('colors', [])
             typography_list = tokens.get('typography', [])
             spacing_list = tokens.get('spacing', [])
@@ -3938,38 +4741,29 @@ async def figma_get_design_tokens(params: FigmaDesignTokensInput) -> str:
                 'tailwind_config': _generate_tailwind_config(colors_list, typography_list, shadows_list)
             }
 
-        result = json.dumps(formatted_tokens, indent=2)
+        if over_limit:
+            _truncate_token_categories(tokens, max_per_category=100)
+
+        result = _dumps(formatted_tokens)
 
         # Check character limit
         if len(result) > CHARACTER_LIMIT:
             # Step 1: Remove generated code (CSS/SCSS/Tailwind) - usually the biggest chunk
             if 'generated' in formatted_tokens:
                 del formatted_tokens['generated']
-                result = json.dumps(formatted_tokens, indent=2)
+                result = _dumps(formatted_tokens)
 
             # Step 2: If still too large, limit each token category
-            if len(result) > CHARACTER_LIMIT:
-                max_per_category = 100
-                if isinstance(formatted_tokens.get('tokens'), dict):
-                    for key in formatted_tokens['tokens']:
-                        if isinstance(formatted_tokens['tokens'][key], list) and len(formatted_tokens['tokens'][key]) > max_per_category:
-                            total = len(formatted_tokens['tokens'][key])
-                            formatted_tokens['tokens'][key] = formatted_tokens['tokens'][key][:max_per_category]
-                            formatted_tokens['tokens'][key].append({
-                                '_truncated': True,
-                                '_message': f'{total - max_per_category} more items. Use node_id to narrow scope.'
-                            })
-                result = json.dumps(formatted_tokens, indent=2)
+            if len(result) > CHARACTER_LIMIT and not over_limit:
+                _truncate_token_categories(tokens, max_per_category=100)
+                result = _dumps(formatted_tokens)
 
             # Step 3: If STILL too large, hard truncate with message
             if len(result) > CHARACTER_LIMIT:
                 formatted_tokens['_warning'] = f'Result truncated from {len(result)} chars. Use node_id parameter to narrow scope.'
                 # Keep only first 20 of each
-                if isinstance(formatted_tokens.get('tokens'), dict):
-                    for key in formatted_tokens['tokens']:
-                        if isinstance(formatted_tokens['tokens'][key], list):
-                            formatted_tokens['tokens'][key] = formatted_tokens['tokens'][key][:20]
-                result = json.dumps(formatted_tokens, indent=2)
+                _truncate_token_categories(tokens, max_per_category=20)
+                result = _dumps(formatted_tokens)
 
         return result
 
@@ -4010,7 +4804,7 @@ async def figma_get_styles(params: FigmaStylesInput) -> str:
         # Fetch styles from the file styles endpoint
         data = await _make_figma_request(f"files/{params.file_key}/styles")
 
-        styles = data.get('meta', {}).get('styles', [])
+        styles = (data.get('meta') or _EMPTY_DICT).get('styles', [])
 
         if not styles:
             return "No published styles found in this file."
@@ -4061,8 +4855,8 @@ async def figma_get_styles(params: FigmaStylesInput) -> str:
                 f"files/{params.file_key}/nodes",
                 params={"ids": ",".join(style_node_ids)}
             )
-            nodes_data = nodes_response.get('nodes', {})
-            doc_styles = nodes_response.get('styles', {})
+            nodes_data = nodes_response.get('nodes') or _EMPTY_DICT
+            doc_styles = nodes_response.get('styles') or _EMPTY_DICT
 
         # Enrich styles with actual values
         def enrich_style(style_data: Dict, doc_styles: Dict, nodes_data: Dict) -> Dict:
@@ -4072,7 +4866,7 @@ async def figma_get_styles(params: FigmaStylesInput) -> str:
                 style_data['styleType'] = style_info.get('styleType', '')
 
             # Get node directly from nodes_data (optimized - no tree search)
-            node = nodes_data.get(node_id, {}).get('document', {})
+            node = (nodes_data.get(node_id) or _EMPTY_DICT).get('document') or _EMPTY_DICT
             if node:
                 # Extract fill details
                 if node.get('fills'):
@@ -4119,97 +4913,19 @@ async def figma_get_styles(params: FigmaStylesInput) -> str:
                 'effect_styles': effect_styles if params.include_effect_styles else [],
                 'grid_styles': grid_styles if params.include_grid_styles else []
             }
-            return json.dumps(result, indent=2)
-
-        # Markdown format
-        lines = [
-            "# Published Styles",
-            f"**File:** `{params.file_key}`",
-            f"**Total Styles:** {len(styles)}",
-            ""
-        ]
-
-        if fill_styles:
-            lines.append("## 🎨 Fill/Color Styles")
-            lines.append("")
-            for style in fill_styles:
-                lines.append(f"### {style['name']}")
-                if style.get('description'):
-                    lines.append(f"*{style['description']}*")
-                if style.get('fills'):
-                    for fill in style['fills']:
-                        if fill.get('fillType') == 'SOLID':
-                            lines.append(f"- **Color:** `{fill.get('color', 'N/A')}`")
-                            if fill.get('opacity') is not None and fill['opacity'] < 1:
-                                lines.append(f"- **Opacity:** {fill['opacity']}")
-                        elif 'GRADIENT' in fill.get('fillType', ''):
-                            lines.append(f"- **Type:** {fill['fillType']}")
-                            if fill.get('gradient'):
-                                grad = fill['gradient']
-                                lines.append(f"- **Angle:** {grad.get('angle', 0)}°")
-                                stops = grad.get('stops', [])
-                                if stops:
-                                    stop_str = ', '.join([f"{s['color']} at {int(s['position']*100)}%" for s in stops])
-                                    lines.append(f"- **Stops:** {stop_str}")
-                lines.append(f"- **Key:** `{style['key']}`")
-                lines.append("")
-
-        if text_styles:
-            lines.append("## 📝 Text Styles")
-            lines.append("")
-            for style in text_styles:
-                lines.append(f"### {style['name']}")
-                if style.get('description'):
-                    lines.append(f"*{style['description']}*")
-                if style.get('textStyle'):
-                    ts = style['textStyle']
-                    if ts.get('fontFamily'):
-                        lines.append(f"- **Font:** {ts['fontFamily']}")
-                    if ts.get('fontWeight'):
-                        lines.append(f"- **Weight:** {ts['fontWeight']}")
-                    if ts.get('fontSize'):
-                        lines.append(f"- **Size:** {ts['fontSize']}px")
-                    if ts.get('lineHeightPx'):
-                        lines.append(f"- **Line Height:** {ts['lineHeightPx']}px")
-                    if ts.get('letterSpacing'):
-                        lines.append(f"- **Letter Spacing:** {ts['letterSpacing']}")
-                    if ts.get('textCase') and ts['textCase'] != 'ORIGINAL':
-                        lines.append(f"- **Case:** {ts['textCase']}")
-                    if ts.get('textDecoration') and ts['textDecoration'] != 'NONE':
-                        lines.append(f"- **Decoration:** {ts['textDecoration']}")
-                lines.append(f"- **Key:** `{style['key']}`")
-                lines.append("")
-
-        if effect_styles:
-            lines.append("## ✨ Effect Styles")
-            lines.append("")
-            for style in effect_styles:
-                lines.append(f"### {style['name']}")
-                if style.get('description'):
-                    lines.append(f"*{style['description']}*")
-                if style.get('effects'):
-                    effects = style['effects']
-                    if effects.get('shadows'):
-                        for shadow in effects['shadows']:
-                            shadow_type = shadow.get('type', 'DROP_SHADOW')
-                            lines.append(f"- **{shadow_type}:** {shadow.get('color', 'N/A')} offset({shadow.get('offsetX', 0)}, {shadow.get('offsetY', 0)}) blur({shadow.get('blur', 0)})")
-                    if effects.get('blurs'):
-                        for blur in effects['blurs']:
-                            lines.append(f"- **{blur.get('type', 'BLUR')}:** radius {blur.get('radius', 0)}px")
-                lines.append(f"- **Key:** `{style['key']}`")
-                lines.append("")
-
-        if grid_styles:
-            lines.append("## 📐 Grid Styles")
-            lines.append("")
-            for style in grid_styles:
-                lines.append(f"### {style['name']}")
-                if style.get('description'):
-                    lines.append(f"*{style['description']}*")
-                lines.append(f"- **Key:** `{style['key']}`")
-                lines.append("")
+            return _dumps(result)
+
+        # Markdown format, written until the character limit is reached
+        buf = io.StringIO()
+        written = 0
+        for chunk in _iter_styles_markdown(
+            params.file_key, len(styles), fill_styles, text_styles, effect_styles, grid_styles
+        ):
+            written += buf.write(chunk)
+            if written > CHARACTER_LIMIT:
+                break
 
-        result = "\n".join(lines)
+        result = buf.getvalue()
 
         if len(result) > CHARACTER_LIMIT:
             return result[:CHARACTER_LIMIT] + "\n\n... (truncated)"
@@ -4253,6 +4969,7 @@ async def figma_generate_code(params: FigmaCodeGenInput) -> str:
             - node_id (str): Node ID to convert
             - framework: Target framework
             - component_name (Optional[str]): Custom component name
+            - flatten_empty (bool): Inline unstyled React wrappers (default: False)
 
     Returns:
         str: Generated code in the requested framework
@@ -4260,16 +4977,7 @@ async def figma_generate_code(params: FigmaCodeGenInput) -> str:
     try:
         # Use nodes endpoint to get full node tree with all properties
         # (files endpoint may omit relativeTransform needed for flip detection)
-        if params.node_id:
-            data = await _make_figma_request(
-                f"files/{params.file_key}/nodes",
-                params={"ids": params.node_id}
-            )
-            nodes = data.get('nodes', {})
-            node = nodes.get(params.node_id, {}).get('document', {})
-        else:
-            data = await _make_figma_request(f"files/{params.file_key}")
-            node = data.get('document', {})
+        node = await _fetch_node_tree(params.file_key, params.node_id)
 
         if not node:
             return f"Error: Node '{params.node_id}' not found."
@@ -4277,50 +4985,10 @@ async def figma_generate_code(params: FigmaCodeGenInput) -> str:
         # Generate component name
         component_name = params.component_name or _sanitize_component_name(node.get('name', 'Component'))
 
-        # Generate code based on framework
-        if params.framework in [CodeFramework.REACT, CodeFramework.REACT_TAILWIND]:
-            use_tailwind = params.framework == CodeFramework.REACT_TAILWIND
-            code = _generate_react_code(node, component_name, use_tailwind)
-        elif params.framework in [CodeFramework.VUE, CodeFramework.VUE_TAILWIND]:
-            use_tailwind = params.framework == CodeFramework.VUE_TAILWIND
-            code = _generate_vue_code(node, component_name, use_tailwind)
-        elif params.framework == CodeFramework.TAILWIND_ONLY:
-            bbox = node.get('absoluteBoundingBox', {})
-            fills = node.get('fills', [])
-            bg = ''
-            if fills and fills[0].get('type') == 'SOLID':
-                bg = f"bg-[{_rgba_to_hex(fills[0].get('color', {}))}]"
-            code = f"w-[{int(bbox.get('width', 0))}px] h-[{int(bbox.get('height', 0))}px] {bg}"
-        elif params.framework == CodeFramework.CSS:
-            code = _generate_css_code(node, component_name)
-        elif params.framework == CodeFramework.SCSS:
-            code = _generate_scss_code(node, component_name)
-        elif params.framework == CodeFramework.SWIFTUI:
-            from generators.swiftui_generator import generate_swiftui_code
-            code = generate_swiftui_code(node, component_name)
-        elif params.framework == CodeFramework.KOTLIN:
-            code = _generate_kotlin_code(node, component_name)
-        else:
-            # HTML/CSS
-            bbox = node.get('absoluteBoundingBox', {})
-            fills = node.get('fills', [])
-            bg = ''
-            if fills and fills[0].get('type') == 'SOLID':
-                bg = f"background-color: {_rgba_to_hex(fills[0].get('color', {}))};"
-
-            code = f'''<!-- {component_name} -->
-<div class="{component_name.lower()}">
-  <!-- Content -->
-</div>
-
-<style>
-.{component_name.lower()} {{
-  width: {int(bbox.get('width', 0))}px;
-  height: {int(bbox.get('height', 0))}px;
-  {bg}
-}}
-</style>
-'''
+        # Generation is pure CPU work; keep it off the event loop
+        code = await asyncio.to_thread(
+            _generate_code_for_framework, node, params.framework, component_name, params.flatten_empty
+        )
 
         lines = [
             f"# Generated Code: {component_name}",
@@ -4338,6 +5006,93 @@ async def figma_generate_code(params: FigmaCodeGenInput) -> str:
         return _handle_api_error(e)
 
 
+@_versioned_tool(
+    name="figma_get_design_bundle",
+    annotations={
+        "title": "Get Code and Design Tokens",
+        "readOnlyHint": True,
+        "destructiveHint": False,
+        "idempotentHint": True,
+        "openWorldHint": True
+    }
+)
+async def figma_get_design_bundle(params: FigmaDesignBundleInput) -> str:
+    """
+    Generate code and extract design tokens for a node with a single fetch.
+
+    Combines figma_generate_code and figma_get_design_tokens: the node is
+    downloaded once and its tree is walked once for all token categories.
+
+    Args:
+        params: FigmaDesignBundleInput containing:
+            - file_key (str): Figma file key
+            - node_id (str): Node ID to convert
+            - framework: Target framework
+            - component_name (Optional[str]): Custom component name
+            - flatten_empty (bool): Inline unstyled React wrappers (default: False)
+            - include_colors, include_typography, include_spacing, include_effects: Toggle token types
+
+    Returns:
+        str: JSON with generated code and design tokens
+    """
+    try:
+        node = await _fetch_node_tree(params.file_key, params.node_id)
+
+        if not node:
+            return f"Error: Node '{params.node_id}' not found."
+
+        component_name = params.component_name or _sanitize_component_name(node.get('name', 'Component'))
+        # Code generation and token extraction only read the node tree,
+        # so both run in worker threads instead of blocking the event loop
+        code, tokens = await asyncio.gather(
+            asyncio.to_thread(
+                _generate_code_for_framework, node, params.framework, component_name, params.flatten_empty
+            ),
+            asyncio.to_thread(
+                _build_design_tokens,
+                node,
+                include_colors=params.include_colors,
+                include_typography=params.include_typography,
+                include_spacing=params.include_spacing,
+                include_effects=params.include_effects
+            ),
+        )
+
+        bundle = {
+            'file_key': params.file_key,
+            'node_id': params.node_id,
+            'component_name': component_name,
+            'framework': params.framework.value,
+            'code': code,
+            'tokens': tokens
+        }
+
+        if len(code) + _estimate_tokens_size(tokens) > CHARACTER_LIMIT * 0.9:
+            _truncate_token_categories(tokens, max_per_category=100)
+        result = _dumps(bundle)
+
+        if len(result) > CHARACTER_LIMIT:
+            bundle['_warning'] = f'Result truncated from {len(result)} chars. Use a smaller node to narrow scope.'
+            _truncate_token_categories(tokens, max_per_category=20)
+            result = _dumps(bundle)
+
+        if len(result) > CHARACTER_LIMIT:
+            # What is left over the limit is generated code: keep the share of
+            # it that fits (escaping makes the JSON longer than the raw text)
+            encoded_len = len(_dumps(code))
+            keep = max(0, len(code) * (encoded_len - (len(result) - CHARACTER_LIMIT) - 100) // encoded_len)
+            bundle['code'] = code[:keep] + '\n\n... (truncated)'
+            result = _dumps(bundle)
+            if len(result) > CHARACTER_LIMIT:
+                bundle['code'] = '... (omitted: too large)'
+                result = _dumps(bundle)
+
+        return result
+
+    except Exception as e:
+        return _handle_api_error(e)
+
+
 # ============================================================================
 # Code Connect Tools
 # ============================================================================
@@ -4378,44 +5133,44 @@ async def figma_get_code_connect_map(params: FigmaCodeConnectGetInput) -> str:
         file_mappings = mappings.get(params.file_key, {})
 
         if not file_mappings:
-            return json.dumps({
+            return _dumps({
                 "status": "success",
                 "file_key": params.file_key,
                 "mappings": {},
                 "message": f"No Code Connect mappings found for file '{params.file_key}'."
-            }, indent=2)
+            })
 
         # If specific node_id requested
         if params.node_id:
             node_mapping = file_mappings.get(params.node_id)
             if node_mapping:
-                return json.dumps({
+                return _dumps({
                     "status": "success",
                     "file_key": params.file_key,
                     "node_id": params.node_id,
                     "mapping": node_mapping
-                }, indent=2)
+                })
             else:
-                return json.dumps({
+                return _dumps({
                     "status": "not_found",
                     "file_key": params.file_key,
                     "node_id": params.node_id,
                     "message": f"No mapping found for node '{params.node_id}' in file '{params.file_key}'."
-                }, indent=2)
+                })
 
         # Return all mappings for the file
-        return json.dumps({
+        return _dumps({
             "status": "success",
             "file_key": params.file_key,
             "mappings": file_mappings,
             "count": len(file_mappings)
-        }, indent=2)
+        })
 
     except Exception as e:
-        return json.dumps({
+        return _dumps({
             "status": "error",
             "message": str(e)
-        }, indent=2)
+        })
 
 
 @_versioned_tool(
@@ -4459,48 +5214,86 @@ async def figma_add_code_connect_map(params: FigmaCodeConnectAddInput) -> str:
           example="<Button variant='primary'>Click</Button>"
     """
     try:
-        data = _load_code_connect_data()
-        mappings = data.setdefault("mappings", {})
-        file_mappings = mappings.setdefault(params.file_key, {})
-
-        # Check if updating existing
-        is_update = params.node_id in file_mappings
-        timestamp = _get_current_timestamp()
-
-        # Create mapping
-        mapping = {
-            "component_path": params.component_path,
-            "component_name": params.component_name,
-            "props_mapping": params.props_mapping,
-            "variants": params.variants,
-            "example": params.example,
-            "updated_at": timestamp
-        }
-
-        if is_update:
-            # Preserve created_at
-            mapping["created_at"] = file_mappings[params.node_id].get("created_at", timestamp)
-        else:
-            mapping["created_at"] = timestamp
-
-        file_mappings[params.node_id] = mapping
+        data = _load_code_connect_data(for_update=True)
+        action, mapping = _apply_code_connect_mapping(data, params, _get_current_timestamp())
         _save_code_connect_data(data)
 
-        action = "updated" if is_update else "added"
-        return json.dumps({
+        return _dumps({
             "status": "success",
             "action": action,
             "file_key": params.file_key,
             "node_id": params.node_id,
             "mapping": mapping,
             "message": f"Code Connect mapping {action} successfully for '{params.component_name}'."
-        }, indent=2)
+        })
 
     except Exception as e:
-        return json.dumps({
+        return _dumps({
             "status": "error",
             "message": str(e)
-        }, indent=2)
+        })
+
+
+@_versioned_tool(
+    name="figma_add_code_connect_maps",
+    annotations={
+        "title": "Add Code Connect Mappings (Batch)",
+        "readOnlyHint": False,
+        "destructiveHint": False,
+        "idempotentHint": True,
+        "openWorldHint": False
+    }
+)
+async def figma_add_code_connect_maps(params: FigmaCodeConnectAddBatchInput) -> str:
+    """
+    Add or update several Code Connect mappings in one call.
+
+    Same as figma_add_code_connect_map for each entry, but the mapping store is
+    loaded and saved once for the whole batch.
+
+    Args:
+        params: FigmaCodeConnectAddBatchInput containing:
+            - mappings (List): Entries with the same fields as figma_add_code_connect_map
+
+    Returns:
+        str: JSON formatted result with per-mapping status
+    """
+    try:
+        data = _load_code_connect_data(for_update=True)
+        timestamp = _get_current_timestamp()
+        results = []
+        for item in params.mappings:
+            try:
+                action, _ = _apply_code_connect_mapping(data, item, timestamp)
+                results.append({
+                    "status": "success",
+                    "action": action,
+                    "file_key": item.file_key,
+                    "node_id": item.node_id,
+                    "component_name": item.component_name
+                })
+            except Exception as e:
+                results.append({
+                    "status": "error",
+                    "file_key": item.file_key,
+                    "node_id": item.node_id,
+                    "message": str(e)
+                })
+
+        _save_code_connect_data(data)
+
+        succeeded = sum(1 for r in results if r["status"] == "success")
+        return _dumps({
+            "status": "success" if succeeded == len(results) else "partial",
+            "results": results,
+            "message": f"{succeeded} of {len(results)} Code Connect mappings saved."
+        })
+
+    except Exception as e:
+        return _dumps({
+            "status": "error",
+            "message": str(e)
+        })
 
 
 @_versioned_tool(
@@ -4531,17 +5324,17 @@ async def figma_remove_code_connect_map(params: FigmaCodeConnectRemoveInput) ->
         - Remove mapping: file_key="ABC123", node_id="1:2"
     """
     try:
-        data = _load_code_connect_data()
+        data = _load_code_connect_data(for_update=True)
         mappings = data.get("mappings", {})
         file_mappings = mappings.get(params.file_key, {})
 
         if params.node_id not in file_mappings:
-            return json.dumps({
+            return _dumps({
                 "status": "not_found",
                 "file_key": params.file_key,
                 "node_id": params.node_id,
                 "message": f"No mapping found for node '{params.node_id}' in file '{params.file_key}'."
-            }, indent=2)
+            })
 
         # Remove the mapping
         removed_mapping = file_mappings.pop(params.node_id)
@@ -4552,19 +5345,19 @@ async def figma_remove_code_connect_map(params: FigmaCodeConnectRemoveInput) ->
 
         _save_code_connect_data(data)
 
-        return json.dumps({
+        return _dumps({
             "status": "success",
             "file_key": params.file_key,
             "node_id": params.node_id,
             "removed_mapping": removed_mapping,
             "message": f"Code Connect mapping removed successfully for '{removed_mapping.get('component_name', 'Unknown')}'."
-        }, indent=2)
+        })
 
     except Exception as e:
-        return json.dumps({
+        return _dumps({
             "status": "error",
             "message": str(e)
-        }, indent=2)
+        })
 
 
 # ============================================================================
@@ -4609,19 +5402,7 @@ async def figma_list_assets(params: FigmaListAssetsInput) -> str:
     """
     try:
         # Get node data
-        if params.node_id:
-            data = await _make_figma_request(
-                f"files/{params.file_key}/nodes",
-                params={"ids": params.node_id, "geometry": "paths"}
-            )
-            nodes = data.get('nodes', {})
-            root_node = nodes.get(params.node_id, {}).get('document', {})
-        else:
-            data = await _make_figma_request(
-                f"files/{params.file_key}",
-                params={"geometry": "paths"}
-            )
-            root_node = data.get('document', {})
+        root_node = await _fetch_node_tree(params.file_key, params.node_id, {"geometry": "paths"})
 
         if not root_node:
             return "Error: Could not retrieve node data."
@@ -4654,7 +5435,7 @@ async def figma_list_assets(params: FigmaListAssetsInput) -> str:
 
         # Return in requested format
         if params.response_format == ResponseFormat.JSON:
-            return json.dumps({
+            return _dumps({
                 "file_key": params.file_key,
                 "node_id": params.node_id,
                 "assets": assets,
@@ -4664,7 +5445,7 @@ async def figma_list_assets(params: FigmaListAssetsInput) -> str:
                     "total_vectors": len(assets['vectors']),
                     "total_exports": len(assets['exports'])
                 }
-            }, indent=2)
+            })
 
         # Markdown format
         lines = [
@@ -4770,24 +5551,23 @@ async def figma_get_images(params: FigmaGetImagesInput) -> str:
     """
     try:
         # Get image URLs from Figma API
-        data = await _make_figma_request(
-            f"files/{params.file_key}/images"
-        )
+        # Image fill URLs and the optional node subtree are independent requests
+        if params.node_id:
+            data, root_node = await asyncio.gather(
+                _make_figma_request(f"files/{params.file_key}/images"),
+                _fetch_node_tree(params.file_key, params.node_id)
+            )
+        else:
+            data = await _make_figma_request(f"files/{params.file_key}/images")
+            root_node = None
 
-        images = data.get('meta', {}).get('images', {})
+        images = (data.get('meta') or _EMPTY_DICT).get('images') or _EMPTY_DICT
 
         if not images:
             return "No images found in this file. Images must be uploaded to Figma (not external links)."
 
         # If node_id specified, filter to only images used in that node
         if params.node_id:
-            node_data = await _make_figma_request(
-                f"files/{params.file_key}/nodes",
-                params={"ids": params.node_id}
-            )
-            nodes = node_data.get('nodes', {})
-            root_node = nodes.get(params.node_id, {}).get('document', {})
-
             if root_node:
                 # Collect image refs from node
                 assets: Dict[str, List] = {'images': [], 'vectors': [], 'exports': []}
@@ -4909,39 +5689,31 @@ async def figma_export_assets(params: FigmaExportAssetsInput) -> str:
         str: Export URLs and generated SVGs
     """
     try:
-        # Get node data for vector SVG generation
-        vector_svgs = {}
+        # Export via Figma Images API, fetching vector geometry concurrently
+        render = _render_images(
+            params.file_key,
+            params.node_ids,
+            {"format": params.format.value, "scale": params.scale}
+        )
         if params.include_svg_for_vectors:
-            node_data = await _make_figma_request(
-                f"files/{params.file_key}/nodes",
-                params={"ids": ",".join(params.node_ids), "geometry": "paths"}
+            vector_nodes, images = await asyncio.gather(
+                _fetch_nodes(params.file_key, params.node_ids, {"geometry": "paths"}),
+                render
             )
-            nodes = node_data.get('nodes', {})
-
-            for node_id in params.node_ids:
-                node = nodes.get(node_id, {}).get('document', {})
-                if node:
-                    vector_paths = _extract_vector_paths(node)
-                    if vector_paths:
-                        svg = _generate_svg_from_paths(vector_paths, node)
-                        if svg:
-                            vector_svgs[node_id] = {
-                                'name': node.get('name', 'Unnamed'),
-                                'svg': svg
-                            }
-
-        # Export via Figma Images API
-        ids = ",".join(params.node_ids)
-        data = await _make_figma_request(
-            f"images/{params.file_key}",
-            params={
-                "ids": ids,
-                "format": params.format.value,
-                "scale": params.scale
-            }
-        )
+        else:
+            vector_nodes, images = {}, await render
 
-        images = data.get('images', {})
+        # Generate inline SVG from vector path data
+        vector_svgs = {}
+        for node_id, node in vector_nodes.items():
+            vector_paths = _extract_vector_paths(node)
+            if vector_paths:
+                svg = _generate_svg_from_paths(vector_paths, node)
+                if svg:
+                    vector_svgs[node_id] = {
+                        'name': node.get('name', 'Unnamed'),
+                        'svg': svg
+                    }
 
         # Create assets directory in temp folder
         assets_dir = Path(tempfile.gettempdir()) / "figma_assets"
@@ -5017,6 +5789,42 @@ async def figma_export_assets(params: FigmaExportAssetsInput) -> str:
         return _handle_api_error(e)
 
 
+# ============================================================================
+# Cache Tools
+# ============================================================================
+
+@_versioned_tool(
+    name="figma_invalidate_cache",
+    annotations={
+        "title": "Invalidate Figma Response Cache",
+        "readOnlyHint": False,
+        "destructiveHint": False,
+        "idempotentHint": True,
+        "openWorldHint": False
+    }
+)
+async def figma_invalidate_cache(params: FigmaInvalidateCacheInput) -> str:
+    """
+    Drop cached Figma API responses so the next call fetches fresh data.
+
+    GET responses are cached for a few minutes so back-to-back tool calls on the
+    same file skip the download. Call this after editing the file in Figma.
+
+    Args:
+        params: FigmaInvalidateCacheInput containing:
+            - file_key (Optional[str]): File to invalidate (all files if omitted)
+
+    Returns:
+        str: JSON formatted result with the number of entries removed
+    """
+    removed = _invalidate_request_cache(params.file_key)
+    return _dumps({
+        "status": "success",
+        "file_key": params.file_key,
+        "removed_entries": removed
+    })
+
+
 # ============================================================================
 # Entry Point
 # ============================================================================
@@ -8,7 +8,9 @@ layout info, typography info - framework-agnostic intermediate representations.
 
 from __future__ import annotations
 from dataclasses import dataclass, field
-from typing import Dict, Any, List, Optional, Tuple
+from functools import lru_cache
+from itertools import islice
+from typing import Dict, Any, Iterator, List, Optional, Tuple
 import math
 import re
 
@@ -21,6 +23,18 @@ MAX_CHILDREN_LIMIT = 20       # React/Vue/CSS child limit per container
 MAX_NATIVE_CHILDREN_LIMIT = 15  # SwiftUI/Kotlin child limit
 MAX_DEPTH = 12                  # Max recursive depth
 
+# Shared stand-in for a missing ``children`` list (no allocation per leaf)
+_EMPTY: Tuple = ()
+
+# Shared stand-in for a missing ``absoluteBoundingBox`` (read-only). Figma always
+# sends all four keys when the box is present, so callers can subscript directly.
+_EMPTY_BBOX: Dict[str, float] = {'x': 0, 'y': 0, 'width': 0, 'height': 0}
+
+
+def _iter_children(node: Dict[str, Any], limit: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+    """Iterate over a node's children, stopping after ``limit`` without copying the list."""
+    return islice(node.get('children') or _EMPTY, limit)
+
 # Common Figma icon name patterns → SF Symbols mapping
 ICON_NAME_MAP = {
     # Solar icons
@@ -106,6 +120,14 @@ ICON_NAME_MAP = {
 }
 
 
+_DEVICE_IPHONE_RE = re.compile(r'(?i)iphone\s*\d+\s*[&/,]*\s*\d*\s*[-\u2013]\s*')
+_DEVICE_IPAD_RE = re.compile(r'(?i)ipad\s*\w*\s*[-\u2013]\s*')
+_DEVICE_ANDROID_RE = re.compile(r'(?i)android\s*\w*\s*[-\u2013]\s*')
+_NAME_WORD_SPLIT_RE = re.compile(r'[\s_\-\u2013/&]+')
+_NAME_SANITIZE_RE = re.compile(r'[^a-zA-Z0-9]')
+
+
+@lru_cache(maxsize=512)
 def sanitize_component_name(name: str) -> str:
     """Convert Figma frame name to valid component name.
 
@@ -114,20 +136,20 @@ def sanitize_component_name(name: str) -> str:
     'Login Page' -> 'LoginPage'
     """
     # Remove device names
-    cleaned = re.sub(r'(?i)iphone\s*\d+\s*[&/,]*\s*\d*\s*[-\u2013]\s*', '', name)
-    cleaned = re.sub(r'(?i)ipad\s*\w*\s*[-\u2013]\s*', '', cleaned)
-    cleaned = re.sub(r'(?i)android\s*\w*\s*[-\u2013]\s*', '', cleaned)
+    cleaned = _DEVICE_IPHONE_RE.sub('', name)
+    cleaned = _DEVICE_IPAD_RE.sub('', cleaned)
+    cleaned = _DEVICE_ANDROID_RE.sub('', cleaned)
     cleaned = cleaned.strip(' -\u2013')
 
     if not cleaned:
         cleaned = name  # Fallback to original
 
     # PascalCase conversion
-    words = re.split(r'[\s_\-\u2013/&]+', cleaned)
+    words = _NAME_WORD_SPLIT_RE.split(cleaned)
     pascal = ''.join(w.capitalize() for w in words if w)
 
     # Remove non-alphanumeric chars
-    pascal = re.sub(r'[^a-zA-Z0-9]', '', pascal)
+    pascal = _NAME_SANITIZE_RE.sub('', pascal)
 
     # Ensure starts with letter
     if pascal and not pascal[0].isalpha():
@@ -196,7 +218,7 @@ TAILWIND_ALIGN_MAP = {
 # Data Structures
 # ---------------------------------------------------------------------------
 
-@dataclass
+@dataclass(slots=True)
 class ColorValue:
     """Framework-agnostic color representation."""
     r: float  # 0-1 range (Figma native)
@@ -231,14 +253,14 @@ class ColorValue:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class GradientStop:
     """Single gradient color stop."""
     color: ColorValue
     position: float  # 0-1
 
 
-@dataclass
+@dataclass(slots=True)
 class GradientDef:
     """Framework-agnostic gradient definition."""
     type: str  # LINEAR, RADIAL, ANGULAR, DIAMOND
@@ -259,7 +281,7 @@ class GradientDef:
         return (90 - angle) % 360
 
 
-@dataclass
+@dataclass(slots=True)
 class FillLayer:
     """Single fill layer. A node can have multiple fills stacked."""
     type: str  # SOLID, GRADIENT_LINEAR, GRADIENT_RADIAL, GRADIENT_ANGULAR, GRADIENT_DIAMOND, IMAGE
@@ -271,7 +293,7 @@ class FillLayer:
     visible: bool = True
 
 
-@dataclass
+@dataclass(slots=True)
 class StrokeInfo:
     """Framework-agnostic stroke definition."""
     weight: float
@@ -283,7 +305,7 @@ class StrokeInfo:
     individual_weights: Optional[Dict[str, float]] = None  # top, right, bottom, left
 
 
-@dataclass
+@dataclass(slots=True)
 class CornerRadii:
     """Corner radius values."""
     top_left: float = 0
@@ -300,7 +322,7 @@ class CornerRadii:
         return self.top_left
 
 
-@dataclass
+@dataclass(slots=True)
 class ShadowEffect:
     """Shadow effect."""
     type: str  # DROP_SHADOW, INNER_SHADOW
@@ -311,14 +333,14 @@ class ShadowEffect:
     spread: float = 0
 
 
-@dataclass
+@dataclass(slots=True)
 class BlurEffect:
     """Blur effect."""
     type: str  # LAYER_BLUR, BACKGROUND_BLUR
     radius: float = 0
 
 
-@dataclass
+@dataclass(slots=True)
 class LayoutInfo:
     """Auto-layout information."""
     mode: str  # VERTICAL, HORIZONTAL, NONE
@@ -334,7 +356,7 @@ class LayoutInfo:
     wrap: str = 'NO_WRAP'  # NO_WRAP, WRAP
 
 
-@dataclass
+@dataclass(slots=True)
 class TextStyle:
     """Typography information."""
     font_family: str = ''
@@ -351,7 +373,7 @@ class TextStyle:
     truncation: str = 'DISABLED'
 
 
-@dataclass
+@dataclass(slots=True)
 class StyleBundle:
     """Complete style information for a node."""
     fills: List[FillLayer] = field(default_factory=list)
@@ -372,15 +394,25 @@ class StyleBundle:
 # Color Conversion Helpers
 # ---------------------------------------------------------------------------
 
-def rgba_to_hex(color: Dict[str, float]) -> str:
-    """Convert Figma color dict (r,g,b,a in 0-1) to hex string."""
-    r = int(color.get('r', 0) * 255)
-    g = int(color.get('g', 0) * 255)
-    b = int(color.get('b', 0) * 255)
-    a = color.get('a', 1)
+_HEX = tuple(f"{i:02x}" for i in range(256))
+
+
+@lru_cache(maxsize=1024)
+def _rgba_components_to_hex(r: float, g: float, b: float, a: float) -> str:
+    """Format 0-1 RGBA components; cached because files reuse a small palette."""
+    r = int(r * 255)
+    g = int(g * 255)
+    b = int(b * 255)
     if a < 1:
         return f"rgba({r}, {g}, {b}, {a:.2f})"
-    return f"#{r:02x}{g:02x}{b:02x}"
+    if (r | g | b) >> 8:  # Out of range: keep the plain formatter's output
+        return f"#{r:02x}{g:02x}{b:02x}"
+    return "#" + _HEX[r] + _HEX[g] + _HEX[b]
+
+
+def rgba_to_hex(color: Dict[str, float]) -> str:
+    """Convert Figma color dict (r,g,b,a in 0-1) to hex string."""
+    return _rgba_components_to_hex(color.get('r', 0), color.get('g', 0), color.get('b', 0), color.get('a', 1))
 
 
 def hex_to_rgb(hex_color: str) -> Tuple[int, int, int]:
@@ -393,7 +425,8 @@ def hex_to_rgb(hex_color: str) -> Tuple[int, int, int]:
     if len(hex_color) == 3:
         hex_color = ''.join(c * 2 for c in hex_color)
     if len(hex_color) >= 6:
-        return int(hex_color[0:2], 16), int(hex_color[2:4], 16), int(hex_color[4:6], 16)
+        r, g, b = bytes.fromhex(hex_color[:6])
+        return r, g, b
     return 0, 0, 0
 
 
@@ -600,7 +633,7 @@ def parse_text_style(node: Dict[str, Any]) -> TextStyle:
 
 def parse_style_bundle(node: Dict[str, Any]) -> StyleBundle:
     """Parse complete style information from a Figma node."""
-    bbox = node.get('absoluteBoundingBox', {})
+    bbox = node.get('absoluteBoundingBox') or _EMPTY_BBOX
     shadows, blurs = parse_effects(node)
 
     return StyleBundle(
@@ -613,8 +646,8 @@ def parse_style_bundle(node: Dict[str, Any]) -> StyleBundle:
         blend_mode=node.get('blendMode', 'PASS_THROUGH'),
         rotation=node.get('rotation', 0),
         layout=parse_layout(node),
-        width=bbox.get('width', 0),
-        height=bbox.get('height', 0),
+        width=bbox['width'],
+        height=bbox['height'],
         clips_content=node.get('clipsContent', False)
     )
 
@@ -920,6 +953,36 @@ def _corner_radii_to_css(node: Dict[str, Any]) -> str:
     return ""
 
 
+def _padding_to_css(top: float, right: float, bottom: float, left: float) -> str:
+    """Convert Figma padding to the shortest CSS padding shorthand ("" when none)."""
+    if top == bottom and right == left:
+        if top == right:
+            return f"{top}px" if top else ""
+        return f"{top}px {right}px"
+    return f"{top}px {right}px {bottom}px {left}px"
+
+
+def _padding_to_tailwind(top: float, right: float, bottom: float, left: float) -> List[str]:
+    """Convert Figma padding to Tailwind classes, using p-/px-/py- when sides match."""
+    if top == bottom and right == left:
+        if top == right:
+            return [f'p-[{top}px]'] if top else []
+        classes = [f'py-[{top}px]'] if top else []
+        if right:
+            classes.append(f'px-[{right}px]')
+        return classes
+    classes = []
+    if top:
+        classes.append(f'pt-[{top}px]')
+    if right:
+        classes.append(f'pr-[{right}px]')
+    if bottom:
+        classes.append(f'pb-[{bottom}px]')
+    if left:
+        classes.append(f'pl-[{left}px]')
+    return classes
+
+
 def _transform_to_css(node: Dict[str, Any]) -> Optional[str]:
     """Convert Figma transform properties to CSS transform."""
     transforms = []
@@ -986,8 +1049,11 @@ def _text_decoration_to_css(decoration: str) -> Optional[str]:
     return decoration_map.get(decoration)
 
 
+_token_name_sub = _re.compile(r'[^a-zA-Z0-9]+').sub
+
+
 def _sanitize_token_name(name: str) -> str:
     """Sanitize token name for use in CSS/SCSS variables and Tailwind config."""
-    sanitized = _re.sub(r'[^a-zA-Z0-9]+', '-', name.lower())
+    sanitized = _token_name_sub('-', name.lower())
     sanitized = sanitized.strip('-')
     return sanitized or 'unnamed'
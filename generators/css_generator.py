@@ -25,6 +25,10 @@ from generators.base import (
     _rgba_to_hex,
 )
 
+# Figma auto-layout alignment -> flexbox values
+_FLEX_ALIGN_MAP = {'MIN': 'flex-start', 'CENTER': 'center', 'MAX': 'flex-end', 'SPACE_BETWEEN': 'space-between'}
+_FLEX_ITEMS_MAP = {'MIN': 'flex-start', 'CENTER': 'center', 'MAX': 'flex-end'}
+
 
 # ---------------------------------------------------------------------------
 # Design-token variable generators
@@ -160,7 +164,7 @@ def generate_tailwind_config(
     color_entries: Dict[str, str] = {}
     for color in colors:
         hex_val = color.get('hex') or color.get('color', '')
-        if hex_val and not hex_val.startswith('/*') and not hex_val.startswith('rgba'):
+        if hex_val and not hex_val.startswith(('/*', 'rgba')):
             name = _sanitize_token_name(color.get('name', 'color'))
             if name not in color_entries:
                 color_entries[name] = hex_val
@@ -294,15 +298,13 @@ def generate_css_code(node: Dict[str, Any], component_name: str) -> str:
         # Alignment
         primary_align = node.get('primaryAxisAlignItems', 'MIN')
         counter_align = node.get('counterAxisAlignItems', 'MIN')
-        justify_map = {'MIN': 'flex-start', 'CENTER': 'center', 'MAX': 'flex-end', 'SPACE_BETWEEN': 'space-between'}
-        items_map = {'MIN': 'flex-start', 'CENTER': 'center', 'MAX': 'flex-end'}
 
         layout_css = f"""display: flex;
   flex-direction: {direction};
   gap: {gap}px;
   padding: {padding_top}px {padding_right}px {padding_bottom}px {padding_left}px;
-  justify-content: {justify_map.get(primary_align, 'flex-start')};
-  align-items: {items_map.get(counter_align, 'flex-start')};"""
+  justify-content: {_FLEX_ALIGN_MAP.get(primary_align, 'flex-start')};
+  align-items: {_FLEX_ITEMS_MAP.get(counter_align, 'flex-start')};"""
 
     # Flex child properties (layoutGrow, layoutPositioning, layoutAlign)
     flex_child_css = ''
@@ -521,9 +523,8 @@ def generate_scss_code(node: Dict[str, Any], component_name: str) -> str:
     layout_wrap = node.get('layoutWrap', 'NO_WRAP')
 
     # Map Figma alignment to CSS
-    align_map = {'MIN': 'flex-start', 'CENTER': 'center', 'MAX': 'flex-end', 'SPACE_BETWEEN': 'space-between'}
-    justify_content = align_map.get(primary_align, 'flex-start')
-    align_items = align_map.get(counter_align, 'flex-start')
+    justify_content = _FLEX_ALIGN_MAP.get(primary_align, 'flex-start')
+    align_items = _FLEX_ALIGN_MAP.get(counter_align, 'flex-start')
 
     # Build SCSS variables
     variables_list = [
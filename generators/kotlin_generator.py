@@ -7,14 +7,20 @@ shadows, blur, opacity, blend modes, rotation, padding, auto-layout,
 text styling, hyperlinks, line clamping, and paragraph spacing.
 """
 
-from typing import Dict, Any, List
+from itertools import islice
+from typing import Dict, Any, Sequence
 
 # Import shared constants from base module
 from generators.base import (
     KOTLIN_WEIGHT_MAP,
     MAX_NATIVE_CHILDREN_LIMIT,
+    _EMPTY,
 )
 
+# Figma counter-axis alignment -> Compose Alignment members
+_H_ALIGN_MAP = {'MIN': 'Start', 'CENTER': 'CenterHorizontally', 'MAX': 'End'}
+_V_ALIGN_MAP = {'MIN': 'Top', 'CENTER': 'CenterVertically', 'MAX': 'Bottom'}
+
 
 # ---------------------------------------------------------------------------
 # Public API
@@ -156,26 +162,23 @@ def generate_kotlin_code(node: Dict[str, Any], component_name: str) -> str:
     primary_align = node.get('primaryAxisAlignItems', 'MIN')
     counter_align = node.get('counterAxisAlignItems', 'MIN')
 
-    align_map = {'MIN': 'Start', 'CENTER': 'CenterHorizontally', 'MAX': 'End'}
-    v_align_map = {'MIN': 'Top', 'CENTER': 'CenterVertically', 'MAX': 'Bottom'}
-
     # Determine container type
     container = 'Column' if layout_mode == 'VERTICAL' else 'Row' if layout_mode == 'HORIZONTAL' else 'Box'
 
     # Generate children
-    children_code = generate_kotlin_children(node.get('children', []))
+    children_code = generate_kotlin_children(node.get('children') or _EMPTY)
 
     # Build arrangement
     arrangement_parts = []
     if layout_mode == 'VERTICAL':
         if gap:
             arrangement_parts.append(f'verticalArrangement = Arrangement.spacedBy({gap}.dp)')
-        h_align = align_map.get(counter_align, 'Start')
+        h_align = _H_ALIGN_MAP.get(counter_align, 'Start')
         arrangement_parts.append(f'horizontalAlignment = Alignment.{h_align}')
     elif layout_mode == 'HORIZONTAL':
         if gap:
             arrangement_parts.append(f'horizontalArrangement = Arrangement.spacedBy({gap}.dp)')
-        v_align = v_align_map.get(counter_align, 'Top')
+        v_align = _V_ALIGN_MAP.get(counter_align, 'Top')
         arrangement_parts.append(f'verticalAlignment = Alignment.{v_align}')
 
     arrangement = ',\n        '.join(arrangement_parts) if arrangement_parts else ''
@@ -246,12 +249,12 @@ fun {component_name}Preview() {{
     return code
 
 
-def generate_kotlin_children(children: List[Dict[str, Any]], indent: int = 8) -> str:
+def generate_kotlin_children(children: Sequence[Dict[str, Any]], indent: int = 8) -> str:
     """Generate Kotlin Compose code for children nodes."""
     lines = []
     prefix = ' ' * indent
 
-    for child in children[:MAX_NATIVE_CHILDREN_LIMIT]:
+    for child in islice(children, MAX_NATIVE_CHILDREN_LIMIT):
         node_type = child.get('type', '')
         name = child.get('name', 'Unknown')
 
@@ -16,10 +16,17 @@ from generators.base import (
     parse_text_style, parse_style_bundle,
     ColorValue, GradientDef, GradientStop, FillLayer, StrokeInfo, CornerRadii,
     ShadowEffect, BlurEffect, LayoutInfo, TextStyle, StyleBundle,
-    SWIFTUI_WEIGHT_MAP, MAX_NATIVE_CHILDREN_LIMIT, MAX_DEPTH,
+    SWIFTUI_WEIGHT_MAP, MAX_NATIVE_CHILDREN_LIMIT, MAX_DEPTH, _EMPTY, _EMPTY_BBOX,
     sanitize_component_name, map_icon_name,
 )
 
+# Layout and text alignment lookups shared by every node
+_H_ALIGN_MAP = {'MIN': '.leading', 'CENTER': '.center', 'MAX': '.trailing'}
+_V_ALIGN_MAP = {'MIN': '.top', 'CENTER': '.center', 'MAX': '.bottom'}
+_TEXT_ALIGN_MAP = {'LEFT': '.leading', 'CENTER': '.center', 'RIGHT': '.trailing'}
+
+# Child types that make a small frame an icon candidate (ELLIPSE excluded on purpose)
+_ICON_VECTOR_TYPES = frozenset({'VECTOR', 'BOOLEAN_OPERATION', 'STAR', 'POLYGON', 'LINE', 'REGULAR_POLYGON', 'GROUP'})
 
 
 # ---------------------------------------------------------------------------
@@ -63,9 +70,9 @@ def _swiftui_fill_modifier(node: Dict[str, Any]) -> tuple[str, str]:
         return '', ''
 
     # Get node dimensions for gradient sizing
-    bbox = node.get('absoluteBoundingBox', {})
-    node_width = bbox.get('width', 0)
-    node_height = bbox.get('height', 0)
+    bbox = node.get('absoluteBoundingBox') or _EMPTY_BBOX
+    node_width = bbox['width']
+    node_height = bbox['height']
 
     # Single fill - simple background
     if len(fill_layers) == 1:
@@ -341,9 +348,9 @@ def _swiftui_collect_modifiers(node: Dict[str, Any], include_frame: bool = True)
 
     # Frame/size
     if include_frame:
-        bbox = node.get('absoluteBoundingBox', {})
-        w = int(bbox.get('width', 0))
-        h = int(bbox.get('height', 0))
+        bbox = node.get('absoluteBoundingBox') or _EMPTY_BBOX
+        w = int(bbox['width'])
+        h = int(bbox['height'])
         if w and h:
             modifiers.append(f".frame(width: {w}, height: {h})")
 
@@ -502,9 +509,8 @@ def _swiftui_text_node(node: Dict[str, Any], indent: int, parent_node: Dict[str,
         lines.append(f'{prefix}    .tracking({ts.letter_spacing:.1f})')
 
     # Text alignment
-    align_map = {'LEFT': '.leading', 'CENTER': '.center', 'RIGHT': '.trailing'}
-    if ts.text_align in align_map and ts.text_align != 'LEFT':
-        lines.append(f'{prefix}    .multilineTextAlignment({align_map[ts.text_align]})')
+    if ts.text_align in _TEXT_ALIGN_MAP and ts.text_align != 'LEFT':
+        lines.append(f'{prefix}    .multilineTextAlignment({_TEXT_ALIGN_MAP[ts.text_align]})')
 
     # Text case
     if ts.text_case == 'UPPER':
@@ -525,20 +531,20 @@ def _swiftui_text_node(node: Dict[str, Any], indent: int, parent_node: Dict[str,
             lines.append(f'{prefix}    .truncationMode(.tail)')
 
     # Frame (width constraint if needed)
-    bbox = node.get('absoluteBoundingBox', {})
-    w = int(bbox.get('width', 0))
+    bbox = node.get('absoluteBoundingBox') or _EMPTY_BBOX
+    w = int(bbox['width'])
     parent_is_space_between = (parent_node and
         parent_node.get('primaryAxisAlignItems') == 'SPACE_BETWEEN')
     # Check if parent is left-aligned auto-layout
     parent_counter_align = parent_node.get('counterAxisAlignItems', 'MIN') if parent_node else 'MIN'
     parent_layout = parent_node.get('layoutMode') if parent_node else None
     if w > 0:
-        frame_align = align_map.get(ts.text_align, '.leading')
+        frame_align = _TEXT_ALIGN_MAP.get(ts.text_align, '.leading')
         # SPACE_BETWEEN parent or CENTER-aligned text in auto-layout:
         # Use the text node's own textAlignHorizontal for alignment
         if parent_is_space_between or ts.text_align == 'CENTER':
             # Use text's own alignment, not parent's
-            text_frame_align = align_map.get(ts.text_align, '.leading')
+            text_frame_align = _TEXT_ALIGN_MAP.get(ts.text_align, '.leading')
             # In auto-layout, CENTER usually means "fill width" not "centered text"
             if parent_layout and ts.text_align == 'CENTER':
                 text_frame_align = '.leading'
@@ -615,8 +621,8 @@ def _swiftui_shape_node(node: Dict[str, Any], indent: int) -> str:
     # If IMAGE fill, render as Image placeholder instead of shape
     if has_image_fill:
         name = node.get('name', 'image')
-        bbox = node.get('absoluteBoundingBox', {})
-        w, h = int(bbox.get('width', 0)), int(bbox.get('height', 0))
+        bbox = node.get('absoluteBoundingBox') or _EMPTY_BBOX
+        w, h = int(bbox['width']), int(bbox['height'])
         lines.append(f'{prefix}Image(systemName: "photo") // {name}')
         lines.append(f'{prefix}    .resizable()')
         lines.append(f'{prefix}    .scaledToFill()')
@@ -646,8 +652,8 @@ def _swiftui_shape_node(node: Dict[str, Any], indent: int) -> str:
 
     # Divider doesn't support fill/stroke
     if shape_name == 'Divider':
-        bbox = node.get('absoluteBoundingBox', {})
-        w, h = int(bbox.get('width', 0)), int(bbox.get('height', 0))
+        bbox = node.get('absoluteBoundingBox') or _EMPTY_BBOX
+        w, h = int(bbox['width']), int(bbox['height'])
         if w and h:
             lines.append(f'{prefix}    .frame(width: {w}, height: {h})')
         for mod in _swiftui_appearance_modifiers(node):
@@ -663,8 +669,8 @@ def _swiftui_shape_node(node: Dict[str, Any], indent: int) -> str:
         lines.append(f'{prefix}    {stroke_mod}')
 
     # Frame
-    bbox = node.get('absoluteBoundingBox', {})
-    w, h = int(bbox.get('width', 0)), int(bbox.get('height', 0))
+    bbox = node.get('absoluteBoundingBox') or _EMPTY_BBOX
+    w, h = int(bbox['width']), int(bbox['height'])
     if w and h:
         lines.append(f'{prefix}    .frame(width: {w}, height: {h})')
 
@@ -691,8 +697,8 @@ def _swiftui_ellipse_ring(node: Dict[str, Any], indent: int) -> str:
     """Generate SwiftUI Circle().stroke() for ring/donut ELLIPSE nodes (innerRadius > 0)."""
     prefix = ' ' * indent
     lines = []
-    bbox = node.get('absoluteBoundingBox', {})
-    w, h = int(bbox.get('width', 0)), int(bbox.get('height', 0))
+    bbox = node.get('absoluteBoundingBox') or _EMPTY_BBOX
+    w, h = int(bbox['width']), int(bbox['height'])
     arc_data = node.get('arcData', {})
     inner_radius = arc_data.get('innerRadius', 0.5)
 
@@ -759,9 +765,9 @@ def _swiftui_ellipse_ring(node: Dict[str, Any], indent: int) -> str:
 
 def _is_circle(node: Dict[str, Any]) -> bool:
     """Check if ellipse is a perfect circle."""
-    bbox = node.get('absoluteBoundingBox', {})
-    w = bbox.get('width', 0)
-    h = bbox.get('height', 0)
+    bbox = node.get('absoluteBoundingBox') or _EMPTY_BBOX
+    w = bbox['width']
+    h = bbox['height']
     return abs(w - h) < 1
 
 
@@ -901,16 +907,16 @@ def _analyze_children_layout(children: list, container_bbox: dict) -> tuple:
 
 def _is_icon_container(node: Dict[str, Any]) -> bool:
     """Check if a container node is likely an icon frame."""
-    children = node.get('children', [])
+    children = node.get('children') or _EMPTY
 
     # If any child is TEXT, this is NOT just an icon (e.g., PRO badge)
     if any(c.get('type') == 'TEXT' for c in children):
         return False
 
     name = node.get('name', '')
-    bbox = node.get('absoluteBoundingBox', {})
-    w = bbox.get('width', 0)
-    h = bbox.get('height', 0)
+    bbox = node.get('absoluteBoundingBox') or _EMPTY_BBOX
+    w = bbox['width']
+    h = bbox['height']
     if w == 0 or h == 0:
         return False
 
@@ -922,8 +928,7 @@ def _is_icon_container(node: Dict[str, Any]) -> bool:
 
     # All children are vectors/groups (no frames, no text) - catches nested vector groups
     # Note: ELLIPSE excluded - small frames with single ELLIPSE child are bullet points, not icons
-    vector_types = {'VECTOR', 'BOOLEAN_OPERATION', 'STAR', 'POLYGON', 'LINE', 'REGULAR_POLYGON', 'GROUP'}
-    all_vector_children = children and all(c.get('type') in vector_types for c in children)
+    all_vector_children = children and all(c.get('type') in _ICON_VECTOR_TYPES for c in children)
 
     # Export settings hint from Figma
     has_export = bool(node.get('exportSettings'))
@@ -934,7 +939,7 @@ def _is_icon_container(node: Dict[str, Any]) -> bool:
 def _resolve_icon_name(node: Dict[str, Any]) -> str:
     """Resolve the actual icon name from a container, checking children for overrides."""
     name = node.get('name', 'icon')
-    children = node.get('children', [])
+    children = node.get('children') or _EMPTY
 
     # Check children for icon-pattern names (override resolution)
     for child in children:
@@ -942,7 +947,7 @@ def _resolve_icon_name(node: Dict[str, Any]) -> str:
         if ':' in child_name or '/' in child_name:
             return child_name
         # Recurse one level into child groups
-        for grandchild in child.get('children', []):
+        for grandchild in child.get('children') or _EMPTY:
             gc_name = grandchild.get('name', '')
             if ':' in gc_name or '/' in gc_name:
                 return gc_name
@@ -1002,11 +1007,11 @@ def _icon_needs_flip(node: Dict[str, Any], icon_name: str, parent_node: Dict[str
     if _check_node_flipped(node):
         return True
     # Check children (flip may be on inner vector/group)
-    for child in node.get('children', []):
+    for child in node.get('children') or _EMPTY:
         if _check_node_flipped(child):
             return True
         # One more level deep
-        for grandchild in child.get('children', []):
+        for grandchild in child.get('children') or _EMPTY:
             if _check_node_flipped(grandchild):
                 return True
     return False
@@ -1016,7 +1021,7 @@ def _swiftui_container_node(node: Dict[str, Any], indent: int, depth: int, paren
     """Generate SwiftUI container (VStack/HStack/ZStack) with recursive children."""
     prefix = ' ' * indent
     lines = []
-    children = node.get('children', [])
+    children = node.get('children') or _EMPTY
 
     # If this container is an icon frame, render as Image with container styling
     if _is_icon_container(node):
@@ -1046,9 +1051,9 @@ def _swiftui_container_node(node: Dict[str, Any], indent: int, depth: int, paren
             icon_lines = []
             # Determine inner icon size from children
             inner_w, inner_h = w, h
-            for child in node.get('children', []):
-                cb = child.get('absoluteBoundingBox', {})
-                cw, ch = int(cb.get('width', 0)), int(cb.get('height', 0))
+            for child in node.get('children') or _EMPTY:
+                cb = child.get('absoluteBoundingBox') or _EMPTY_BBOX
+                cw, ch = int(cb['width']), int(cb['height'])
                 if 0 < cw < w and 0 < ch < h:
                     inner_w, inner_h = cw, ch
                     break
@@ -1090,12 +1095,10 @@ def _swiftui_container_node(node: Dict[str, Any], indent: int, depth: int, paren
 
     if layout_mode == 'VERTICAL':
         container = 'VStack'
-        h_align_map = {'MIN': '.leading', 'CENTER': '.center', 'MAX': '.trailing'}
-        alignment = h_align_map.get(counter_align, '.center')
+        alignment = _H_ALIGN_MAP.get(counter_align, '.center')
     elif layout_mode == 'HORIZONTAL':
         container = 'HStack'
-        v_align_map = {'MIN': '.top', 'CENTER': '.center', 'MAX': '.bottom'}
-        alignment = v_align_map.get(counter_align, '.center')
+        alignment = _V_ALIGN_MAP.get(counter_align, '.center')
     else:
         # Smart heuristic: analyze children positions to pick VStack/HStack/ZStack
         container_bbox = node.get('absoluteBoundingBox', {})
@@ -1130,12 +1133,12 @@ def _swiftui_container_node(node: Dict[str, Any], indent: int, depth: int, paren
         child = visible_children[0]
         child_type = child.get('type', '')
         if child_type in ('FRAME', 'GROUP', 'COMPONENT', 'INSTANCE'):
-            child_bbox = child.get('absoluteBoundingBox', {})
-            node_bbox = node.get('absoluteBoundingBox', {})
-            cw = child_bbox.get('width', 0)
-            ch = child_bbox.get('height', 0)
-            nw = node_bbox.get('width', 0)
-            nh = node_bbox.get('height', 0)
+            child_bbox = child.get('absoluteBoundingBox') or _EMPTY_BBOX
+            node_bbox = node.get('absoluteBoundingBox') or _EMPTY_BBOX
+            cw = child_bbox['width']
+            ch = child_bbox['height']
+            nw = node_bbox['width']
+            nh = node_bbox['height']
             # Same dimensions = redundant wrapper
             if nw > 0 and abs(cw - nw) < 2 and abs(ch - nh) < 2:
                 child_code = _generate_swiftui_node(child, indent, depth + 1, parent_node=node)
@@ -1157,18 +1160,18 @@ def _swiftui_container_node(node: Dict[str, Any], indent: int, depth: int, paren
     # not the clipped/visible width. Compare against parent's width or self clipsContent.
     needs_scroll = False
     if not needs_wrap and container == 'HStack' and len(visible_children) > 1:
-        node_bbox = node.get('absoluteBoundingBox', {})
-        node_w = node_bbox.get('width', 0)
+        node_bbox = node.get('absoluteBoundingBox') or _EMPTY_BBOX
+        node_w = node_bbox['width']
         # Check 1: parent clips this node and node is wider than parent
         if parent_node and parent_node.get('clipsContent', False):
-            parent_bbox = parent_node.get('absoluteBoundingBox', {})
-            parent_w = parent_bbox.get('width', 0)
+            parent_bbox = parent_node.get('absoluteBoundingBox') or _EMPTY_BBOX
+            parent_w = parent_bbox['width']
             if parent_w > 0 and node_w > parent_w + 1:
                 needs_scroll = True
         # Check 2: this node clips its own content
         if not needs_scroll and node.get('clipsContent', False):
             children_total_w = sum(
-                c.get('absoluteBoundingBox', {}).get('width', 0)
+                (c.get('absoluteBoundingBox') or _EMPTY_BBOX)['width']
                 for c in visible_children
                 if c.get('absoluteBoundingBox')
             )
@@ -1178,7 +1181,7 @@ def _swiftui_container_node(node: Dict[str, Any], indent: int, depth: int, paren
         # Check 3: content significantly wider than node's own frame
         if not needs_scroll and node_w > 0:
             children_total_w = sum(
-                c.get('absoluteBoundingBox', {}).get('width', 0)
+                (c.get('absoluteBoundingBox') or _EMPTY_BBOX)['width']
                 for c in visible_children
                 if c.get('absoluteBoundingBox')
             )
@@ -1204,11 +1207,11 @@ def _swiftui_container_node(node: Dict[str, Any], indent: int, depth: int, paren
         lines.append(f'{prefix}{container}({params_str}) {{')
 
     # For ZStack with absolute positioning, calculate offsets from container origin
-    container_bbox = node.get('absoluteBoundingBox', {})
-    container_x = container_bbox.get('x', 0)
-    container_y = container_bbox.get('y', 0)
-    container_w = container_bbox.get('width', 0)
-    container_h = container_bbox.get('height', 0)
+    container_bbox = node.get('absoluteBoundingBox') or _EMPTY_BBOX
+    container_x = container_bbox['x']
+    container_y = container_bbox['y']
+    container_w = container_bbox['width']
+    container_h = container_bbox['height']
     use_offsets = (container == 'ZStack' and len(visible_children) > 1)
 
     # Render children recursively
@@ -1331,15 +1334,13 @@ def generate_swiftui_code(node: Dict[str, Any], component_name: str = '') -> str
 
     if layout_mode == 'VERTICAL':
         container = 'VStack'
-        h_align_map = {'MIN': '.leading', 'CENTER': '.center', 'MAX': '.trailing'}
-        alignment = h_align_map.get(counter_align, '.center')
+        alignment = _H_ALIGN_MAP.get(counter_align, '.center')
     elif layout_mode == 'HORIZONTAL':
         container = 'HStack'
-        v_align_map = {'MIN': '.top', 'CENTER': '.center', 'MAX': '.bottom'}
-        alignment = v_align_map.get(counter_align, '.center')
+        alignment = _V_ALIGN_MAP.get(counter_align, '.center')
     else:
         # Smart heuristic for root container too
-        children = node.get('children', [])
+        children = node.get('children') or _EMPTY
         container_bbox = node.get('absoluteBoundingBox', {})
         container, inferred_gap = _analyze_children_layout(children, container_bbox)
         if container == 'VStack':
@@ -1364,15 +1365,15 @@ def generate_swiftui_code(node: Dict[str, Any], component_name: str = '') -> str
         gradient_section = f'\n{gradient_def}\n'
 
     # Build children code directly (not via _swiftui_container_node to avoid double wrapping)
-    children = node.get('children', [])
+    children = node.get('children') or _EMPTY
     visible_children = [c for c in children if c.get('visible', True)]
 
     # ZStack offset calculation for root container
-    root_bbox = node.get('absoluteBoundingBox', {})
-    root_x = root_bbox.get('x', 0)
-    root_y = root_bbox.get('y', 0)
-    root_w = root_bbox.get('width', 0)
-    root_h = root_bbox.get('height', 0)
+    root_bbox = node.get('absoluteBoundingBox') or _EMPTY_BBOX
+    root_x = root_bbox['x']
+    root_y = root_bbox['y']
+    root_w = root_bbox['width']
+    root_h = root_bbox['height']
     use_root_offsets = (container == 'ZStack' and len(visible_children) > 1)
 
     children_lines = []
@@ -1401,11 +1402,11 @@ def generate_swiftui_code(node: Dict[str, Any], component_name: str = '') -> str
     # Detect horizontal overflow for root → wrap in ScrollView(.horizontal)
     root_needs_scroll = False
     if container == 'HStack':
-        root_bbox = node.get('absoluteBoundingBox', {})
-        root_w = root_bbox.get('width', 0)
+        root_bbox = node.get('absoluteBoundingBox') or _EMPTY_BBOX
+        root_w = root_bbox['width']
         if root_w > 0:
             children_total_w = sum(
-                c.get('absoluteBoundingBox', {}).get('width', 0)
+                (c.get('absoluteBoundingBox') or _EMPTY_BBOX)['width']
                 for c in visible_children
                 if c.get('absoluteBoundingBox')
             )
@@ -15,9 +15,13 @@ from generators.base import (
     TAILWIND_WEIGHT_MAP,
     TAILWIND_ALIGN_MAP,
     MAX_CHILDREN_LIMIT,
+    _iter_children,
+    _EMPTY_BBOX,
     _get_background_css,
     _extract_stroke_data,
     _corner_radii_to_css,
+    _padding_to_css,
+    _padding_to_tailwind,
     _transform_to_css,
     _blend_mode_to_css,
     _rgba_to_hex,
@@ -25,6 +29,13 @@ from generators.base import (
     _text_decoration_to_css,
 )
 
+# CSS text-transform / text-decoration values -> Tailwind utility classes
+_TW_TEXT_TRANSFORM_MAP = {'uppercase': 'uppercase', 'lowercase': 'lowercase', 'capitalize': 'capitalize'}
+_TW_TEXT_DECORATION_MAP = {'underline': 'underline', 'line-through': 'line-through'}
+
+# Text alignment keyed by the lowercased CSS value
+_TW_TEXT_ALIGN_MAP = {k.lower(): v for k, v in TAILWIND_ALIGN_MAP.items()}
+
 
 # ---------------------------------------------------------------------------
 # Public API
@@ -69,14 +80,20 @@ defineProps<{{
 
 def recursive_node_to_vue_template(node: Dict[str, Any], indent: int = 4, use_tailwind: bool = True) -> str:
     """Recursively generate Vue template code for nested children with enhanced styles."""
-    lines = []
+    lines: List[str] = []
+    _append_node_vue_template(node, lines, indent, use_tailwind)
+    return '\n'.join(lines)
+
+
+def _append_node_vue_template(node: Dict[str, Any], lines: List[str], indent: int, use_tailwind: bool) -> None:
+    """Append the template lines for a node and its children to a shared output list."""
     prefix = ' ' * indent
     node_type = node.get('type', '')
     name = node.get('name', 'Unknown')
 
-    bbox = node.get('absoluteBoundingBox', {})
-    width = int(bbox.get('width', 0))
-    height = int(bbox.get('height', 0))
+    bbox = node.get('absoluteBoundingBox') or _EMPTY_BBOX
+    width = int(bbox['width'])
+    height = int(bbox['height'])
 
     # Fills (with gradient support)
     fills = node.get('fills', [])
@@ -141,42 +158,33 @@ def recursive_node_to_vue_template(node: Dict[str, Any], indent: int = 4, use_ta
 
         if use_tailwind:
             weight_class = TAILWIND_WEIGHT_MAP.get(font_weight, 'font-normal')
-            align_class = TAILWIND_ALIGN_MAP.get(text_align.upper(), '')
+            align_class = _TW_TEXT_ALIGN_MAP.get(text_align, '')
 
             # Tailwind text-transform classes
-            transform_map = {'uppercase': 'uppercase', 'lowercase': 'lowercase', 'capitalize': 'capitalize'}
-            transform_class = transform_map.get(text_transform, '') if text_transform else ''
+            transform_class = _TW_TEXT_TRANSFORM_MAP.get(text_transform, '') if text_transform else ''
 
             # Tailwind text-decoration classes
-            decoration_map = {'underline': 'underline', 'line-through': 'line-through'}
-            decoration_class = decoration_map.get(text_dec_value, '') if text_dec_value else ''
-
-            classes = [f'text-[{int(font_size)}px]', weight_class]
-            if text_color:
-                classes.append(f'text-[{text_color}]')
-            if line_height:
-                classes.append(f'leading-[{int(line_height)}px]')
-            if letter_spacing:
-                classes.append(f'tracking-[{letter_spacing:.2f}px]')
-            if align_class:
-                classes.append(align_class)
-            if transform_class:
-                classes.append(transform_class)
-            if decoration_class:
-                classes.append(decoration_class)
+            decoration_class = _TW_TEXT_DECORATION_MAP.get(text_dec_value, '') if text_dec_value else ''
 
             # Tailwind line-clamp for maxLines
-            if max_lines and max_lines > 0:
-                classes.append(f'line-clamp-{max_lines}')
-                if text_truncation == 'ENDING':
-                    classes.append('text-ellipsis')
+            has_clamp = bool(max_lines and max_lines > 0)
 
             # Paragraph spacing (margin-bottom)
             paragraph_spacing = style.get('paragraphSpacing', 0)
-            if paragraph_spacing and paragraph_spacing > 0:
-                classes.append(f'mb-[{int(paragraph_spacing)}px]')
 
-            class_str = ' '.join(filter(None, classes))
+            class_str = ' '.join([c for c in (
+                f'text-[{int(font_size)}px]',
+                weight_class,
+                f'text-[{text_color}]' if text_color else '',
+                f'leading-[{int(line_height)}px]' if line_height else '',
+                f'tracking-[{letter_spacing:.2f}px]' if letter_spacing else '',
+                align_class,
+                transform_class,
+                decoration_class,
+                f'line-clamp-{max_lines}' if has_clamp else '',
+                'text-ellipsis' if has_clamp and text_truncation == 'ENDING' else '',
+                f'mb-[{int(paragraph_spacing)}px]' if paragraph_spacing and paragraph_spacing > 0 else '',
+            ) if c])
             # Wrap in anchor tag if hyperlink present
             if hyperlink_url:
                 lines.append(f'{prefix}<a href="{hyperlink_url}" class="{class_str}" target="_blank" rel="noopener noreferrer">{text}</a>')
@@ -235,14 +243,7 @@ def recursive_node_to_vue_template(node: Dict[str, Any], indent: int = 4, use_ta
                     classes.append(f'gap-[{gap}px]')
 
             # Padding
-            if padding_top:
-                classes.append(f'pt-[{padding_top}px]')
-            if padding_right:
-                classes.append(f'pr-[{padding_right}px]')
-            if padding_bottom:
-                classes.append(f'pb-[{padding_bottom}px]')
-            if padding_left:
-                classes.append(f'pl-[{padding_left}px]')
+            classes.extend(_padding_to_tailwind(padding_top, padding_right, padding_bottom, padding_left))
 
             # Flex child properties (layoutGrow, layoutPositioning, layoutAlign)
             layout_grow = node.get('layoutGrow', 0)
@@ -258,7 +259,7 @@ def recursive_node_to_vue_template(node: Dict[str, Any], indent: int = 4, use_ta
             elif layout_align == 'INHERIT':
                 classes.append('self-auto')
 
-            class_str = ' '.join(filter(None, classes))
+            class_str = ' '.join(classes)
 
             if inline_styles:
                 style_str = '; '.join(inline_styles)
@@ -269,16 +270,11 @@ def recursive_node_to_vue_template(node: Dict[str, Any], indent: int = 4, use_ta
             class_name = name.lower().replace(' ', '-').replace('/', '-')
             lines.append(f'{prefix}<div class="{class_name}">')
 
-        children = node.get('children', [])
-        for child in children[:MAX_CHILDREN_LIMIT]:
-            child_template = recursive_node_to_vue_template(child, indent + 2, use_tailwind)
-            if child_template:
-                lines.append(child_template)
+        for child in _iter_children(node, MAX_CHILDREN_LIMIT):
+            _append_node_vue_template(child, lines, indent + 2, use_tailwind)
 
         lines.append(f'{prefix}</div>')
 
-    return '\n'.join(lines)
-
 
 def generate_recursive_css(node: Dict[str, Any], rules: List[str], parent_name: str = '') -> List[str]:
     """Generate CSS rules for all nodes recursively."""
@@ -286,9 +282,9 @@ def generate_recursive_css(node: Dict[str, Any], rules: List[str], parent_name:
     name = node.get('name', 'Unknown')
     class_name = name.lower().replace(' ', '-').replace('/', '-')
 
-    bbox = node.get('absoluteBoundingBox', {})
-    width = int(bbox.get('width', 0))
-    height = int(bbox.get('height', 0))
+    bbox = node.get('absoluteBoundingBox') or _EMPTY_BBOX
+    width = int(bbox['width'])
+    height = int(bbox['height'])
 
     fills = node.get('fills', [])
     bg_color = ''
@@ -326,8 +322,9 @@ def generate_recursive_css(node: Dict[str, Any], rules: List[str], parent_name:
         css_props.append(f"flex-direction: {'column' if layout_mode == 'VERTICAL' else 'row'};")
         if gap:
             css_props.append(f"gap: {gap}px;")
-    if padding_top or padding_right or padding_bottom or padding_left:
-        css_props.append(f"padding: {padding_top}px {padding_right}px {padding_bottom}px {padding_left}px;")
+    padding_css = _padding_to_css(padding_top, padding_right, padding_bottom, padding_left)
+    if padding_css:
+        css_props.append(f"padding: {padding_css};")
 
     if node_type == 'TEXT':
         style = node.get('style', {})
@@ -369,7 +366,7 @@ def generate_recursive_css(node: Dict[str, Any], rules: List[str], parent_name:
         rule = f".{class_name} {{\n  " + "\n  ".join(css_props) + "\n}"
         rules.append(rule)
 
-    for child in node.get('children', [])[:20]:
+    for child in _iter_children(node, 20):
         generate_recursive_css(child, rules, class_name)
 
     return rules
@@ -0,0 +1,665 @@
+"""Tests for figma_mcp helper functions."""
+import asyncio
+import json
+import os
+
+import httpx
+import pytest
+
+import figma_mcp
+from figma_mcp import (
+    _build_node_details,
+    _dumps,
+    _extract_all,
+    _extract_file_key,
+    _get_node_with_children,
+    _hex_to_rgb,
+    _invalidate_request_cache,
+    _iter_styles_markdown,
+    _load_code_connect_data,
+    _make_figma_request,
+    _render_images,
+    _estimate_tokens_size,
+    _render_node_details_markdown,
+    _save_code_connect_data,
+    _truncate_token_categories,
+    TOKEN_SIZE_ESTIMATES,
+)
+
+
+class TestTokenSizeEstimate:
+    """Verify the design token size estimator and category truncation."""
+
+    def test_estimate_scales_with_item_count(self):
+        tokens = {'colors': [{}] * 10, 'typography': [{}] * 2}
+        expected = 10 * TOKEN_SIZE_ESTIMATES['colors'] + 2 * TOKEN_SIZE_ESTIMATES['typography']
+        assert _estimate_tokens_size(tokens) == expected
+
+    def test_estimate_empty(self):
+        assert _estimate_tokens_size({}) == 0
+
+    def test_truncate_adds_marker(self):
+        tokens = {'colors': [{'hex': f'#{i:06x}'} for i in range(15)], 'blurs': [{}]}
+        _truncate_token_categories(tokens, max_per_category=10)
+        assert len(tokens['colors']) == 11
+        assert tokens['colors'][-1]['_truncated'] is True
+        assert '5 more items' in tokens['colors'][-1]['_message']
+        assert tokens['blurs'] == [{}]
+
+    def test_truncate_is_order_independent(self):
+        colors = [{'name': f'c{i:02d}', 'hex': f'#{i:06x}'} for i in range(30)]
+        forward = {'colors': list(colors)}
+        backward = {'colors': colors[::-1]}
+        _truncate_token_categories(forward, max_per_category=10)
+        _truncate_token_categories(backward, max_per_category=10)
+        assert forward == backward
+
+    def test_repeated_truncation_keeps_omitted_count(self):
+        tokens = {'colors': [{'name': f'c{i:03d}'} for i in range(150)]}
+        _truncate_token_categories(tokens, max_per_category=100)
+        _truncate_token_categories(tokens, max_per_category=20)
+        assert len(tokens['colors']) == 21
+        assert tokens['colors'][-1]['_omitted'] == 130
+
+
+class TestNodeDetails:
+    """Verify node details building for JSON and markdown output."""
+
+    def _node(self):
+        return {
+            'id': '1:2',
+            'name': 'Card',
+            'type': 'FRAME',
+            'absoluteBoundingBox': {'x': 0, 'y': 0, 'width': 200, 'height': 100},
+            'fills': [{'type': 'SOLID', 'visible': True, 'color': {'r': 1, 'g': 1, 'b': 1, 'a': 1}}],
+            'exportSettings': [{'format': 'PNG', 'suffix': '', 'constraint': {'type': 'SCALE', 'value': 2}}],
+            'children': [],
+        }
+
+    def test_markdown_skips_json_only_sections(self):
+        full = _build_node_details(self._node(), '1:2', 'abc')
+        slim = _build_node_details(self._node(), '1:2', 'abc', markdown=True)
+        assert 'exportSettings' in full
+        assert 'exportSettings' not in slim
+        assert slim['bounds'] == full['bounds']
+
+    def test_render_markdown(self):
+        details = _build_node_details(self._node(), '1:2', 'abc', markdown=True)
+        output = _render_node_details_markdown(details)
+        assert output.startswith('# Node: Card')
+        assert '- **Solid:** #ffffff' in output
+
+    def test_render_gradient_fill(self, node_with_radial_gradient):
+        node = dict(node_with_radial_gradient, id='1:3', name='Blob')
+        details = _build_node_details(node, '1:3', 'abc', markdown=True)
+        output = _render_node_details_markdown(details)
+        assert 'RADIAL Gradient:' in output
+
+
+class TestEffectTokens:
+    """Verify shadow and blur token records deduplicate by value."""
+
+    def test_duplicate_effects_collapse(self, node_with_inner_shadow, node_with_background_blur):
+        root = {'name': 'Root', 'children': [node_with_inner_shadow, dict(node_with_inner_shadow, name='Copy'), node_with_background_blur]}
+        shadows, blurs = {}, {}
+        _extract_all(root, {'shadows': shadows, 'blurs': blurs})
+        assert len(shadows) == 1
+        assert len(blurs) == 1
+        shadow = next(iter(shadows)).to_dict()
+        assert shadow['type'] == 'INNER_SHADOW'
+        assert set(shadow['offset']) == {'x', 'y'}
+
+
+class TestRenderImages:
+    """Verify image renders are split into batches and merged."""
+
+    def test_batches_and_merges(self, monkeypatch):
+        calls = []
+
+        async def fake_request(endpoint, method="GET", params=None):
+            ids = params['ids'].split(',')
+            calls.append(ids)
+            return {'images': {nid: f'https://img/{nid}' for nid in ids}}
+
+        monkeypatch.setattr(figma_mcp, '_make_figma_request', fake_request)
+        node_ids = [f'1:{i}' for i in range(45)]
+        images = asyncio.run(_render_images('abc', node_ids, {'format': 'png'}))
+        assert [len(c) for c in calls] == [20, 20, 5]
+        assert list(images) == node_ids
+
+
+class TestHttpClient:
+    """Verify the pooled Figma API client is reused and rebuilt when needed."""
+
+    def test_reused_within_loop_and_rebuilt_on_token_change(self, monkeypatch):
+        monkeypatch.setenv('FIGMA_ACCESS_TOKEN', 'token-a')
+        figma_mcp._reset_figma_token()
+
+        async def run():
+            first = figma_mcp._get_http_client()
+            same = figma_mcp._get_http_client()
+            monkeypatch.setenv('FIGMA_ACCESS_TOKEN', 'token-b')
+            assert figma_mcp._get_http_client() is first  # Token is cached until reset
+            figma_mcp._reset_figma_token()
+            rebuilt = figma_mcp._get_http_client()
+            await first.aclose()
+            await figma_mcp._close_http_client()
+            return first, same, rebuilt
+
+        first, same, rebuilt = asyncio.run(run())
+        assert first is same
+        assert rebuilt is not first
+        assert rebuilt.headers['X-Figma-Token'] == 'token-b'
+        assert rebuilt.is_closed
+
+    def test_request_decodes_raw_content(self, monkeypatch):
+        monkeypatch.setenv('FIGMA_ACCESS_TOKEN', 'token-a')
+        figma_mcp._reset_figma_token()
+        seen = []
+
+        def handler(request):
+            seen.append((str(request.url), request.headers['X-Figma-Token']))
+            return httpx.Response(200, content='{"name": "Kart ✓", "nodes": {}}'.encode())
+
+        async def run():
+            monkeypatch.setattr(figma_mcp, '_http_client', httpx.AsyncClient(
+                base_url=figma_mcp.FIGMA_API_BASE,
+                headers={'X-Figma-Token': 'token-a'},
+                transport=httpx.MockTransport(handler),
+            ))
+            monkeypatch.setattr(figma_mcp, '_http_client_loop', asyncio.get_running_loop())
+            try:
+                return await figma_mcp._request_figma_api('files/abc', params={'depth': 1})
+            finally:
+                await figma_mcp._close_http_client()
+
+        assert asyncio.run(run()) == {'name': 'Kart ✓', 'nodes': {}}
+        assert seen == [('https://api.figma.com/v1/files/abc?depth=1', 'token-a')]
+
+
+class TestRequestCache:
+    """Verify GET responses are cached per endpoint and can be invalidated."""
+
+    def _fake_api(self, monkeypatch):
+        calls = []
+
+        async def fake_request(endpoint, method="GET", params=None):
+            calls.append(endpoint)
+            await asyncio.sleep(0)
+            return {'endpoint': endpoint}
+
+        monkeypatch.setattr(figma_mcp, '_request_figma_api', fake_request)
+        _invalidate_request_cache()
+        return calls
+
+    def test_repeated_get_is_cached(self, monkeypatch):
+        calls = self._fake_api(monkeypatch)
+
+        async def run():
+            await asyncio.gather(*(_make_figma_request('files/abc') for _ in range(3)))
+            await _make_figma_request('files/abc', params={'ids': '1:2'})
+
+        asyncio.run(run())
+        assert calls == ['files/abc', 'files/abc']
+
+    def test_failed_fetch_keeps_single_flight(self, monkeypatch):
+        _invalidate_request_cache()
+        calls = []
+        active = []
+
+        async def fake_request(endpoint, method="GET", params=None):
+            calls.append(endpoint)
+            active.append(1)
+            try:
+                assert len(active) == 1, 'concurrent fetches for one key'
+                for _ in range(3):
+                    await asyncio.sleep(0)
+                if len(calls) == 1:
+                    raise httpx.ConnectError('boom')
+                return {'endpoint': endpoint}
+            finally:
+                active.pop()
+
+        monkeypatch.setattr(figma_mcp, '_request_figma_api', fake_request)
+
+        async def late_caller():
+            for _ in range(4):  # Arrive after the first fetch failed, while the waiter refetches
+                await asyncio.sleep(0)
+            return await _make_figma_request('files/abc')
+
+        async def run():
+            return await asyncio.gather(
+                _make_figma_request('files/abc'),
+                _make_figma_request('files/abc'),
+                late_caller(),
+                return_exceptions=True,
+            )
+
+        first, second, late = asyncio.run(run())
+        assert isinstance(first, httpx.ConnectError)
+        assert second == late == {'endpoint': 'files/abc'}
+        assert calls == ['files/abc', 'files/abc']
+        assert not figma_mcp._request_cache_locks and not figma_mcp._request_cache_lock_users
+
+    def test_invalidate_by_file_key(self, monkeypatch):
+        calls = self._fake_api(monkeypatch)
+        asyncio.run(_make_figma_request('files/abc'))
+        asyncio.run(_make_figma_request('files/xyz'))
+        assert _invalidate_request_cache('abc') == 1
+        asyncio.run(_make_figma_request('files/abc'))
+        asyncio.run(_make_figma_request('files/xyz'))
+        assert calls == ['files/abc', 'files/xyz', 'files/abc']
+
+    def test_expired_entry_revalidated_by_version(self, monkeypatch):
+        monkeypatch.delenv('FIGMA_CACHE_DIR', raising=False)
+        monkeypatch.setattr(figma_mcp, 'REQUEST_CACHE_TTL', -1.0)  # Every entry is already expired
+        version = {'value': '100'}
+        calls = []
+
+        async def fake_request(endpoint, method="GET", params=None):
+            calls.append((endpoint, params))
+            return {'document': {'id': '0:0'}, 'version': version['value']}
+
+        monkeypatch.setattr(figma_mcp, '_request_figma_api', fake_request)
+        _invalidate_request_cache()
+        first = asyncio.run(_make_figma_request('files/abc'))
+        assert asyncio.run(_make_figma_request('files/abc')) is first
+        assert calls == [('files/abc', None), ('files/abc', {'depth': 1})]
+
+        version['value'] = '101'
+        assert asyncio.run(_make_figma_request('files/abc'))['version'] == '101'
+        assert calls[-2:] == [('files/abc', {'depth': 1}), ('files/abc', None)]
+
+
+class TestDiskCache:
+    """Verify file payloads are reused from disk while the version is unchanged."""
+
+    def test_version_keyed_reuse_and_pruning(self, tmp_path, monkeypatch):
+        monkeypatch.setenv('FIGMA_CACHE_DIR', str(tmp_path))
+        version = {'value': '100'}
+        calls = []
+
+        async def fake_request(endpoint, method="GET", params=None):
+            calls.append((endpoint, params))
+            if params == {'depth': 1}:
+                return {'version': version['value']}
+            return {'document': {'id': '0:0'}, 'version': version['value']}
+
+        monkeypatch.setattr(figma_mcp, '_request_figma_api', fake_request)
+
+        def fetch():
+            _invalidate_request_cache()
+            return asyncio.run(_make_figma_request('files/abc'))
+
+        assert fetch()['document'] == {'id': '0:0'}
+        assert fetch()['document'] == {'id': '0:0'}
+        assert calls == [('files/abc', {'depth': 1}), ('files/abc', None), ('files/abc', {'depth': 1})]
+
+        version['value'] = '101'
+        fetch()
+        assert calls[-1] == ('files/abc', None)
+        assert [p.name.split('_')[1] for p in tmp_path.glob('abc_*.json')] == ['101']
+
+    def test_images_not_cached_on_disk(self):
+        assert figma_mcp._is_disk_cacheable('files/abc')
+        assert figma_mcp._is_disk_cacheable('files/abc/nodes')
+        assert not figma_mcp._is_disk_cacheable('files/abc/images')
+        assert not figma_mcp._is_disk_cacheable('images/abc')
+
+
+class TestNodeLookup:
+    """Verify node lookup in file payloads and node-scoped fetches."""
+
+    def test_lookup_in_file_payload(self):
+        leaf = {'id': '1:3', 'name': 'Leaf'}
+        data = {'document': {'id': '0:0', 'children': [{'id': '1:2', 'children': [leaf]}]}}
+        assert _get_node_with_children('abc', '1:3', data) is leaf
+        assert _get_node_with_children('abc', '9:9', data) == {}
+
+    def test_fetch_node_tree_uses_nodes_endpoint(self, monkeypatch):
+        calls = []
+
+        async def fake_request(endpoint, method="GET", params=None):
+            calls.append((endpoint, params))
+            if endpoint.endswith('/nodes'):
+                return {'nodes': {'1:2': {'document': {'id': '1:2'}}}}
+            return {'document': {'id': '0:0'}}
+
+        monkeypatch.setattr(figma_mcp, '_make_figma_request', fake_request)
+        assert asyncio.run(figma_mcp._fetch_node_tree('abc', '1:2', {'geometry': 'paths'})) == {'id': '1:2'}
+        assert asyncio.run(figma_mcp._fetch_node_tree('abc', None)) == {'id': '0:0'}
+        assert asyncio.run(figma_mcp._fetch_node_tree('abc', '9:9')) == {}
+        assert calls[:2] == [
+            ('files/abc/nodes', {'ids': '1:2', 'geometry': 'paths'}),
+            ('files/abc', None),
+        ]
+
+    def test_fetch_nodes_single_request(self, monkeypatch):
+        calls = []
+
+        async def fake_request(endpoint, method="GET", params=None):
+            calls.append((endpoint, params))
+            return {'nodes': {'1:2': {'document': {'id': '1:2'}}, '1:3': None}}
+
+        monkeypatch.setattr(figma_mcp, '_make_figma_request', fake_request)
+        nodes = asyncio.run(figma_mcp._fetch_nodes('abc', ['1:2', '1:3']))
+        assert nodes == {'1:2': {'id': '1:2'}}
+        assert calls == [('files/abc/nodes', {'ids': '1:2,1:3'})]
+
+
+class TestExtractAll:
+    """Verify the fused extractor matches one walk per token kind."""
+
+    def test_matches_individual_walks(self, node_with_inner_shadow):
+        text = {'id': '1:3', 'name': 'Label', 'type': 'TEXT', 'style': {'fontFamily': 'Inter', 'fontSize': 14}}
+        root = {
+            'id': '1:1', 'name': 'Root', 'type': 'FRAME', 'layoutMode': 'VERTICAL', 'itemSpacing': 8,
+            'absoluteBoundingBox': {'x': 0, 'y': 0, 'width': 100, 'height': 100},
+            'children': [node_with_inner_shadow, text],
+        }
+        out = {'colors': [], 'typography': [], 'spacing': [], 'shadows': {}, 'blurs': {}}
+        _extract_all(root, out)
+
+        colors, typography, spacing, shadows, blurs = [], [], [], {}, {}
+        _extract_all(root, {'colors': colors})
+        _extract_all(root, {'typography': typography})
+        _extract_all(root, {'spacing': spacing})
+        _extract_all(root, {'shadows': shadows, 'blurs': blurs})
+        assert out['colors'] == colors
+        assert out['typography'] == typography
+        assert out['spacing'] == spacing
+        assert list(out['shadows']) == list(shadows)
+
+    def test_only_requested_buckets(self):
+        out = {'typography': []}
+        _extract_all({'type': 'TEXT', 'name': 'T', 'style': {}}, out)
+        assert list(out) == ['typography']
+        assert len(out['typography']) == 1
+
+
+class TestIterNodes:
+    """Verify the iterative tree walk."""
+
+    def test_pre_order(self):
+        tree = {'id': 'a', 'children': [
+            {'id': 'b', 'children': [{'id': 'c'}]},
+            {'id': 'd'},
+        ]}
+        assert [n['id'] for n in figma_mcp._iter_nodes(tree)] == ['a', 'b', 'c', 'd']
+
+    def test_skip_hidden_prunes_subtrees_but_keeps_root(self):
+        tree = {'id': 'a', 'visible': False, 'children': [
+            {'id': 'b', 'visible': False, 'children': [{'id': 'c'}]},
+            {'id': 'd'},
+        ]}
+        assert [n['id'] for n in figma_mcp._iter_nodes(tree, skip_hidden=True)] == ['a', 'd']
+        assert [n['id'] for n in figma_mcp._iter_nodes(tree)] == ['a', 'b', 'c', 'd']
+
+    def test_hidden_text_yields_no_typography(self):
+        tree = {'id': '0', 'type': 'FRAME', 'name': 'F', 'children': [
+            {'id': '1', 'type': 'TEXT', 'name': 'Hidden', 'visible': False, 'style': {}},
+            {'id': '2', 'type': 'TEXT', 'name': 'Shown', 'style': {}},
+        ]}
+        typography = []
+        _extract_all(tree, {'typography': typography})
+        assert [t['name'] for t in typography] == ['Shown']
+
+    def test_deep_tree_does_not_recurse(self):
+        root = node = {'id': '0', 'type': 'TEXT', 'name': 'T', 'style': {}}
+        for i in range(1, 5000):
+            child = {'id': str(i), 'type': 'FRAME', 'name': 'F'}
+            node['children'] = [child]
+            node = child
+        typography = []
+        _extract_all(root, {'typography': typography})
+        assert len(typography) == 1
+
+
+class TestHexToRgb:
+    """Verify hex and rgba string parsing."""
+
+    def test_formats(self):
+        assert _hex_to_rgb('#ff8000') == (255, 128, 0)
+        assert _hex_to_rgb('#FFF') == (255, 255, 255)
+        assert _hex_to_rgb('rgba(1, 2, 3, 0.50)') == (1, 2, 3)
+
+    def test_invalid_returns_black(self):
+        assert _hex_to_rgb('#zzzzzz') == (0, 0, 0)
+        assert _hex_to_rgb('#12345') == (0, 0, 0)
+
+    def test_rgba_to_hex_matches_format(self):
+        for r, g, b in [(0, 0, 0), (1, 0.5, 0.25), (1, 1, 1)]:
+            expected = f"#{int(r * 255):02x}{int(g * 255):02x}{int(b * 255):02x}"
+            assert figma_mcp._rgba_to_hex({'r': r, 'g': g, 'b': b}) == expected
+        assert figma_mcp._rgba_to_hex({'r': 1, 'g': 0, 'b': 0, 'a': 0.5}) == 'rgba(255, 0, 0, 0.50)'
+        assert figma_mcp._rgb_to_hex(300, -1, 0) == f"#{300:02x}{-1:02x}{0:02x}"
+
+    def test_rgba_to_hex_reuses_cached_palette(self):
+        figma_mcp._rgba_components_to_hex.cache_clear()
+        brand = {'r': 0.2, 'g': 0.4, 'b': 0.6, 'a': 1}
+        first = figma_mcp._rgba_to_hex(brand)
+        assert figma_mcp._rgba_to_hex(dict(brand)) == first
+        assert figma_mcp._rgba_components_to_hex.cache_info().hits == 1
+
+
+class TestDumps:
+    """Verify JSON serialization with and without orjson."""
+
+    def test_round_trip(self):
+        payload = {'name': 'Kart ✓', 'items': [1, 2.5, None, True], 'nested': {'a': 'b'}}
+        assert json.loads(_dumps(payload)) == payload
+
+    def test_stdlib_fallback_matches(self, monkeypatch):
+        payload = {'name': 'Kart ✓', 'values': [1, 2]}
+        fast = _dumps(payload)
+        monkeypatch.setattr(figma_mcp, 'orjson', None)
+        assert _dumps(payload) == fast
+
+
+class TestStylesMarkdown:
+    """Verify published styles markdown rendering and truncation."""
+
+    def _styles(self, count):
+        return [{'name': f'Style {i}', 'key': f'k{i}', 'description': 'x' * 50} for i in range(count)]
+
+    def test_sections(self):
+        output = ''.join(_iter_styles_markdown('abc', 2, self._styles(1), [], [], self._styles(1)))
+        assert '## 🎨 Fill/Color Styles' in output
+        assert '## 📐 Grid Styles' in output
+        assert '## 📝 Text Styles' not in output
+
+    def test_tool_stops_at_limit(self, monkeypatch):
+        styles = [{'key': f'k{i}', 'name': f'Style {i}', 'style_type': 'GRID', 'description': 'x' * 200} for i in range(2000)]
+
+        async def fake_request(endpoint, method="GET", params=None):
+            if endpoint.endswith('/styles'):
+                return {'meta': {'styles': styles}}
+            return {'nodes': {}}
+
+        monkeypatch.setattr(figma_mcp, '_make_figma_request', fake_request)
+        params = figma_mcp.FigmaStylesInput(file_key='abcdefghijkl')
+        output = asyncio.run(figma_mcp.figma_get_styles(params))
+        assert '... (truncated)' in output
+        assert 'Style 1999' not in output
+
+
+class TestDesignBundle:
+    """Verify the combined code and tokens tool."""
+
+    def test_single_fetch(self, monkeypatch, node_with_inner_shadow):
+        calls = []
+        node = dict(node_with_inner_shadow, id='1:2', name='Promo Card')
+
+        async def fake_request(endpoint, method="GET", params=None):
+            calls.append(endpoint)
+            return {'nodes': {'1:2': {'document': node}}}
+
+        monkeypatch.setattr(figma_mcp, '_make_figma_request', fake_request)
+        params = figma_mcp.FigmaDesignBundleInput(file_key='abcdefghijkl', node_id='1-2', framework='css')
+        output = asyncio.run(figma_mcp.figma_get_design_bundle(params))
+        bundle = json.loads(output.split('\n\n---\n')[0])
+        assert calls == ['files/abcdefghijkl/nodes']
+        assert bundle['component_name'] == 'PromoCard'
+        assert bundle['code']
+        assert set(bundle['tokens']) == {'colors', 'typography', 'spacing', 'shadows', 'blurs'}
+
+    def test_large_code_stays_under_limit(self, monkeypatch, node_with_inner_shadow):
+        node = dict(node_with_inner_shadow, id='1:2', name='Promo Card')
+
+        async def fake_request(endpoint, method="GET", params=None):
+            return {'nodes': {'1:2': {'document': node}}}
+
+        monkeypatch.setattr(figma_mcp, '_make_figma_request', fake_request)
+        monkeypatch.setattr(figma_mcp, '_generate_code_for_framework',
+                            lambda node, framework, name, flatten_empty: '<div class="x">\n' * 20000)
+        params = figma_mcp.FigmaDesignBundleInput(file_key='abcdefghijkl', node_id='1-2', framework='css')
+        result = asyncio.run(figma_mcp.figma_get_design_bundle(params)).split('\n\n---\n')[0]
+        assert len(result) <= figma_mcp.CHARACTER_LIMIT
+        bundle = json.loads(result)
+        assert bundle['code'].endswith('... (truncated)')
+        assert bundle['code'].startswith('<div class="x">')
+        assert '_warning' in bundle
+
+
+class TestGenerateCodeForFramework:
+    """Verify framework dispatch and generator options."""
+
+    def test_flatten_empty_reaches_react_generator(self):
+        bbox = {'x': 0, 'y': 0, 'width': 10, 'height': 10}
+        node = {'type': 'FRAME', 'name': 'Root', 'absoluteBoundingBox': bbox, 'children': [
+            {'type': 'GROUP', 'name': 'Empty', 'children': [{'type': 'TEXT', 'name': 'a', 'characters': 'inner'}]},
+        ]}
+        generate = figma_mcp._generate_code_for_framework
+        for framework in (figma_mcp.CodeFramework.REACT, figma_mcp.CodeFramework.REACT_TAILWIND):
+            assert generate(node, framework, 'Card').count('</div>') == 2
+            assert generate(node, framework, 'Card', flatten_empty=True).count('</div>') == 1
+        css = figma_mcp.CodeFramework.CSS
+        assert generate(node, css, 'Card', flatten_empty=True) == generate(node, css, 'Card')
+
+
+class TestCodeConnectStore:
+    """Verify Code Connect storage round trips and reload on change."""
+
+    def test_round_trip_and_reload(self, tmp_path, monkeypatch):
+        path = tmp_path / 'code_connect.json'
+        monkeypatch.setenv('FIGMA_CODE_CONNECT_PATH', str(path))
+        assert _load_code_connect_data() == {'version': '1.0', 'mappings': {}}
+
+        data = {'version': '1.0', 'mappings': {'abc': {'1:2': {'component_name': 'Button'}}}}
+        _save_code_connect_data(data)
+        assert _load_code_connect_data() == data
+        assert [p.name for p in tmp_path.iterdir()] == ['code_connect.json']
+
+        # External edits are picked up through the mtime check
+        path.write_text(json.dumps({'version': '1.0', 'mappings': {}}), encoding='utf-8')
+        os.utime(path, ns=(0, 0))
+        assert _load_code_connect_data() == {'version': '1.0', 'mappings': {}}
+
+    def test_failed_save_leaves_cache_untouched(self, tmp_path, monkeypatch):
+        path = tmp_path / 'code_connect.json'
+        monkeypatch.setenv('FIGMA_CODE_CONNECT_PATH', str(path))
+        _save_code_connect_data({'version': '1.0', 'mappings': {}})
+        assert _load_code_connect_data() == {'version': '1.0', 'mappings': {}}
+
+        def failing_replace(src, dst):
+            raise OSError('disk full')
+
+        monkeypatch.setattr(figma_mcp.os, 'replace', failing_replace)
+        params = figma_mcp.FigmaCodeConnectAddInput(
+            file_key='abcdefghijkl', node_id='1:2', component_path='src/Button.tsx', component_name='Button'
+        )
+        output = asyncio.run(figma_mcp.figma_add_code_connect_map(params))
+        assert 'success' not in output
+        assert _load_code_connect_data() == {'version': '1.0', 'mappings': {}}
+
+    def test_save_writes_through_symlink_and_keeps_mode(self, tmp_path, monkeypatch):
+        real = tmp_path / 'real.json'
+        real.write_text(json.dumps({'version': '1.0', 'mappings': {}}), encoding='utf-8')
+        real.chmod(0o640)
+        link = tmp_path / 'store.json'
+        link.symlink_to(real)
+        monkeypatch.setenv('FIGMA_CODE_CONNECT_PATH', str(link))
+
+        data = {'version': '1.0', 'mappings': {'abc': {'1:2': {'component_name': 'Button'}}}}
+        _save_code_connect_data(data)
+        assert link.is_symlink()
+        assert json.loads(real.read_text(encoding='utf-8')) == data
+        assert real.stat().st_mode & 0o777 == 0o640
+        assert _load_code_connect_data() == data
+
+    def test_new_store_uses_umask_mode(self, tmp_path, monkeypatch):
+        path = tmp_path / 'code_connect.json'
+        monkeypatch.setenv('FIGMA_CODE_CONNECT_PATH', str(path))
+        old_umask = os.umask(0o022)
+        try:
+            _save_code_connect_data({'version': '1.0', 'mappings': {}})
+        finally:
+            os.umask(old_umask)
+        assert path.stat().st_mode & 0o777 == 0o644
+
+
+class TestCodeConnectBatch:
+    """Verify batched Code Connect additions."""
+
+    def test_batch_saves_once(self, tmp_path, monkeypatch):
+        monkeypatch.setenv('FIGMA_CODE_CONNECT_PATH', str(tmp_path / 'code_connect.json'))
+        saves = []
+        original_save = figma_mcp._save_code_connect_data
+        monkeypatch.setattr(figma_mcp, '_save_code_connect_data', lambda data: saves.append(1) or original_save(data))
+
+        params = figma_mcp.FigmaCodeConnectAddBatchInput(mappings=[
+            {'file_key': 'abcdefghijkl', 'node_id': '1-2', 'component_path': 'src/Button.tsx', 'component_name': 'Button'},
+            {'file_key': 'abcdefghijkl', 'node_id': '1:3', 'component_path': 'src/Card.tsx', 'component_name': 'Card'},
+        ])
+        output = asyncio.run(figma_mcp.figma_add_code_connect_maps(params))
+        result = json.loads(output.split('\n\n---\n')[0])
+        assert result['status'] == 'success'
+        assert [r['action'] for r in result['results']] == ['added', 'added']
+        assert len(saves) == 1
+        assert set(_load_code_connect_data()['mappings']['abcdefghijkl']) == {'1:2', '1:3'}
+
+
+class TestFileKey:
+    """Verify file key extraction from Figma URLs."""
+
+    def test_url_and_bare_key(self):
+        assert _extract_file_key('https://www.figma.com/design/AbC123xyz0/My-File?node-id=1-2') == 'AbC123xyz0'
+        assert _extract_file_key('https://figma.com/file/XyZ9876543/Old') == 'XyZ9876543'
+        assert _extract_file_key('AbC123xyz0') == 'AbC123xyz0'
+
+    def test_unparseable_url_raises(self):
+        with pytest.raises(ValueError):
+            _extract_file_key('https://www.figma.com/proto/')
+
+    def test_model_strips_then_checks_length(self):
+        assert figma_mcp.FigmaFileInput(file_key='  abcdefghijkl ').file_key == 'abcdefghijkl'
+        with pytest.raises(ValueError):
+            figma_mcp.FigmaFileInput(file_key='   abc     ')
+
+    def test_url_parse_is_memoized(self):
+        url = 'https://www.figma.com/design/MeMo123456/File'
+        figma_mcp._file_key_from_url.cache_clear()
+        _extract_file_key(url)
+        _extract_file_key(url)
+        assert figma_mcp._file_key_from_url.cache_info().hits == 1
+
+
+class TestNodeIdNormalization:
+    """Verify node IDs are normalized to the colon form."""
+
+    def test_models_normalize_dashes(self):
+        assert figma_mcp.FigmaNodeInput(file_key='abcdefghijkl', node_id='1-2').node_id == '1:2'
+        assert figma_mcp.FigmaNodeInput(file_key='abcdefghijkl', node_id='1:2').node_id == '1:2'
+        params = figma_mcp.FigmaScreenshotInput(file_key='abcdefghijkl', node_ids=['1-2', '3:4'])
+        assert params.node_ids == ['1:2', '3:4']
+        ids = ['1:2', '3:4']
+        assert figma_mcp._normalize_node_ids(ids) is ids
+
+    def test_optional_and_invalid_node_ids(self):
+        assert figma_mcp.FigmaDesignTokensInput(file_key='abcdefghijkl').node_id is None
+        with pytest.raises(ValueError):
+            figma_mcp.FigmaNodeInput(file_key='abcdefghijkl', node_id=12)
+
+    def test_unknown_fields_rejected(self):
+        with pytest.raises(ValueError):
+            figma_mcp.FigmaNodeInput(file_key='abcdefghijkl', node_id='1:2', nodeId='1:2')
@@ -1,6 +1,6 @@
 """Tests for code generator fixes."""
-from generators.base import MAX_CHILDREN_LIMIT, MAX_NATIVE_CHILDREN_LIMIT, parse_fills, ColorValue, GradientStop, GradientDef, ICON_NAME_MAP
-from generators.react_generator import generate_react_code
+from generators.base import MAX_CHILDREN_LIMIT, MAX_NATIVE_CHILDREN_LIMIT, _iter_children, _padding_to_css, _padding_to_tailwind, parse_fills, ColorValue, GradientStop, GradientDef, ICON_NAME_MAP
+from generators.react_generator import generate_react_code, recursive_node_to_jsx
 from generators.css_generator import generate_css_code
 import math
 
@@ -26,6 +26,15 @@ class TestChildLimitsConsistency:
         standalone_defs = re.findall(r'^MAX_CHILDREN_LIMIT\s*=\s*\d+', source, re.MULTILINE)
         assert len(standalone_defs) == 0, f"figma_mcp.py still defines its own MAX_CHILDREN_LIMIT: {standalone_defs}"
 
+    def test_iter_children_respects_limit(self):
+        node = {'children': [{'id': str(i)} for i in range(MAX_CHILDREN_LIMIT + 5)]}
+        assert len(list(_iter_children(node, MAX_CHILDREN_LIMIT))) == MAX_CHILDREN_LIMIT
+        assert len(list(_iter_children(node))) == MAX_CHILDREN_LIMIT + 5
+
+    def test_iter_children_handles_leaf_nodes(self):
+        assert list(_iter_children({'type': 'TEXT'}, 10)) == []
+        assert list(_iter_children({'children': None})) == []
+
 
 class TestDashedBorder:
     """Verify dashed borders are rendered correctly."""
@@ -155,6 +164,68 @@ class TestInnerShadow:
         assert 'inset' in code.lower(), "Mixed shadows should include 'inset' for INNER_SHADOW"
 
 
+class TestReactTreeWalk:
+    """Verify the iterative JSX walk keeps document order and handles deep trees."""
+
+    def test_children_render_in_order_inside_parent(self):
+        node = {'type': 'FRAME', 'name': 'Root', 'children': [
+            {'type': 'FRAME', 'name': 'A', 'children': [{'type': 'TEXT', 'name': 'a', 'characters': 'first'}]},
+            {'type': 'TEXT', 'name': 'b', 'characters': 'second'},
+        ]}
+        lines = recursive_node_to_jsx(node, indent=0).split('\n')
+        assert [l.strip()[:5] for l in lines] == ['<div ', '<div ', '<span', '</div', '<span', '</div']
+        assert lines[2].startswith('    <span') and 'first' in lines[2]
+        assert lines[4].startswith('  <span') and 'second' in lines[4]
+
+    def test_children_capped_at_limit(self):
+        node = {'type': 'FRAME', 'name': 'Root', 'children': [
+            {'type': 'TEXT', 'name': f't{i}', 'characters': f'item{i}'} for i in range(MAX_CHILDREN_LIMIT + 5)
+        ]}
+        jsx = recursive_node_to_jsx(node, indent=0)
+        assert jsx.count('<span') == MAX_CHILDREN_LIMIT
+        assert f'item{MAX_CHILDREN_LIMIT - 1}<' in jsx and f'item{MAX_CHILDREN_LIMIT}<' not in jsx
+
+    def test_deep_tree_does_not_recurse(self):
+        root = node = {'type': 'FRAME', 'name': 'F0'}
+        for i in range(1, 3000):
+            child = {'type': 'FRAME', 'name': f'F{i}'}
+            node['children'] = [child]
+            node = child
+        jsx = recursive_node_to_jsx(root, indent=0, use_tailwind=False)
+        assert jsx.count('</div>') == 3000
+
+    def test_flatten_empty_inlines_unstyled_children(self):
+        node = {'type': 'FRAME', 'name': 'Root', 'children': [
+            {'type': 'GROUP', 'name': 'Empty', 'children': [{'type': 'TEXT', 'name': 'a', 'characters': 'inner'}]},
+            {'type': 'FRAME', 'name': 'Sized', 'absoluteBoundingBox': {'x': 0, 'y': 0, 'width': 10, 'height': 10}},
+        ]}
+        for use_tailwind in (True, False):
+            kept = recursive_node_to_jsx(node, indent=0, use_tailwind=use_tailwind)
+            assert kept.count('</div>') == 3
+            lines = recursive_node_to_jsx(node, indent=0, use_tailwind=use_tailwind, flatten_empty=True).split('\n')
+            assert len(lines) == 5 and lines[-1] == '</div>'
+            assert lines[1].startswith('  <span') and 'inner' in lines[1]
+            assert lines[2].startswith('  <div ') and lines[3] == '  </div>'
+
+
+class TestPaddingShorthand:
+    """Verify padding collapses to the shortest CSS / Tailwind form."""
+
+    def test_css_shorthand(self):
+        assert _padding_to_css(0, 0, 0, 0) == ''
+        assert _padding_to_css(16, 16, 16, 16) == '16px'
+        assert _padding_to_css(4, 8, 4, 8) == '4px 8px'
+        assert _padding_to_css(0, 8, 0, 8) == '0px 8px'
+        assert _padding_to_css(1, 2, 3, 4) == '1px 2px 3px 4px'
+
+    def test_tailwind_shorthand(self):
+        assert _padding_to_tailwind(0, 0, 0, 0) == []
+        assert _padding_to_tailwind(16, 16, 16, 16) == ['p-[16px]']
+        assert _padding_to_tailwind(4, 8, 4, 8) == ['py-[4px]', 'px-[8px]']
+        assert _padding_to_tailwind(0, 8, 0, 8) == ['px-[8px]']
+        assert _padding_to_tailwind(1, 0, 3, 0) == ['pt-[1px]', 'pb-[3px]']
+
+
 class TestRadialGradientRadius:
     """Verify radial gradient endRadius scales with dimensions."""
 